@@ -56,8 +56,8 @@ def cli(ctx):
 @click.option('--output', '-o', type=click.Path(), 
               help='Output file path (default: auto-generated)')
 @click.option('--format', '-f', 'output_format', 
-              type=click.Choice(['txt', 'json', 'srt', 'vtt'], case_sensitive=False),
-              default='txt', help='Output format: txt, json, srt, vtt (default: txt)')
+              type=click.Choice(['txt', 'json', 'srt', 'vtt', 'msgpack'], case_sensitive=False),
+              default='txt', help='Output format: txt, json, srt, vtt, msgpack (default: txt)')
 @click.option('--model', '-m',
               type=click.Choice(['tiny', 'base', 'small', 'medium', 'large']),
               default='base', help='Whisper model size (default: base)')
@@ -69,6 +69,8 @@ def cli(ctx):
               help='Chunk duration for large files in seconds (default: 30)')
 @click.option('--force-chunking', is_flag=True,
               help='Force chunked processing for all files')
+@click.option('--with-context', is_flag=True,
+              help='Overlap chunks and carry context between them (more accurate, not parallel)')
 @click.option('--verbose', '-v', is_flag=True,
               help='Enable verbose output')
 @click.option('--quiet', '-q', is_flag=True,
@@ -120,7 +122,7 @@ def cli(ctx):
 @click.option('--metadata-content-analysis/--no-metadata-content-analysis', default=True,
               help='Include content analysis in metadata (requires --enhanced-metadata)')
 def transcribe(input_file, output, output_format, model, language, timestamps, 
-               chunk_duration, force_chunking, verbose, quiet, config, 
+               chunk_duration, force_chunking, with_context, verbose, quiet, config, 
                speakers, num_speakers, speaker_labels, speaker_confidence, use_hf_token,
                preprocess, noise_reduction, volume_normalize, high_pass_filter, 
                low_pass_filter, enhance_speech, target_sample_rate, analyze_audio,
@@ -163,6 +165,7 @@ def transcribe(input_file, output, output_format, model, language, timestamps,
             'timestamps': timestamps,
             'chunk_duration': chunk_duration,
             'force_chunking': force_chunking,
+            'with_context': with_context,
             'output_format': output_format,
             'verbose': verbose,
             'quiet': quiet,
@@ -236,8 +239,8 @@ def transcribe(input_file, output, output_format, model, language, timestamps,
 @click.option('--output-dir', '-o', type=click.Path(file_okay=False, dir_okay=True),
               help='Output directory (default: same as input directory)')
 @click.option('--format', '-f', 'output_format',
-              type=click.Choice(['txt', 'json', 'srt', 'vtt'], case_sensitive=False),
-              default='txt', help='Output format: txt, json, srt, vtt (default: txt)')
+              type=click.Choice(['txt', 'json', 'srt', 'vtt', 'msgpack'], case_sensitive=False),
+              default='txt', help='Output format: txt, json, srt, vtt, msgpack (default: txt)')
 @click.option('--model', '-m',
               type=click.Choice(['tiny', 'base', 'small', 'medium', 'large']),
               default='base', help='Whisper model size (default: base)')
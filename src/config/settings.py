@@ -22,7 +22,9 @@ class Settings:
             'chunk_duration': 30,
             'enable_chunking_threshold': 300,  # 5 minutes
             'max_memory_mb': 1000,
-            'parallel_chunks': False
+            'parallel_chunks': False,
+            'chunk_batch_size': 1,  # >1 decodes chunks in batched forward passes
+            'chunk_context': False  # Overlap chunks and prompt each with the previous chunk's text
         },
         'output': {
             'default_format': 'txt',
@@ -45,7 +47,8 @@ class Settings:
             'cache_dir': None,  # Use Whisper's default if None
             'download_root': None,  # Use Whisper's default if None
             'download_timeout': 300,  # 5 minutes
-            'no_progress': False
+            'no_progress': False,
+            'backend': 'openai'  # 'faster_whisper' for the CTranslate2 INT8 backend
         },
         'enhancement': {
             'enable_speaker_detection': False,
@@ -53,6 +56,13 @@ class Settings:
             'include_speaker_labels': True,
             'include_speaker_confidence': False,
             'use_huggingface_token': False,
+            'diarization_segmentation_batch_size': None,
+            'diarization_embedding_batch_size': None,
+            'diarization_quantize': False,  # int8 dynamic quantization for CPU diarization
+            'diarization_onnx': False,  # Run segmentation through ONNX Runtime when installed
+            # Cached diarization results: None (off), "default" (~/.transcription/diarization_cache)
+            # or a directory; the directory is never pruned
+            'diarization_cache_dir': None,
             'enable_audio_preprocessing': False,
             'noise_reduction': False,
             'volume_normalization': False,
@@ -64,7 +74,9 @@ class Settings:
             'enable_performance_optimizations': False,
             'enable_caching': True,
             'cache_directory': None,
+            'cache_content_keying': False,  # Hash file contents so re-touched files still hit the cache
             'memory_optimization': False,
+            'gc_raise_threshold': False,  # With memory_optimization: fewer, larger GC passes process-wide
             'parallel_workers': None,
             'show_performance_metrics': False,
             'enhanced_metadata': False,
@@ -185,6 +197,7 @@ class Settings:
             'WHISPER_DOWNLOAD_ROOT': ('whisper', 'download_root'),
             'WHISPER_DOWNLOAD_TIMEOUT': ('whisper', 'download_timeout'),
             'WHISPER_NO_PROGRESS': ('whisper', 'no_progress'),
+            'WHISPER_BACKEND': ('whisper', 'backend'),
 
             # AI provider settings
             'AI_PROVIDER': ('ai', 'provider'),
@@ -242,6 +255,7 @@ class Settings:
             'language': ('transcription', 'default_language'),
             'chunk_duration': ('transcription', 'chunk_duration'),
             'force_chunking': ('transcription', 'force_chunking'),
+            'with_context': ('transcription', 'chunk_context'),
             'output_format': ('output', 'default_format'),
             'timestamps': ('output', 'include_timestamps'),
             'verbose': ('processing', 'verbose_progress'),
@@ -251,6 +265,11 @@ class Settings:
             'include_speaker_labels': ('enhancement', 'include_speaker_labels'),
             'include_speaker_confidence': ('enhancement', 'include_speaker_confidence'),
             'use_huggingface_token': ('enhancement', 'use_huggingface_token'),
+            'diarization_segmentation_batch_size': ('enhancement', 'diarization_segmentation_batch_size'),
+            'diarization_embedding_batch_size': ('enhancement', 'diarization_embedding_batch_size'),
+            'diarization_quantize': ('enhancement', 'diarization_quantize'),
+            'diarization_onnx': ('enhancement', 'diarization_onnx'),
+            'diarization_cache_dir': ('enhancement', 'diarization_cache_dir'),
             'enable_audio_preprocessing': ('enhancement', 'enable_audio_preprocessing'),
             'noise_reduction': ('enhancement', 'noise_reduction'),
             'volume_normalization': ('enhancement', 'volume_normalization'),
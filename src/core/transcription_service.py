@@ -15,7 +15,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'poc'))
 
 from poc.file_handler import FileHandler
 from poc.audio_processor import AudioProcessor
-from poc.transcription_engine import TranscriptionEngine
+from poc.transcription_engine import get_engine
 from poc.chunked_processor import ChunkedProcessor
 
 from config.settings import Settings
@@ -24,7 +24,7 @@ from utils.logger import ProgressLogger
 from enhancement.speaker_detection import SpeakerDetector, is_speaker_detection_available
 from enhancement.audio_preprocessing import AudioPreprocessor, AudioAnalyzer
 from enhancement.performance_optimizations import (
-    CacheManager, MemoryOptimizer, ParallelProcessor, PerformanceMonitor
+    CacheManager, FileSignature, MemoryOptimizer, ParallelProcessor, PerformanceMonitor
 )
 from enhancement.enhanced_metadata import MetadataEnhancer
 
@@ -90,20 +90,38 @@ class TranscriptionService:
         if self.settings.get('enhancement', 'enable_caching', True):
             if self.cache_manager is None:
                 cache_dir = self.settings.get('enhancement', 'cache_directory')
-                self.cache_manager = CacheManager(cache_dir=cache_dir)
+                content_keying = self.settings.get('enhancement', 'cache_content_keying', False)
+                self.cache_manager = CacheManager(cache_dir=cache_dir, logger=self.logger,
+                                                  content_keying=content_keying)
         
+        claim = None
         try:
             self.progress_logger.info(f"🎙️ Starting transcription of {input_file}")
             
             # Check cache first if enabled
             cached_result = None
+            file_sig = None
             if self.cache_manager:
+                try:
+                    # Stat once; the same signature keys the lookup and the later store
+                    file_sig = FileSignature.from_path(input_file)
+                except OSError:
+                    file_sig = None  # Validation below reports the missing file
+            if file_sig:
                 model = self.settings.get('transcription', 'default_model', 'base')
                 language = self.settings.get('transcription', 'default_language')
                 settings_hash = self._generate_settings_hash()
                 cached_result = self.cache_manager.get_transcription_cache(
-                    input_file, model, language, settings_hash
+                    file_sig, model, language, settings_hash
                 )
+                if not cached_result:
+                    claim = self.cache_manager.claim_transcription(file_sig, model, language, settings_hash)
+                    if claim is None:
+                        # Another worker is already transcribing this audio; reuse its result
+                        self.progress_logger.info("⏳ Waiting for another worker transcribing the same audio")
+                        cached_result = self.cache_manager.wait_for_transcription(
+                            file_sig, model, language, settings_hash
+                        )
                 
                 if cached_result:
                     self.progress_logger.info("🎯 Using cached transcription result")
@@ -173,6 +191,11 @@ class TranscriptionService:
                 'language': result.get('language', 'unknown'),
                 'from_cache': False
             }
+            if 'speaker_detection' in result:
+                # Speaker-labelled segments, so callers can render the transcript by speaker
+                final_result['segments'] = result.get('segments', [])
+                if 'speaker_formatted_text' in result:
+                    final_result['speaker_formatted_text'] = result['speaker_formatted_text']
             
             # Add performance stats if monitoring was enabled
             if performance_monitoring:
@@ -185,12 +208,9 @@ class TranscriptionService:
                     self.progress_logger.info(f"\n{performance_report}")
             
             # Cache result if caching is enabled
-            if self.cache_manager:
-                model = self.settings.get('transcription', 'default_model', 'base')
-                language = self.settings.get('transcription', 'default_language')
-                settings_hash = self._generate_settings_hash()
+            if file_sig:
                 self.cache_manager.set_transcription_cache(
-                    input_file, model, language, settings_hash, final_result
+                    file_sig, model, language, settings_hash, final_result
                 )
             
             # Perform memory optimization if enabled
@@ -215,10 +235,12 @@ class TranscriptionService:
             }
         finally:
             # Cleanup
+            if claim:
+                self.cache_manager.release_claim(claim)
+            if performance_monitoring:
+                self.performance_monitor.stop_monitoring(performance_monitoring)
             if hasattr(self, 'audio_processor'):
                 self.audio_processor.cleanup_temp_files()
-            if hasattr(self, 'chunked_processor') and self.chunked_processor:
-                self.chunked_processor.cleanup()
     
     def batch_transcribe(self, input_dir: str, output_dir: Optional[str] = None,
                         output_format: str = 'txt', recursive: bool = False) -> Dict[str, Any]:
@@ -368,6 +390,19 @@ class TranscriptionService:
                 'total_time': total_time
             }
     
+    def _make_chunked_processor(self) -> ChunkedProcessor:
+        """Create the chunked processor from the transcription settings."""
+        chunk_duration = self.settings.get('transcription', 'chunk_duration', 30)
+        # Chunks run one at a time unless parallel chunk processing is enabled
+        max_workers = None if self.settings.get('transcription', 'parallel_chunks', False) else 1
+        batch_size = self.settings.get('transcription', 'chunk_batch_size', 1)
+        with_context = self.settings.get('transcription', 'chunk_context', False)
+        return ChunkedProcessor(chunk_duration=chunk_duration,
+                                max_workers=max_workers,
+                                batch_size=batch_size,
+                                with_context=with_context,
+                                whisper_config=self.settings.whisper_config)
+    
     def _should_use_chunking(self, file_path: str, file_type: str) -> bool:
         """Determine if chunking should be used."""
         # Check force chunking setting
@@ -376,8 +411,7 @@ class TranscriptionService:
         
         # Use chunked processor's logic
         if not self.chunked_processor:
-            chunk_duration = self.settings.get('transcription', 'chunk_duration', 30)
-            self.chunked_processor = ChunkedProcessor(chunk_duration=chunk_duration)
+            self.chunked_processor = self._make_chunked_processor()
         
         return self.chunked_processor.should_use_chunking(file_path, file_type)
     
@@ -405,7 +439,18 @@ class TranscriptionService:
         if not self.transcription_engine:
             model = self.settings.get('transcription', 'default_model', 'base')
             whisper_config = self.settings.whisper_config
-            self.transcription_engine = TranscriptionEngine(model_size=model, whisper_config=whisper_config)
+            self.transcription_engine = get_engine(model, whisper_config=whisper_config)
+            if self.settings.get('enhancement', 'memory_optimization', False):
+                # Load up front so the model's long-lived objects can be frozen out of GC scans.
+                # This changes garbage collection for the whole process: every object alive now
+                # is never collected, and the optional threshold applies to all later allocations.
+                loaded, _ = self.transcription_engine.load_model()
+                if loaded:
+                    if self.memory_optimizer is None:
+                        self.memory_optimizer = MemoryOptimizer(self.logger)
+                    self.memory_optimizer.prime(
+                        raise_threshold=self.settings.get('enhancement', 'gc_raise_threshold', False)
+                    )
 
         language = self.settings.get('transcription', 'default_language')
 
@@ -425,8 +470,7 @@ class TranscriptionService:
     def _process_with_chunking(self, file_path: str, file_type: str) -> Dict[str, Any]:
         """Process file using chunked approach."""
         if not self.chunked_processor:
-            chunk_duration = self.settings.get('transcription', 'chunk_duration', 30)
-            self.chunked_processor = ChunkedProcessor(chunk_duration=chunk_duration)
+            self.chunked_processor = self._make_chunked_processor()
         
         model = self.settings.get('transcription', 'default_model', 'base')
         language = self.settings.get('transcription', 'default_language')
@@ -460,7 +504,13 @@ class TranscriptionService:
             # Initialize speaker detector if needed
             if self.speaker_detector is None:
                 enable_hf_token = self.settings.get('enhancement', 'use_huggingface_token', False)
-                self.speaker_detector = SpeakerDetector(enable_huggingface_token=enable_hf_token)
+                self.speaker_detector = SpeakerDetector(
+                    enable_huggingface_token=enable_hf_token,
+                    segmentation_batch_size=self.settings.get('enhancement', 'diarization_segmentation_batch_size'),
+                    embedding_batch_size=self.settings.get('enhancement', 'diarization_embedding_batch_size'),
+                    quantize=self.settings.get('enhancement', 'diarization_quantize', False),
+                    onnx=self.settings.get('enhancement', 'diarization_onnx', False)
+                )
             
             self.progress_logger.info("🎭 Performing speaker detection...")
             
@@ -475,7 +525,10 @@ class TranscriptionService:
             
             # Perform speaker detection
             num_speakers = self.settings.get('enhancement', 'expected_speakers')
-            speaker_result = self.speaker_detector.detect_speakers(audio_path, num_speakers)
+            speaker_result = self.speaker_detector.detect_speakers(
+                audio_path, num_speakers,
+                cache=self.settings.get('enhancement', 'diarization_cache_dir')
+            )
             
             if not speaker_result['success']:
                 self.progress_logger.info(f"⚠️  Speaker detection failed: {speaker_result['error']}")
@@ -6,24 +6,164 @@ Provides detailed transcription metadata, file analysis, and processing statisti
 import os
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 import logging
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from collections import Counter
+from functools import lru_cache
+from importlib.metadata import version, PackageNotFoundError
+
+import numpy as np
 
 try:
     import librosa
-    import numpy as np
     AUDIO_ANALYSIS_AVAILABLE = True
 except ImportError:
     AUDIO_ANALYSIS_AVAILABLE = False
 
+# Shared read-only fallback for missing settings sections; never mutate
+_EMPTY: Dict[str, Any] = {}
+
+# Workers for the heavy metadata sections, started on first use and kept for the process
+_section_pool: Optional[ThreadPoolExecutor] = None
+_section_pool_lock = threading.Lock()
+
+
+def _get_section_pool() -> ThreadPoolExecutor:
+    """Shared executor for generate_enhanced_metadata, so each output file doesn't spawn threads."""
+    global _section_pool
+    with _section_pool_lock:
+        if _section_pool is None:
+            _section_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="metadata")
+        return _section_pool
+
+
+@dataclass
+class _SegmentArrays:
+    """Struct-of-arrays view over transcription segments."""
+    starts: Any
+    ends: Any
+    speakers: Any  # object array, '' where a segment has no speaker label
+    labelled: Any  # bool mask of segments that carry a speaker label
+
+
+@dataclass
+class _ContentCtx:
+    """Per-call text analysis context shared by the content and quality helpers."""
+    text: str
+    buf: Any  # uint8 view over the UTF-8 encoded text
+    bincount: Any  # byte histogram; ASCII characters are indexed by ord()
+    tokens: List[str]
+    lower_tokens: List[str]
+    word_counts: Counter
+    sentence_word_counts: List[int]
+    uppercase: int
+    digits: int
+    
+    @property
+    def chars(self) -> int:
+        return len(self.text)
+    
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_word_counts)
+    
+    def count(self, char: str) -> int:
+        """Occurrences of an ASCII character, read from the byte histogram."""
+        return int(self.bincount[ord(char)])
+
+
+def _build_content_ctx(text: str) -> _ContentCtx:
+    """Encode and histogram the text once so every character count is an index lookup."""
+    buf = np.frombuffer(text.encode('utf-8', errors='ignore'), dtype=np.uint8)
+    bincount = np.bincount(buf, minlength=256)
+    if text.isascii():
+        uppercase = int(bincount[ord('A'):ord('Z') + 1].sum())
+        digits = int(bincount[ord('0'):ord('9') + 1].sum())
+    else:
+        # Non-ASCII letters and digits only show up through the str predicates
+        uppercase = sum(map(str.isupper, text))
+        digits = sum(map(str.isdigit, text))
+    
+    lower_tokens = text.lower().split()
+    return _ContentCtx(
+        text=text,
+        buf=buf,
+        bincount=bincount,
+        tokens=text.split(),
+        lower_tokens=lower_tokens,
+        word_counts=Counter(lower_tokens),
+        sentence_word_counts=[len(s.split()) for s in text.split('.') if s.strip()],
+        uppercase=uppercase,
+        digits=digits
+    )
+
+
+def _fmt_ts(ns: int) -> str:
+    """Format a nanosecond timestamp as local ISO 8601, matching datetime.isoformat()."""
+    seconds, frac = divmod(ns, 1_000_000_000)
+    formatted = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(seconds))
+    micros = frac // 1000
+    return f"{formatted}.{micros:06d}" if micros else formatted
+
+
+@lru_cache(maxsize=1)
+def _system_environment_info() -> Dict[str, Any]:
+    """Interpreter and platform details; platform.platform() may shell out, so run once."""
+    import platform
+    import sys
+    
+    return {
+        'python_version': sys.version,
+        'platform': platform.platform(),
+        'architecture': platform.architecture()[0],
+        'processor': platform.processor() or 'unknown'
+    }
+
+
+def _package_version(distribution: str) -> str:
+    """Installed version read from package metadata, without importing the package."""
+    try:
+        return version(distribution)
+    except PackageNotFoundError:
+        return 'not_available'
+
+
+@lru_cache(maxsize=1)
+def _dependency_info() -> Dict[str, str]:
+    """Versions of the heavy dependencies, resolved once per process."""
+    # Importing torch just to read __version__ costs seconds and hundreds of MB
+    return {
+        'openai-whisper': _package_version('openai-whisper'),
+        'librosa': _package_version('librosa'),
+        'torch': _package_version('torch')
+    }
+
+
+# Processing pipeline stages in order, each with a predicate on the transcription result
+_PIPELINE_RULES = (
+    ('Audio extraction/conversion', lambda tr: True),
+    ('Audio preprocessing', lambda tr: (tr.get('audio_preprocessing') or _EMPTY).get('enabled')),
+    ('Chunked processing', lambda tr: tr.get('chunk_count')),
+    ('Standard processing', lambda tr: not tr.get('chunk_count')),
+    ('Whisper transcription', lambda tr: True),
+    ('Speaker diarization', lambda tr: (tr.get('speaker_detection') or _EMPTY).get('enabled')),
+    ('Output formatting', lambda tr: True),
+)
+
+
 class MetadataEnhancer:
     """Enhances metadata output with detailed information."""
     
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.logger = logger or logging.getLogger(__name__)
         self.audio_analysis_available = AUDIO_ANALYSIS_AVAILABLE
+        # Resolved once so relative inputs in a batch don't each pay a getcwd() syscall
+        self._cwd = os.getcwd()
     
     def generate_enhanced_metadata(self, 
                                   input_file: str,
@@ -44,22 +184,40 @@ class MetadataEnhancer:
         Returns:
             Enhanced metadata dictionary
         """
+        # Shared by the transcription, quality and content sections
+        content_ctx = _build_content_ctx(transcription_result.get('text', ''))
+        run_audio_analysis = (self.audio_analysis_available and
+                              settings.get('enhanced_metadata_audio_analysis', True))
+        
+        # The heavy sections are independent: file hashing and librosa release the GIL,
+        # so running them alongside the text analysis overlaps most of their cost
+        executor = _get_section_pool()
+        input_file_future = executor.submit(self._generate_input_file_metadata, input_file, file_info)
+        audio_future = executor.submit(self._generate_audio_analysis, input_file) if run_audio_analysis else None
+        content_future = executor.submit(self._generate_content_analysis, transcription_result, content_ctx)
+        technical_future = executor.submit(self._generate_technical_details, transcription_result, settings)
+        
+        # The lighter sections run on this thread while the workers are busy
+        processing = self._generate_processing_metadata(settings, processing_stats)
+        transcription = self._generate_transcription_metadata(transcription_result, content_ctx)
+        quality_metrics = self._generate_quality_metrics(transcription_result, content_ctx)
+        
         metadata = {
             'version': '1.0.0-MVP-Phase3',
             'generated_at': datetime.now().isoformat(),
             'generation_timestamp': time.time(),
-            'input_file': self._generate_input_file_metadata(input_file, file_info),
-            'processing': self._generate_processing_metadata(settings, processing_stats),
-            'transcription': self._generate_transcription_metadata(transcription_result),
-            'quality_metrics': self._generate_quality_metrics(transcription_result),
-            'content_analysis': self._generate_content_analysis(transcription_result),
-            'technical_details': self._generate_technical_details(transcription_result, settings)
+            'input_file': input_file_future.result(),
+            'processing': processing,
+            'transcription': transcription,
+            'quality_metrics': quality_metrics,
+            'content_analysis': content_future.result(),
+            'technical_details': technical_future.result()
         }
         
         # Add audio analysis if available and requested
-        if self.audio_analysis_available and settings.get('enhanced_metadata_audio_analysis', True):
+        if audio_future is not None:
             try:
-                metadata['audio_analysis'] = self._generate_audio_analysis(input_file)
+                metadata['audio_analysis'] = audio_future.result()
             except Exception as e:
                 self.logger.warning(f"Audio analysis failed: {e}")
                 metadata['audio_analysis'] = {'available': False, 'error': str(e)}
@@ -77,58 +235,74 @@ class MetadataEnhancer:
     def _generate_input_file_metadata(self, input_file: str, file_info: Dict[str, Any]) -> Dict[str, Any]:
         """Generate detailed input file metadata."""
         try:
-            file_stat = os.stat(input_file)
-            file_path = Path(input_file)
+            file_stat, file_hash = self._stat_and_hash(input_file)
+            name = os.path.basename(input_file)
+            stem, extension = os.path.splitext(name)
+            
+            # ctime/mtime/atime frequently coincide; format each distinct value once
+            timestamps = {}
+            for ts in (file_stat.st_ctime_ns, file_stat.st_mtime_ns, file_stat.st_atime_ns):
+                if ts not in timestamps:
+                    timestamps[ts] = _fmt_ts(ts)
             
             return {
-                'path': str(file_path.absolute()),
-                'name': file_path.name,
-                'stem': file_path.stem,
-                'extension': file_path.suffix,
-                'directory': str(file_path.parent),
+                'path': self._absolute_path(input_file),
+                'name': name,
+                'stem': stem,
+                'extension': extension,
+                'directory': os.path.dirname(input_file) or '.',
                 'size_bytes': file_stat.st_size,
                 'size_mb': file_info.get('size_mb', file_stat.st_size / (1024 * 1024)),
                 'size_human': self._format_file_size(file_stat.st_size),
-                'created_at': datetime.fromtimestamp(file_stat.st_ctime).isoformat(),
-                'modified_at': datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
-                'accessed_at': datetime.fromtimestamp(file_stat.st_atime).isoformat(),
+                'created_at': timestamps[file_stat.st_ctime_ns],
+                'modified_at': timestamps[file_stat.st_mtime_ns],
+                'accessed_at': timestamps[file_stat.st_atime_ns],
                 'format_type': file_info.get('format_type', 'unknown'),
-                'mime_type': self._get_mime_type(file_path.suffix),
-                'file_hash': self._calculate_file_hash(input_file),
+                'mime_type': self._get_mime_type(extension),
+                'file_hash': file_hash,
                 'permissions': oct(file_stat.st_mode)[-3:]
             }
         except Exception as e:
             self.logger.warning(f"Could not generate input file metadata: {e}")
             return {
                 'path': input_file,
-                'name': Path(input_file).name,
+                'name': os.path.basename(input_file),
                 'error': str(e)
             }
     
+    def _absolute_path(self, input_file: str) -> str:
+        """Resolve input_file against the cached working directory, like Path.absolute()."""
+        # No normpath: collapsing '..' would change the path's meaning behind a symlink
+        return str(Path(self._cwd, input_file))
+    
     def _generate_processing_metadata(self, settings: Dict[str, Any], 
                                     processing_stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Generate processing configuration and statistics metadata."""
+        trans = settings.get('transcription') or _EMPTY
+        out = settings.get('output') or _EMPTY
+        enh = settings.get('enhancement') or _EMPTY
+        
         processing_metadata = {
-            'model': settings.get('transcription', {}).get('default_model', 'unknown'),
-            'language': settings.get('transcription', {}).get('default_language', 'auto-detect'),
-            'chunk_duration': settings.get('transcription', {}).get('chunk_duration', 30),
-            'chunking_used': settings.get('transcription', {}).get('force_chunking', False),
-            'timestamps_included': settings.get('output', {}).get('include_timestamps', False),
-            'metadata_included': settings.get('output', {}).get('include_metadata', True),
+            'model': trans.get('default_model', 'unknown'),
+            'language': trans.get('default_language', 'auto-detect'),
+            'chunk_duration': trans.get('chunk_duration', 30),
+            'chunking_used': trans.get('force_chunking', False),
+            'timestamps_included': out.get('include_timestamps', False),
+            'metadata_included': out.get('include_metadata', True),
             'features_enabled': {
-                'speaker_detection': settings.get('enhancement', {}).get('enable_speaker_detection', False),
-                'audio_preprocessing': settings.get('enhancement', {}).get('enable_audio_preprocessing', False),
-                'performance_optimizations': settings.get('enhancement', {}).get('enable_performance_optimizations', False),
-                'caching': settings.get('enhancement', {}).get('enable_caching', True),
-                'memory_optimization': settings.get('enhancement', {}).get('memory_optimization', False)
+                'speaker_detection': enh.get('enable_speaker_detection', False),
+                'audio_preprocessing': enh.get('enable_audio_preprocessing', False),
+                'performance_optimizations': enh.get('enable_performance_optimizations', False),
+                'caching': enh.get('enable_caching', True),
+                'memory_optimization': enh.get('memory_optimization', False)
             },
             'preprocessing_options': {
-                'noise_reduction': settings.get('enhancement', {}).get('noise_reduction', False),
-                'volume_normalization': settings.get('enhancement', {}).get('volume_normalization', False),
-                'high_pass_filter': settings.get('enhancement', {}).get('high_pass_filter', False),
-                'low_pass_filter': settings.get('enhancement', {}).get('low_pass_filter', False),
-                'enhance_speech': settings.get('enhancement', {}).get('enhance_speech', False),
-                'target_sample_rate': settings.get('enhancement', {}).get('target_sample_rate')
+                'noise_reduction': enh.get('noise_reduction', False),
+                'volume_normalization': enh.get('volume_normalization', False),
+                'high_pass_filter': enh.get('high_pass_filter', False),
+                'low_pass_filter': enh.get('low_pass_filter', False),
+                'enhance_speech': enh.get('enhance_speech', False),
+                'target_sample_rate': enh.get('target_sample_rate')
             }
         }
         
@@ -153,23 +327,26 @@ class MetadataEnhancer:
         
         return processing_metadata
     
-    def _generate_transcription_metadata(self, transcription_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_transcription_metadata(self, transcription_result: Dict[str, Any],
+                                         ctx: Optional[_ContentCtx] = None) -> Dict[str, Any]:
         """Generate transcription-specific metadata."""
         segments = transcription_result.get('segments', [])
+        text = transcription_result.get('text', '')
+        ctx = ctx or _build_content_ctx(text)
         
         transcription_metadata = {
-            'text_length': len(transcription_result.get('text', '')),
+            'text_length': ctx.chars,
             'word_count': transcription_result.get('word_count', 0),
-            'character_count': len(transcription_result.get('text', '').replace(' ', '')),
+            'character_count': ctx.chars - ctx.count(' '),
             'segment_count': len(segments),
             'average_confidence': transcription_result.get('confidence', 0),
             'language_detected': transcription_result.get('language', 'unknown'),
             'processing_method': transcription_result.get('processing_method', 'standard'),
             'duration_seconds': self._calculate_total_duration(segments),
-            'speaking_rate': self._calculate_speaking_rate(transcription_result.get('text', ''), segments),
+            'speaking_rate': self._calculate_speaking_rate(text, segments, ctx),
             'confidence_distribution': self._calculate_confidence_distribution(segments),
             'segment_statistics': self._calculate_segment_statistics(segments),
-            'word_statistics': self._calculate_word_statistics(transcription_result.get('text', ''))
+            'word_statistics': self._calculate_word_statistics(text, ctx)
         }
         
         # Add chunk information if available
@@ -183,7 +360,8 @@ class MetadataEnhancer:
         
         return transcription_metadata
     
-    def _generate_quality_metrics(self, transcription_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_quality_metrics(self, transcription_result: Dict[str, Any],
+                                  ctx: Optional[_ContentCtx] = None) -> Dict[str, Any]:
         """Generate transcription quality metrics."""
         segments = transcription_result.get('segments', [])
         
@@ -196,7 +374,7 @@ class MetadataEnhancer:
             'low_confidence_segments': len([s for s in segments if s.get('avg_logprob', 0) < -0.5]),
             'high_confidence_segments': len([s for s in segments if s.get('avg_logprob', 0) > -0.2]),
             'silence_detection': self._analyze_silences(segments),
-            'repetition_analysis': self._analyze_repetitions(transcription_result.get('text', '')),
+            'repetition_analysis': self._analyze_repetitions(transcription_result.get('text', ''), ctx),
             'length_consistency': self._analyze_segment_length_consistency(segments),
             'quality_score': self._calculate_overall_quality_score(transcription_result),
             'reliability_indicators': self._generate_reliability_indicators(transcription_result)
@@ -204,19 +382,21 @@ class MetadataEnhancer:
         
         return quality_metrics
     
-    def _generate_content_analysis(self, transcription_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_content_analysis(self, transcription_result: Dict[str, Any],
+                                   ctx: Optional[_ContentCtx] = None) -> Dict[str, Any]:
         """Generate content analysis of the transcription."""
         text = transcription_result.get('text', '')
+        ctx = ctx or _build_content_ctx(text)
         
         content_analysis = {
-            'sentence_count': len([s for s in text.split('.') if s.strip()]),
+            'sentence_count': ctx.sentence_count,
             'paragraph_count': len([p for p in text.split('\n') if p.strip()]),
-            'average_sentence_length': self._calculate_average_sentence_length(text),
-            'vocabulary_diversity': self._calculate_vocabulary_diversity(text),
-            'most_common_words': self._get_most_common_words(text, top_n=10),
-            'language_patterns': self._analyze_language_patterns(text),
-            'punctuation_analysis': self._analyze_punctuation(text),
-            'readability_metrics': self._calculate_readability_metrics(text)
+            'average_sentence_length': self._calculate_average_sentence_length(text, ctx),
+            'vocabulary_diversity': self._calculate_vocabulary_diversity(text, ctx),
+            'most_common_words': self._get_most_common_words(text, top_n=10, ctx=ctx),
+            'language_patterns': self._analyze_language_patterns(text, ctx),
+            'punctuation_analysis': self._analyze_punctuation(text, ctx),
+            'readability_metrics': self._calculate_readability_metrics(text, ctx)
         }
         
         return content_analysis
@@ -224,11 +404,13 @@ class MetadataEnhancer:
     def _generate_technical_details(self, transcription_result: Dict[str, Any], 
                                   settings: Dict[str, Any]) -> Dict[str, Any]:
         """Generate technical processing details."""
+        trans = settings.get('transcription') or _EMPTY
+        model = trans.get('default_model')
         return {
             'whisper_model_info': {
-                'model_size': settings.get('transcription', {}).get('default_model', 'unknown'),
-                'model_parameters': self._get_model_parameters(settings.get('transcription', {}).get('default_model')),
-                'computational_requirements': self._get_computational_requirements(settings.get('transcription', {}).get('default_model'))
+                'model_size': trans.get('default_model', 'unknown'),
+                'model_parameters': self._get_model_parameters(model),
+                'computational_requirements': self._get_computational_requirements(model)
             },
             'processing_pipeline': self._get_processing_pipeline_info(transcription_result, settings),
             'output_formats': self._get_output_format_info(settings),
@@ -284,14 +466,16 @@ class MetadataEnhancer:
     def _generate_speaker_analysis(self, transcription_result: Dict[str, Any]) -> Dict[str, Any]:
         """Generate speaker-specific analysis."""
         speaker_data = transcription_result.get('speaker_detection', {})
+        segments = transcription_result.get('segments', [])
+        soa = self._segments_to_soa(segments)
         
         speaker_analysis = {
             'speaker_count': speaker_data.get('speaker_count', 0),
             'speakers_identified': speaker_data.get('speakers', []),
             'speaker_statistics': speaker_data.get('speaker_stats', {}),
             'speaker_distribution': self._calculate_speaker_distribution(speaker_data),
-            'speaker_transitions': self._calculate_speaker_transitions(transcription_result.get('segments', [])),
-            'conversation_analysis': self._analyze_conversation_patterns(transcription_result.get('segments', []))
+            'speaker_transitions': self._calculate_speaker_transitions(segments, soa),
+            'conversation_analysis': self._analyze_conversation_patterns(segments, soa)
         }
         
         return speaker_analysis
@@ -332,17 +516,18 @@ class MetadataEnhancer:
         }
         return mime_types.get(extension.lower(), 'application/octet-stream')
     
-    def _calculate_file_hash(self, file_path: str) -> str:
-        """Calculate SHA-256 hash of file."""
+    def _stat_and_hash(self, file_path: str) -> Tuple[os.stat_result, str]:
+        """Stat and SHA-256 hash a file through a single open descriptor."""
         try:
-            hash_sha256 = hashlib.sha256()
-            with open(file_path, "rb") as f:
-                # Read file in chunks to handle large files
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()
-        except Exception:
-            return "hash_calculation_failed"
+            with open(file_path, "rb", buffering=0) as f:
+                file_stat = os.fstat(f.fileno())
+                try:
+                    return file_stat, hashlib.file_digest(f, "sha256").hexdigest()
+                except Exception:
+                    return file_stat, "hash_calculation_failed"
+        except OSError:
+            # Unreadable files still get stat metadata; missing files raise here
+            return os.stat(file_path), "hash_calculation_failed"
     
     def _calculate_total_duration(self, segments: List[Dict[str, Any]]) -> float:
         """Calculate total duration from segments."""
@@ -350,9 +535,10 @@ class MetadataEnhancer:
             return 0.0
         return max(seg.get('end', 0) for seg in segments)
     
-    def _calculate_speaking_rate(self, text: str, segments: List[Dict[str, Any]]) -> float:
+    def _calculate_speaking_rate(self, text: str, segments: List[Dict[str, Any]],
+                                 ctx: Optional[_ContentCtx] = None) -> float:
         """Calculate words per minute."""
-        word_count = len(text.split())
+        word_count = len(ctx.tokens) if ctx else len(text.split())
         duration_minutes = self._calculate_total_duration(segments) / 60
         return word_count / duration_minutes if duration_minutes > 0 else 0
     
@@ -398,9 +584,10 @@ class MetadataEnhancer:
             }
         }
     
-    def _calculate_word_statistics(self, text: str) -> Dict[str, Any]:
+    def _calculate_word_statistics(self, text: str,
+                                   ctx: Optional[_ContentCtx] = None) -> Dict[str, Any]:
         """Calculate word-level statistics."""
-        words = text.split()
+        words = ctx.tokens if ctx else text.split()
         if not words:
             return {'available': False}
         
@@ -438,16 +625,14 @@ class MetadataEnhancer:
             'shortest_silence': float(np.min(silences))
         }
     
-    def _analyze_repetitions(self, text: str) -> Dict[str, Any]:
+    def _analyze_repetitions(self, text: str,
+                             ctx: Optional[_ContentCtx] = None) -> Dict[str, Any]:
         """Analyze word and phrase repetitions."""
-        words = text.lower().split()
-        if not words:
+        ctx = ctx or _build_content_ctx(text)
+        if not ctx.lower_tokens:
             return {'available': False}
         
-        # Count word frequencies
-        word_counts = {}
-        for word in words:
-            word_counts[word] = word_counts.get(word, 0) + 1
+        word_counts = ctx.word_counts
         
         repeated_words = {word: count for word, count in word_counts.items() if count > 1}
         
@@ -527,53 +712,63 @@ class MetadataEnhancer:
         
         return indicators
     
-    def _calculate_average_sentence_length(self, text: str) -> float:
+    def _calculate_average_sentence_length(self, text: str,
+                                           ctx: Optional[_ContentCtx] = None) -> float:
         """Calculate average sentence length in words."""
-        sentences = [s.strip() for s in text.split('.') if s.strip()]
-        if not sentences:
+        ctx = ctx or _build_content_ctx(text)
+        word_counts = ctx.sentence_word_counts
+        if not word_counts:
             return 0
         
-        word_counts = [len(sentence.split()) for sentence in sentences]
         return float(np.mean(word_counts))
     
-    def _calculate_vocabulary_diversity(self, text: str) -> float:
+    def _calculate_vocabulary_diversity(self, text: str,
+                                        ctx: Optional[_ContentCtx] = None) -> float:
         """Calculate vocabulary diversity (unique words / total words)."""
-        words = text.lower().split()
-        if not words:
+        ctx = ctx or _build_content_ctx(text)
+        if not ctx.lower_tokens:
             return 0
         
-        return len(set(words)) / len(words)
+        return len(ctx.word_counts) / len(ctx.lower_tokens)
     
-    def _get_most_common_words(self, text: str, top_n: int = 10) -> List[Dict[str, Any]]:
+    def _get_most_common_words(self, text: str, top_n: int = 10,
+                               ctx: Optional[_ContentCtx] = None) -> List[Dict[str, Any]]:
         """Get most common words in the text."""
-        words = [word.lower().strip('.,!?";:') for word in text.split()]
+        ctx = ctx or _build_content_ctx(text)
         word_counts = {}
         
-        for word in words:
+        # Strip each distinct token once; insertion order still follows first occurrence
+        for token, count in ctx.word_counts.items():
+            word = token.strip('.,!?";:')
             if word and len(word) > 2:  # Exclude very short words
-                word_counts[word] = word_counts.get(word, 0) + 1
+                word_counts[word] = word_counts.get(word, 0) + count
         
         sorted_words = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
         return [{'word': word, 'count': count} for word, count in sorted_words[:top_n]]
     
-    def _analyze_language_patterns(self, text: str) -> Dict[str, Any]:
+    def _analyze_language_patterns(self, text: str,
+                                   ctx: Optional[_ContentCtx] = None) -> Dict[str, Any]:
         """Analyze language patterns in the text."""
+        ctx = ctx or _build_content_ctx(text)
+        chars = ctx.chars
         return {
-            'question_count': text.count('?'),
-            'exclamation_count': text.count('!'),
-            'uppercase_ratio': len([c for c in text if c.isupper()]) / len(text) if text else 0,
-            'digit_ratio': len([c for c in text if c.isdigit()]) / len(text) if text else 0
+            'question_count': ctx.count('?'),
+            'exclamation_count': ctx.count('!'),
+            'uppercase_ratio': ctx.uppercase / chars if chars else 0,
+            'digit_ratio': ctx.digits / chars if chars else 0
         }
     
-    def _analyze_punctuation(self, text: str) -> Dict[str, Any]:
+    def _analyze_punctuation(self, text: str,
+                             ctx: Optional[_ContentCtx] = None) -> Dict[str, Any]:
         """Analyze punctuation usage."""
+        ctx = ctx or _build_content_ctx(text)
         punctuation_counts = {
-            'periods': text.count('.'),
-            'commas': text.count(','),
-            'questions': text.count('?'),
-            'exclamations': text.count('!'),
-            'semicolons': text.count(';'),
-            'colons': text.count(':')
+            'periods': ctx.count('.'),
+            'commas': ctx.count(','),
+            'questions': ctx.count('?'),
+            'exclamations': ctx.count('!'),
+            'semicolons': ctx.count(';'),
+            'colons': ctx.count(':')
         }
         
         total_punct = sum(punctuation_counts.values())
@@ -581,14 +776,16 @@ class MetadataEnhancer:
         return {
             'counts': punctuation_counts,
             'total_punctuation': total_punct,
-            'punctuation_density': total_punct / len(text) if text else 0
+            'punctuation_density': total_punct / ctx.chars if ctx.chars else 0
         }
     
-    def _calculate_readability_metrics(self, text: str) -> Dict[str, Any]:
+    def _calculate_readability_metrics(self, text: str,
+                                       ctx: Optional[_ContentCtx] = None) -> Dict[str, Any]:
         """Calculate basic readability metrics."""
-        sentences = len([s for s in text.split('.') if s.strip()])
-        words = len(text.split())
-        characters = len(text.replace(' ', ''))
+        ctx = ctx or _build_content_ctx(text)
+        sentences = ctx.sentence_count
+        words = len(ctx.tokens)
+        characters = ctx.chars - ctx.count(' ')
         
         if sentences == 0 or words == 0:
             return {'available': False}
@@ -628,68 +825,24 @@ class MetadataEnhancer:
     def _get_processing_pipeline_info(self, transcription_result: Dict[str, Any], 
                                     settings: Dict[str, Any]) -> List[str]:
         """Get information about the processing pipeline used."""
-        pipeline = ['Audio extraction/conversion']
-        
-        if transcription_result.get('audio_preprocessing', {}).get('enabled'):
-            pipeline.append('Audio preprocessing')
-        
-        if transcription_result.get('chunk_count'):
-            pipeline.append('Chunked processing')
-        else:
-            pipeline.append('Standard processing')
-        
-        pipeline.append('Whisper transcription')
-        
-        if transcription_result.get('speaker_detection', {}).get('enabled'):
-            pipeline.append('Speaker diarization')
-        
-        pipeline.append('Output formatting')
-        
-        return pipeline
+        return [stage for stage, applies in _PIPELINE_RULES if applies(transcription_result)]
     
     def _get_output_format_info(self, settings: Dict[str, Any]) -> Dict[str, Any]:
         """Get output format information."""
+        out = settings.get('output') or _EMPTY
         return {
-            'format': settings.get('output', {}).get('default_format', 'txt'),
-            'metadata_included': settings.get('output', {}).get('include_metadata', True),
-            'timestamps_included': settings.get('output', {}).get('include_timestamps', False)
+            'format': out.get('default_format', 'txt'),
+            'metadata_included': out.get('include_metadata', True),
+            'timestamps_included': out.get('include_timestamps', False)
         }
     
     def _get_system_environment_info(self) -> Dict[str, Any]:
         """Get system environment information."""
-        import platform
-        import sys
-        
-        return {
-            'python_version': sys.version,
-            'platform': platform.platform(),
-            'architecture': platform.architecture()[0],
-            'processor': platform.processor() or 'unknown'
-        }
+        return dict(_system_environment_info())
     
     def _get_dependency_info(self) -> Dict[str, Any]:
         """Get dependency version information."""
-        dependencies = {}
-        
-        try:
-            import whisper
-            dependencies['openai-whisper'] = whisper.__version__
-        except ImportError:
-            dependencies['openai-whisper'] = 'not_available'
-        
-        try:
-            import librosa
-            dependencies['librosa'] = librosa.__version__
-        except ImportError:
-            dependencies['librosa'] = 'not_available'
-        
-        try:
-            import torch
-            dependencies['torch'] = torch.__version__
-        except ImportError:
-            dependencies['torch'] = 'not_available'
-        
-        return dependencies
+        return dict(_dependency_info())
     
     def _calculate_speaker_distribution(self, speaker_data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate speaker time distribution."""
@@ -697,16 +850,19 @@ class MetadataEnhancer:
         if not speaker_stats:
             return {'available': False}
         
-        total_time = sum(stats.get('total_duration', 0) for stats in speaker_stats.values())
+        durations = np.fromiter((stats.get('total_duration', 0) for stats in speaker_stats.values()),
+                                dtype=np.float64, count=len(speaker_stats))
+        total_time = float(durations.sum())
+        percentages = (durations / total_time * 100).tolist() if total_time > 0 else [0] * len(durations)
         
-        distribution = {}
-        for speaker, stats in speaker_stats.items():
-            duration = stats.get('total_duration', 0)
-            distribution[speaker] = {
-                'duration_seconds': duration,
-                'percentage': (duration / total_time * 100) if total_time > 0 else 0,
+        distribution = {
+            speaker: {
+                'duration_seconds': stats.get('total_duration', 0),
+                'percentage': percentage,
                 'segment_count': stats.get('segment_count', 0)
             }
+            for (speaker, stats), percentage in zip(speaker_stats.items(), percentages)
+        }
         
         return {
             'available': True,
@@ -714,19 +870,30 @@ class MetadataEnhancer:
             'speaker_distribution': distribution
         }
     
-    def _calculate_speaker_transitions(self, segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _segments_to_soa(self, segments: List[Dict[str, Any]]) -> _SegmentArrays:
+        """Build a struct-of-arrays view of segment timings and speaker labels."""
+        count = len(segments)
+        speakers = np.array([seg.get('speaker') or '' for seg in segments], dtype=object)
+        return _SegmentArrays(
+            starts=np.fromiter((seg.get('start', 0) for seg in segments), dtype=np.float64, count=count),
+            ends=np.fromiter((seg.get('end', 0) for seg in segments), dtype=np.float64, count=count),
+            speakers=speakers,
+            # Object-array comparisons run per element, so the mask is built once and shared
+            labelled=speakers != ''
+        )
+    
+    def _calculate_speaker_transitions(self, segments: List[Dict[str, Any]],
+                                       soa: Optional[_SegmentArrays] = None) -> Dict[str, Any]:
         """Calculate speaker transition patterns."""
         if len(segments) < 2:
             return {'available': False}
         
-        transitions = 0
-        prev_speaker = None
-        
-        for segment in segments:
-            current_speaker = segment.get('speaker')
-            if current_speaker and prev_speaker and current_speaker != prev_speaker:
-                transitions += 1
-            prev_speaker = current_speaker
+        soa = soa or self._segments_to_soa(segments)
+        speakers = soa.speakers
+        labelled = soa.labelled
+        # A transition is a change between two adjacent labelled segments
+        changes = (speakers[1:] != speakers[:-1]) & labelled[1:] & labelled[:-1]
+        transitions = int(np.count_nonzero(changes))
         
         return {
             'available': True,
@@ -734,38 +901,31 @@ class MetadataEnhancer:
             'average_segments_per_speaker': len(segments) / (transitions + 1) if transitions >= 0 else len(segments)
         }
     
-    def _analyze_conversation_patterns(self, segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_conversation_patterns(self, segments: List[Dict[str, Any]],
+                                       soa: Optional[_SegmentArrays] = None) -> Dict[str, Any]:
         """Analyze conversation patterns between speakers."""
         if not segments:
             return {'available': False}
         
-        speakers_with_segments = [seg for seg in segments if seg.get('speaker')]
-        if len(speakers_with_segments) < 2:
+        soa = soa or self._segments_to_soa(segments)
+        labelled = soa.labelled
+        speakers = soa.speakers[labelled]
+        if len(speakers) < 2:
             return {'available': False}
         
-        # Calculate turn-taking metrics
-        speaker_turns = []
-        current_speaker = None
-        turn_length = 0
-        
-        for segment in speakers_with_segments:
-            speaker = segment.get('speaker')
-            if speaker != current_speaker:
-                if current_speaker and turn_length > 0:
-                    speaker_turns.append(turn_length)
-                current_speaker = speaker
-                turn_length = 1
-            else:
-                turn_length += 1
-        
-        if turn_length > 0:
-            speaker_turns.append(turn_length)
+        # Turns are runs of consecutive labelled segments from the same speaker
+        turn_starts = np.flatnonzero(np.concatenate(([True], speakers[1:] != speakers[:-1])))
+        turn_ends = np.append(turn_starts[1:], len(speakers))
+        speaker_turns = np.diff(turn_starts, append=len(speakers))
+        turn_durations = soa.ends[labelled][turn_ends - 1] - soa.starts[labelled][turn_starts]
+        average_turn_length = float(np.mean(speaker_turns))
         
         return {
             'available': True,
-            'average_turn_length': float(np.mean(speaker_turns)) if speaker_turns else 0,
-            'turn_length_variance': float(np.var(speaker_turns)) if speaker_turns else 0,
-            'conversation_style': 'interactive' if np.mean(speaker_turns) < 3 else 'monologue-heavy' if np.mean(speaker_turns) > 10 else 'balanced'
+            'average_turn_length': average_turn_length,
+            'turn_length_variance': float(np.var(speaker_turns)),
+            'average_turn_duration': float(np.mean(turn_durations)),
+            'conversation_style': 'interactive' if average_turn_length < 3 else 'monologue-heavy' if average_turn_length > 10 else 'balanced'
         }
     
     def _analyze_preprocessing_impact(self, preprocessing_data: Dict[str, Any]) -> Dict[str, Any]:
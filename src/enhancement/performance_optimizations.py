@@ -4,18 +4,24 @@ Provides multi-threading, caching, memory optimization, and processing speed imp
 """
 
 import os
+import sys
 import gc
+import ctypes
 import threading
 import multiprocessing
 import time
 import hashlib
 import pickle
+import sqlite3
+import struct
 import tempfile
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Tuple, Union
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from collections import deque
 
 try:
     import psutil
@@ -23,6 +29,18 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
 @dataclass
 class ProcessingStats:
     """Statistics for processing performance monitoring."""
@@ -36,86 +54,266 @@ class ProcessingStats:
     cache_hits: int = 0
     cache_misses: int = 0
 
+@dataclass(frozen=True, slots=True)
+class FileSignature:
+    """Identity of an input file for cache keys: path, size and modification time."""
+    path: str
+    size: int
+    mtime: float
+    key_bytes: bytes = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'key_bytes', f"{self.path}_{self.size}_{self.mtime}".encode())
+    
+    @classmethod
+    def from_path(cls, file_path: str) -> 'FileSignature':
+        """Stat file_path once and capture its signature."""
+        file_stat = os.stat(file_path)
+        return cls(file_path, file_stat.st_size, file_stat.st_mtime)
+
+
 class CacheManager:
     """Manages caching for transcription results and processed audio."""
     
-    def __init__(self, cache_dir: Optional[str] = None, max_cache_size_mb: int = 1000):
+    CACHE_TYPES = ("transcriptions", "audio_processing", "speaker_detection")
+    RESYNC_INTERVAL = 1000  # Writes between full size recounts
+    CLAIM_POLL_INTERVAL = 0.5  # Seconds between checks while another worker holds a claim
+    CLAIM_STALE_SECONDS = 3600  # Claims older than this are assumed abandoned
+    CLAIM_WAIT_SECONDS = 300  # Longest wait on a live holder before transcribing anyway
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_cache_size_mb: int = 1000,
+                 logger: Optional[logging.Logger] = None, content_keying: bool = False):
         """
         Initialize cache manager.
         
         Args:
             cache_dir: Directory for cache files (default: system temp)
             max_cache_size_mb: Maximum cache size in MB
+            logger: Logger instance
+            content_keying: Key transcriptions by a digest of the file's bytes instead of its
+                size and mtime. Costs a full read of every file not seen before
         """
+        self.logger = logger or logging.getLogger(__name__)
         self.cache_dir = Path(cache_dir) if cache_dir else Path(tempfile.gettempdir()) / "transcription_cache"
         self.cache_dir.mkdir(exist_ok=True)
         self.max_cache_size = max_cache_size_mb * 1024 * 1024  # Convert to bytes
+        self.content_keying = content_keying
         self.cache_hits = 0
         self.cache_misses = 0
         
-        # Create subdirectories
-        (self.cache_dir / "transcriptions").mkdir(exist_ok=True)
-        (self.cache_dir / "audio_processing").mkdir(exist_ok=True)
-        (self.cache_dir / "speaker_detection").mkdir(exist_ok=True)
+        # All entries live in one SQLite database: a hit is a single indexed lookup
+        # instead of a file open per entry and a directory scan per write
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.cache_dir / "cache.sqlite"),
+                                   isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, cache_type TEXT NOT NULL, mtime INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, compressed INTEGER NOT NULL, payload BLOB NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS cache_mtime ON cache (mtime)")
+        # File signature -> content digest, used with content_keying so a re-touched file with
+        # unchanged audio is not transcribed again. `created` is refreshed whenever a result is
+        # stored under the digest, and rows older than the oldest cache entry are pruned on eviction
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS manifest (sig_key TEXT PRIMARY KEY, content_hash TEXT NOT NULL, "
+            "created INTEGER NOT NULL DEFAULT 0)"
+        )
+        try:
+            self._db.execute("ALTER TABLE manifest ADD COLUMN created INTEGER NOT NULL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass  # Column already present
+        self._purge_legacy_files()
+        
+        # Running total of payload bytes so writes don't have to re-sum the table
+        self._current_bytes = self._total_size()
+        self._writes_since_resync = 0
+        
+        self._compressor = zstandard.ZstdCompressor(level=3) if ZSTD_AVAILABLE else None
+        self._decompressor = zstandard.ZstdDecompressor() if ZSTD_AVAILABLE else None
     
-    def _generate_cache_key(self, content: str, prefix: str = "") -> str:
+    def _purge_legacy_files(self):
+        """Remove per-file *.pkl entries left over from the pre-SQLite cache layout."""
+        for cache_subdir in self.CACHE_TYPES:
+            try:
+                # scandir reads names and types in one getdents pass; no Path per entry
+                with os.scandir(self.cache_dir / cache_subdir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith('.pkl') and entry.is_file(follow_symlinks=False):
+                            try:
+                                os.unlink(entry.path)
+                            except OSError:
+                                pass
+                os.rmdir(self.cache_dir / cache_subdir)
+            except OSError:
+                pass  # Missing or non-empty directory
+    
+    def _generate_cache_key(self, content: Union[str, bytes], prefix: str = "") -> str:
         """Generate cache key from content."""
-        hash_obj = hashlib.sha256(content.encode())
+        if isinstance(content, str):
+            content = content.encode()
+        # Keys only need to be collision-resistant, not cryptographic
+        if BLAKE3_AVAILABLE:
+            hash_obj = blake3(content)
+        else:
+            hash_obj = hashlib.blake2b(content, digest_size=8)
         return f"{prefix}_{hash_obj.hexdigest()[:16]}"
     
-    def _get_cache_path(self, cache_type: str, cache_key: str) -> Path:
-        """Get cache file path."""
-        return self.cache_dir / cache_type / f"{cache_key}.pkl"
+    def _content_hash(self, sig: FileSignature) -> str:
+        """
+        Digest of the file's bytes, hashed once per signature and remembered in the manifest.
+        
+        Every new signature (a new file, or a modified or re-touched one) costs a full read of
+        the file. Since the path is also part of transcription keys, the digest only pays off
+        when a file is re-touched without its content changing.
+        """
+        sig_key = self._generate_cache_key(sig.key_bytes, "manifest")
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT content_hash FROM manifest WHERE sig_key = ?", (sig_key,)
+            ).fetchone()
+        if row is not None:
+            return row[0]
+        
+        with open(sig.path, 'rb') as f:
+            digest = hashlib.file_digest(f, blake3 if BLAKE3_AVAILABLE else
+                                         partial(hashlib.blake2b, digest_size=16))
+        content_hash = digest.hexdigest()[:32]
+        with self._db_lock:
+            self._db.execute("INSERT OR REPLACE INTO manifest (sig_key, content_hash, created) VALUES (?, ?, ?)",
+                             (sig_key, content_hash, time.time_ns()))
+        return content_hash
+    
+    def _touch_manifest(self, sig: FileSignature):
+        """Mark a signature's digest as used by a result just stored, so eviction keeps it."""
+        sig_key = self._generate_cache_key(sig.key_bytes, "manifest")
+        with self._db_lock:
+            self._db.execute("UPDATE manifest SET created = ? WHERE sig_key = ?", (time.time_ns(), sig_key))
+    
+    def _encode(self, value: Any) -> Tuple[bytes, bool]:
+        """Serialize a cache value, compressing it when zstandard is available."""
+        # Protocol 5 hands large contiguous buffers (numpy arrays) out-of-band, so they
+        # are copied once into the payload instead of through pickle's byte stream
+        buffers = []
+        data = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+        raw_buffers = [buffer.raw() for buffer in buffers]
+        header = struct.pack(f"<II{len(raw_buffers)}Q", len(data), len(raw_buffers),
+                             *(raw.nbytes for raw in raw_buffers))
+        payload = b"".join([header, data, *raw_buffers])
+        if self._compressor is not None:
+            return self._compressor.compress(payload), True
+        return payload, False
+    
+    def _decode(self, payload: bytes, compressed: bool) -> Any:
+        """Inverse of _encode."""
+        if compressed:
+            if self._decompressor is None:
+                raise RuntimeError("zstandard is required to read this cache entry")
+            payload = self._decompressor.decompress(payload)
+        
+        data_len, buffer_count = struct.unpack_from("<II", payload)
+        buffer_lens = struct.unpack_from(f"<{buffer_count}Q", payload, 8)
+        offset = 8 + 8 * buffer_count
+        if buffer_count:
+            # Out-of-band buffers are rebuilt as views; a bytearray keeps them writable
+            payload = bytearray(payload)
+        view = memoryview(payload)
+        data = view[offset:offset + data_len]
+        offset += data_len
+        buffers = []
+        for length in buffer_lens:
+            buffers.append(view[offset:offset + length])
+            offset += length
+        return pickle.loads(data, buffers=buffers)
+    
+    def _read_entry(self, cache_key: str) -> Optional[Any]:
+        """Load a cached value, or None if the key is not present."""
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT payload, compressed FROM cache WHERE key = ?", (cache_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return self._decode(row[0], bool(row[1]))
+    
+    def _write_entry(self, cache_type: str, cache_key: str, value: Any):
+        """Store a value under cache_key, replacing any previous entry."""
+        payload, compressed = self._encode(value)
+        with self._db_lock:
+            previous = self._db.execute("SELECT size FROM cache WHERE key = ?", (cache_key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (key, cache_type, mtime, size, compressed, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key, cache_type, time.time_ns(), len(payload), int(compressed), payload)
+            )
+            self._current_bytes += len(payload) - (previous[0] if previous else 0)
+            self._writes_since_resync += 1
+    
+    def _total_size(self) -> int:
+        """Sum entry sizes in the database. Caller must hold _db_lock."""
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
     
     def _cleanup_cache(self):
-        """Remove old cache files if cache size exceeds limit."""
+        """Remove old cache entries if cache size exceeds limit."""
         try:
-            total_size = 0
-            cache_files = []
-            
-            # Collect all cache files with their sizes and modification times
-            for cache_subdir in ["transcriptions", "audio_processing", "speaker_detection"]:
-                subdir = self.cache_dir / cache_subdir
-                if subdir.exists():
-                    for cache_file in subdir.glob("*.pkl"):
-                        stat = cache_file.stat()
-                        total_size += stat.st_size
-                        cache_files.append((cache_file, stat.st_size, stat.st_mtime))
-            
-            # If cache is too large, remove oldest files
-            if total_size > self.max_cache_size:
-                # Sort by modification time (oldest first)
-                cache_files.sort(key=lambda x: x[2])
+            with self._db_lock:
+                # Other processes may share the database, so the running counter is
+                # re-synced from a full SUM every RESYNC_INTERVAL writes
+                if self._writes_since_resync >= self.RESYNC_INTERVAL:
+                    self._current_bytes = self._total_size()
+                    self._writes_since_resync = 0
                 
-                bytes_to_remove = total_size - self.max_cache_size
-                bytes_removed = 0
-                
-                for cache_file, file_size, _ in cache_files:
-                    if bytes_removed >= bytes_to_remove:
-                        break
-                    
-                    try:
-                        cache_file.unlink()
-                        bytes_removed += file_size
-                    except Exception:
-                        pass  # Ignore errors when removing cache files
+                # If cache is too large, remove oldest entries until enough bytes are freed
+                if self._current_bytes > self.max_cache_size:
+                    bytes_to_remove = self._current_bytes - self.max_cache_size
+                    self._db.execute(
+                        "DELETE FROM cache WHERE key IN ("
+                        "SELECT key FROM (SELECT key, size, SUM(size) OVER (ORDER BY mtime, key) AS running "
+                        "FROM cache) WHERE running - size < ?)",
+                        (bytes_to_remove,)
+                    )
+                    self._current_bytes = self._total_size()
+                    self._writes_since_resync = 0
+                    # A digest is touched after each result stored under it, so digests older
+                    # than the oldest surviving entry only lead to evicted results (or to a
+                    # transcription still running); dropping one costs at most a re-hash
+                    self._db.execute(
+                        "DELETE FROM manifest WHERE created < COALESCE((SELECT MIN(mtime) FROM cache), ?)",
+                        (time.time_ns(),)
+                    )
                         
-        except Exception:
-            pass  # Ignore errors in cache cleanup
+        except sqlite3.Error as e:
+            # Eviction needs window functions (SQLite 3.25+) and a writable database
+            self.logger.warning(f"Cache cleanup failed, cache may exceed its size limit: {e}")
     
-    def get_transcription_cache(self, file_path: str, model: str, language: Optional[str] = None,
+    @staticmethod
+    def _signature(file: Union[str, FileSignature]) -> FileSignature:
+        """Accept either a precomputed signature or a path to stat."""
+        return file if isinstance(file, FileSignature) else FileSignature.from_path(file)
+    
+    def _transcription_key(self, file: Union[str, FileSignature], model: str,
+                           language: Optional[str], settings_hash: str) -> str:
+        """Key a transcription by input signature (or content digest), model and settings."""
+        sig = self._signature(file)
+        if not self.content_keying:
+            cache_content = sig.key_bytes + f"_{model}_{language}_{settings_hash}".encode()
+            return self._generate_cache_key(cache_content, "transcription")
+        # The path stays in the key because cached results carry path-specific fields
+        # (file_info, output_file); the digest lets a re-touched but unchanged file still hit
+        content_hash = self._content_hash(sig)
+        cache_content = f"{sig.path}_{content_hash}_{model}_{language}_{settings_hash}"
+        return self._generate_cache_key(cache_content, "transcription")
+    
+    def get_transcription_cache(self, file: Union[str, FileSignature], model: str, language: Optional[str] = None,
                                settings_hash: str = "") -> Optional[Dict[str, Any]]:
         """Get cached transcription result."""
         try:
-            # Create cache key from file path, size, modification time, model, and settings
-            file_stat = os.stat(file_path)
-            cache_content = f"{file_path}_{file_stat.st_size}_{file_stat.st_mtime}_{model}_{language}_{settings_hash}"
-            cache_key = self._generate_cache_key(cache_content, "transcription")
-            cache_path = self._get_cache_path("transcriptions", cache_key)
+            cache_key = self._transcription_key(file, model, language, settings_hash)
             
-            if cache_path.exists():
-                with open(cache_path, 'rb') as f:
-                    result = pickle.load(f)
+            result = self._read_entry(cache_key)
+            if result is not None:
                 self.cache_hits += 1
                 return result
             else:
@@ -126,42 +324,137 @@ class CacheManager:
             self.cache_misses += 1
             return None
     
-    def set_transcription_cache(self, file_path: str, model: str, language: Optional[str] = None,
+    def set_transcription_cache(self, file: Union[str, FileSignature], model: str, language: Optional[str] = None,
                                settings_hash: str = "", result: Dict[str, Any] = None):
         """Cache transcription result."""
         try:
-            # Create cache key
-            file_stat = os.stat(file_path)
-            cache_content = f"{file_path}_{file_stat.st_size}_{file_stat.st_mtime}_{model}_{language}_{settings_hash}"
-            cache_key = self._generate_cache_key(cache_content, "transcription")
-            cache_path = self._get_cache_path("transcriptions", cache_key)
+            sig = self._signature(file)
+            cache_key = self._transcription_key(sig, model, language, settings_hash)
             
             # Save to cache
-            with open(cache_path, 'wb') as f:
-                pickle.dump(result, f)
+            self._write_entry("transcriptions", cache_key, result)
+            if self.content_keying:
+                self._touch_manifest(sig)
             
-            # Cleanup if needed
-            self._cleanup_cache()
+            # Cleanup only once the running total crosses the limit (or a resync is due)
+            if (self._current_bytes > self.max_cache_size or
+                    self._writes_since_resync >= self.RESYNC_INTERVAL):
+                self._cleanup_cache()
             
         except Exception:
             pass  # Ignore cache write errors
     
-    def get_audio_processing_cache(self, file_path: str, processing_settings: str) -> Optional[str]:
+    def claim_transcription(self, file: Union[str, FileSignature], model: str, language: Optional[str] = None,
+                            settings_hash: str = "") -> Optional[str]:
+        """
+        Try to become the only worker transcribing this input.
+        
+        Returns a claim token to pass to release_claim() (empty if locking is
+        unavailable), or None if another worker (thread or process sharing the
+        cache directory) already holds it.
+        """
+        try:
+            cache_key = self._transcription_key(file, model, language, settings_hash)
+            lock_dir = self.cache_dir / "locks"
+            lock_dir.mkdir(exist_ok=True)
+            lock_path = str(lock_dir / f"{cache_key}.lock")
+        except Exception:
+            return ""  # Cache unusable; proceed without coordination
+        
+        for _ in range(2):
+            try:
+                # O_EXCL makes creation the atomic test-and-set
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                try:
+                    if (time.time() - os.stat(lock_path).st_mtime < self.CLAIM_STALE_SECONDS
+                            and self._claim_holder_alive(lock_path)):
+                        return None
+                    os.unlink(lock_path)  # Holder died without releasing; take over
+                except FileNotFoundError:
+                    pass  # Released between the two calls; retry
+                continue
+            except OSError:
+                return ""
+            try:
+                os.write(fd, str(os.getpid()).encode())
+            finally:
+                os.close(fd)
+            return lock_path
+        return None
+    
+    @staticmethod
+    def _claim_holder_alive(lock_path: Union[str, Path]) -> bool:
+        """Whether the process recorded in a claim file is still running."""
+        try:
+            with open(lock_path) as f:
+                pid = int(f.read() or 0)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError):
+            return True  # Unreadable; leave it to the age check
+        if not pid:
+            return True  # Holder is between creating the file and writing its pid
+        if PSUTIL_AVAILABLE:
+            return psutil.pid_exists(pid)
+        if os.name == 'nt':
+            return True  # os.kill(pid, 0) would signal the process on Windows
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass  # Running under another user
+        return True
+    
+    def release_claim(self, claim: Optional[str]):
+        """Release a claim returned by claim_transcription()."""
+        if claim:
+            try:
+                os.unlink(claim)
+            except FileNotFoundError:
+                pass
+    
+    def wait_for_transcription(self, file: Union[str, FileSignature], model: str, language: Optional[str] = None,
+                               settings_hash: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Wait for the worker holding the claim to store its result.
+        
+        Returns None, so the caller transcribes itself, once the holder has released the
+        claim or died without a result, or after CLAIM_WAIT_SECONDS.
+        """
+        try:
+            cache_key = self._transcription_key(file, model, language, settings_hash)
+            lock_path = self.cache_dir / "locks" / f"{cache_key}.lock"
+            deadline = time.monotonic() + self.CLAIM_WAIT_SECONDS
+            while True:
+                # The claim is released only after the result is written, so check the lock first
+                claimed = self._claim_holder_alive(lock_path)
+                result = self._read_entry(cache_key)
+                if result is not None:
+                    self.cache_hits += 1
+                    return result
+                if not claimed or time.monotonic() >= deadline:
+                    break
+                time.sleep(self.CLAIM_POLL_INTERVAL)
+        except Exception:
+            pass
+        self.cache_misses += 1
+        return None
+    
+    def get_audio_processing_cache(self, file: Union[str, FileSignature], processing_settings: str) -> Optional[str]:
         """Get cached processed audio file path."""
         try:
-            file_stat = os.stat(file_path)
-            cache_content = f"{file_path}_{file_stat.st_size}_{file_stat.st_mtime}_{processing_settings}"
+            sig = self._signature(file)
+            cache_content = sig.key_bytes + f"_{processing_settings}".encode()
             cache_key = self._generate_cache_key(cache_content, "audio")
-            cache_path = self._get_cache_path("audio_processing", cache_key)
             
-            if cache_path.exists():
-                with open(cache_path, 'rb') as f:
-                    cached_audio_path = pickle.load(f)
-                
-                # Check if cached audio file still exists
-                if os.path.exists(cached_audio_path):
-                    self.cache_hits += 1
-                    return cached_audio_path
+            cached_audio_path = self._read_entry(cache_key)
+            
+            # Check if cached audio file still exists
+            if cached_audio_path is not None and os.path.exists(cached_audio_path):
+                self.cache_hits += 1
+                return cached_audio_path
             
             self.cache_misses += 1
             return None
@@ -170,50 +463,43 @@ class CacheManager:
             self.cache_misses += 1
             return None
     
-    def set_audio_processing_cache(self, file_path: str, processing_settings: str, processed_path: str):
+    def set_audio_processing_cache(self, file: Union[str, FileSignature], processing_settings: str,
+                                   processed_path: str):
         """Cache processed audio file path."""
         try:
-            file_stat = os.stat(file_path)
-            cache_content = f"{file_path}_{file_stat.st_size}_{file_stat.st_mtime}_{processing_settings}"
+            sig = self._signature(file)
+            cache_content = sig.key_bytes + f"_{processing_settings}".encode()
             cache_key = self._generate_cache_key(cache_content, "audio")
-            cache_path = self._get_cache_path("audio_processing", cache_key)
             
-            with open(cache_path, 'wb') as f:
-                pickle.dump(processed_path, f)
+            self._write_entry("audio_processing", cache_key, processed_path)
                 
         except Exception:
             pass
     
     def clear_cache(self, cache_type: Optional[str] = None):
-        """Clear cache files."""
+        """Clear cache entries."""
         try:
-            if cache_type:
-                cache_subdir = self.cache_dir / cache_type
-                if cache_subdir.exists():
-                    for cache_file in cache_subdir.glob("*.pkl"):
-                        cache_file.unlink()
-            else:
-                # Clear all cache
-                for cache_subdir in ["transcriptions", "audio_processing", "speaker_detection"]:
-                    subdir = self.cache_dir / cache_subdir
-                    if subdir.exists():
-                        for cache_file in subdir.glob("*.pkl"):
-                            cache_file.unlink()
+            with self._db_lock:
+                if cache_type:
+                    self._db.execute("DELETE FROM cache WHERE cache_type = ?", (cache_type,))
+                    if cache_type == "transcriptions":
+                        # The manifest only serves transcription keys
+                        self._db.execute("DELETE FROM manifest")
+                else:
+                    # Clear all cache
+                    self._db.execute("DELETE FROM cache")
+                    self._db.execute("DELETE FROM manifest")
+                self._current_bytes = self._total_size()
         except Exception:
             pass
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         try:
-            total_files = 0
-            total_size = 0
-            
-            for cache_subdir in ["transcriptions", "audio_processing", "speaker_detection"]:
-                subdir = self.cache_dir / cache_subdir
-                if subdir.exists():
-                    for cache_file in subdir.glob("*.pkl"):
-                        total_files += 1
-                        total_size += cache_file.stat().st_size
+            with self._db_lock:
+                total_files, total_size = self._db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+                ).fetchone()
             
             hit_rate = self.cache_hits / (self.cache_hits + self.cache_misses) if (self.cache_hits + self.cache_misses) > 0 else 0
             
@@ -239,9 +525,13 @@ class CacheManager:
 class MemoryOptimizer:
     """Optimizes memory usage during transcription processing."""
     
+    _primed = False  # gc.freeze() is process-wide, so prime at most once
+    
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.logger = logger or logging.getLogger(__name__)
         self.available = PSUTIL_AVAILABLE
+        # One handle for the life of the optimizer instead of a fresh Process per call
+        self._proc = psutil.Process() if self.available else None
     
     def get_memory_usage(self) -> Dict[str, float]:
         """Get current memory usage."""
@@ -249,8 +539,7 @@ class MemoryOptimizer:
             return {'available': False}
         
         try:
-            process = psutil.Process()
-            memory_info = process.memory_info()
+            memory_info = self._proc.memory_info()
             system_memory = psutil.virtual_memory()
             
             return {
@@ -274,19 +563,11 @@ class MemoryOptimizer:
             # Force garbage collection
             collected = gc.collect()
             
+            heap_trimmed = False
             if aggressive:
-                # More aggressive memory cleanup
-                import sys
-                import ctypes
-                
-                # Clear caches
-                if hasattr(sys, 'intern'):
-                    # Clear string intern cache
-                    sys.intern.__dict__.clear()
-                
-                # Force memory compaction (Python 3.8+)
-                if hasattr(gc, 'compact'):
-                    gc.compact()
+                # Hand freed allocator arenas back to the OS; gc.collect() alone
+                # frees objects but leaves RSS high after large numpy/audio buffers
+                heap_trimmed = self._trim_heap()
             
             memory_after = self.get_memory_usage()
             
@@ -297,6 +578,7 @@ class MemoryOptimizer:
             return {
                 'memory_freed_mb': memory_freed,
                 'objects_collected': collected,
+                'heap_trimmed': heap_trimmed,
                 'memory_before': memory_before,
                 'memory_after': memory_after,
                 'success': True
@@ -311,6 +593,46 @@ class MemoryOptimizer:
                 'error': str(e)
             }
     
+    def prime(self, raise_threshold: bool = False):
+        """
+        Tune the garbage collector once models and heavy dependencies are loaded.
+        
+        Everything alive at this point (model weights, imported modules) is moved to
+        the permanent generation so later collections stop rescanning it. Both changes
+        apply to the whole process, not just transcription.
+        
+        Args:
+            raise_threshold: Also raise the generation-0 threshold to cut collection frequency
+        """
+        if MemoryOptimizer._primed:
+            return
+        gc.collect()
+        gc.freeze()
+        if raise_threshold:
+            gc.set_threshold(50_000, 20, 20)
+        MemoryOptimizer._primed = True
+        self.logger.debug(f"GC primed: {gc.get_freeze_count()} objects frozen")
+    
+    def _trim_heap(self) -> bool:
+        """
+        Return free heap memory to the operating system.
+        
+        Uses glibc malloc_trim on Linux and trims the working set on Windows.
+        Multi-threaded runs fragment less when launched with MALLOC_ARENA_MAX=2
+        in the environment (glibc only; it must be set before the process starts).
+        """
+        try:
+            if sys.platform.startswith('linux'):
+                libc = ctypes.CDLL("libc.so.6", use_errno=True)
+                return bool(libc.malloc_trim(0))
+            if sys.platform == 'win32':
+                kernel32 = ctypes.windll.kernel32
+                return bool(kernel32.SetProcessWorkingSetSize(kernel32.GetCurrentProcess(),
+                                                              ctypes.c_size_t(-1), ctypes.c_size_t(-1)))
+        except (OSError, AttributeError) as e:
+            self.logger.debug(f"Heap trim unavailable: {e}")
+        return False
+    
     def check_memory_pressure(self, threshold_percent: float = 80.0) -> Dict[str, Any]:
         """Check if system is under memory pressure."""
         memory_info = self.get_memory_usage()
@@ -329,11 +651,23 @@ class MemoryOptimizer:
         }
 
 
+def _run_item(process_func: Callable, item: Any) -> Tuple[bool, Any]:
+    """Run process_func on one item, capturing failures so one bad item can't end a batch."""
+    try:
+        return True, process_func(item)
+    except Exception as e:
+        return False, str(e)
+
+
 class ParallelProcessor:
     """Handles parallel processing for batch operations."""
     
+    EXECUTOR_TYPES = ('auto', 'thread', 'process')
+    TASK_PROFILES = ('io', 'cpu', 'gpu', 'api')
+    
     def __init__(self, max_workers: Optional[int] = None, use_processes: bool = False,
-                 logger: Optional[logging.Logger] = None):
+                 logger: Optional[logging.Logger] = None, executor_type: Optional[str] = None,
+                 task_kind: Optional[str] = None, max_concurrent_api: int = 8):
         """
         Initialize parallel processor.
         
@@ -341,13 +675,72 @@ class ParallelProcessor:
             max_workers: Maximum number of worker threads/processes
             use_processes: Use processes instead of threads
             logger: Logger instance
+            executor_type: 'thread', 'process', or 'auto' to pick per task profile
+                (default: 'process' if use_processes else 'auto')
+            task_kind: Default task profile for batches ('io', 'cpu', 'gpu' or 'api');
+                also picks the default worker count
+            max_concurrent_api: Concurrent requests for 'api' tasks (remote Whisper calls)
         """
-        self.max_workers = max_workers or min(4, multiprocessing.cpu_count())
-        self.use_processes = use_processes
+        if executor_type is None:
+            executor_type = 'process' if use_processes else 'auto'
+        if executor_type not in self.EXECUTOR_TYPES:
+            raise ValueError(f"executor_type must be one of {self.EXECUTOR_TYPES}, got {executor_type!r}")
+        if task_kind is not None and task_kind not in self.TASK_PROFILES:
+            raise ValueError(f"task_kind must be one of {self.TASK_PROFILES}, got {task_kind!r}")
+        
+        self.task_kind = task_kind
+        self.max_concurrent_api = max_concurrent_api
+        self._explicit_workers = max_workers is not None
+        self.max_workers = max_workers or self._default_workers(task_kind)
+        self.executor_type = executor_type
+        self.use_processes = executor_type == 'process'
         self.logger = logger or logging.getLogger(__name__)
     
+    def _default_workers(self, task_profile: Optional[str]) -> int:
+        """Worker count to use when none was given explicitly."""
+        cpu_count = multiprocessing.cpu_count()
+        if task_profile == 'cpu':
+            return cpu_count
+        if task_profile == 'io':
+            # Threads blocked on disk or network cost almost nothing, so oversubscribe
+            return min(128, 32 * cpu_count)
+        if task_profile == 'api':
+            return self.max_concurrent_api  # Bounded by the remote service, not local cores
+        if task_profile == 'gpu':
+            return 1  # Serialize access to the single device
+        return min(4, cpu_count)
+    
+    def _select_executor(self, task_profile: Optional[str]) -> Tuple[type, Dict[str, Any]]:
+        """Choose the executor class and constructor arguments for a batch."""
+        if task_profile is not None and task_profile not in self.TASK_PROFILES:
+            raise ValueError(f"task_profile must be one of {self.TASK_PROFILES}, got {task_profile!r}")
+        task_profile = task_profile or self.task_kind
+        
+        use_processes = self.use_processes
+        if self.executor_type == 'auto' and task_profile:
+            # CPU-bound Python work is GIL-limited on threads; I/O, API and GPU work are not
+            use_processes = task_profile == 'cpu'
+        max_workers = self.max_workers
+        if not self._explicit_workers and task_profile:
+            max_workers = self._default_workers(task_profile)
+        
+        if not use_processes:
+            return ThreadPoolExecutor, {'max_workers': max_workers}
+        
+        # Oversubscribing processes only adds context switches and memory
+        kwargs = {'max_workers': min(max_workers, multiprocessing.cpu_count())}
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            # Avoids spawn's full interpreter start-up per worker
+            kwargs['mp_context'] = multiprocessing.get_context('forkserver')
+        return ProcessPoolExecutor, kwargs
+    
+    def _chunksize(self, item_count: int, max_workers: int) -> int:
+        """Items per worker dispatch: about four chunks per worker, capped at 64."""
+        return max(1, min(64, item_count // (max_workers * 4)))
+    
     def process_batch(self, items: List[Any], process_func: Callable,
-                     show_progress: bool = True) -> List[Dict[str, Any]]:
+                     show_progress: bool = True,
+                     task_profile: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Process items in parallel.
         
@@ -355,41 +748,42 @@ class ParallelProcessor:
             items: List of items to process
             process_func: Function to process each item
             show_progress: Whether to show progress
+            task_profile: Workload hint ('io', 'cpu', 'gpu' or 'api'); defaults
+                to the processor's task_kind
             
         Returns:
             List of processing results
         """
         results = []
+        executor_class, executor_kwargs = self._select_executor(task_profile)
         
         try:
-            executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
-            
-            with executor_class(max_workers=self.max_workers) as executor:
-                # Submit all tasks
-                future_to_item = {executor.submit(process_func, item): item for item in items}
+            with executor_class(**executor_kwargs) as executor:
+                # map() yields results in input order and, for process pools, ships
+                # items to workers in chunks rather than one future per item
+                chunksize = self._chunksize(len(items), executor_kwargs['max_workers'])
+                outcomes = executor.map(partial(_run_item, process_func), items, chunksize=chunksize)
                 
-                # Collect results
-                for i, future in enumerate(future_to_item):
-                    try:
-                        result = future.result(timeout=None)
-                        results.append(result)
-                        
-                        if show_progress:
-                            self.logger.info(f"Completed {i + 1}/{len(items)} items")
-                            
-                    except Exception as e:
-                        self.logger.error(f"Failed to process item {future_to_item[future]}: {e}")
+                for i, (item, (ok, value)) in enumerate(zip(items, outcomes)):
+                    if ok:
+                        results.append(value)
+                    else:
+                        self.logger.error(f"Failed to process item {item}: {value}")
                         results.append({
                             'success': False,
-                            'error': str(e),
-                            'item': future_to_item[future]
+                            'error': value,
+                            'item': item
                         })
+                    
+                    if show_progress:
+                        self.logger.info(f"Completed {i + 1}/{len(items)} items")
             
             return results
             
         except Exception as e:
             self.logger.error(f"Parallel processing failed: {e}")
-            # Fallback to sequential processing
+            # Fallback to sequential processing, discarding any partial results
+            results = []
             for item in items:
                 try:
                     result = process_func(item)
@@ -404,12 +798,51 @@ class ParallelProcessor:
             return results
 
 
+class _MemorySampler:
+    """Daemon thread that polls process RSS so peaks between snapshots are not missed."""
+    
+    def __init__(self, process: "psutil.Process", interval: float, history: int):
+        self.process = process
+        self.interval = interval
+        self.samples = deque(maxlen=history)  # Most recent RSS readings in bytes
+        self.peak = process.memory_info().rss
+        self.samples.append(self.peak)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, name="memory-sampler", daemon=True)
+        self._thread.start()
+    
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                rss = self.process.memory_info().rss
+            except Exception:
+                break
+            self.samples.append(rss)
+            if rss > self.peak:
+                self.peak = rss
+    
+    def stop(self) -> int:
+        """Stop sampling and return the peak RSS in bytes."""
+        self._stop.set()
+        self._thread.join(timeout=self.interval * 4)
+        return self.peak
+
+
 class PerformanceMonitor:
     """Monitors and reports performance metrics."""
     
+    SAMPLE_INTERVAL = 0.25  # Seconds between RSS samples
+    SAMPLE_HISTORY = 240  # Samples kept in the ring buffer (one minute)
+    
     def __init__(self, logger: Optional[logging.Logger] = None):
         self.logger = logger or logging.getLogger(__name__)
         self.available = PSUTIL_AVAILABLE
+        self._proc = None
+        if self.available:
+            # cpu_percent() measures since the previous call on the same handle, so the
+            # handle is shared and primed here; a fresh Process always reports 0.0
+            self._proc = psutil.Process()
+            self._proc.cpu_percent(interval=None)
     
     def start_monitoring(self) -> Dict[str, Any]:
         """Start performance monitoring."""
@@ -420,18 +853,25 @@ class PerformanceMonitor:
         
         if self.available:
             try:
-                process = psutil.Process()
+                process = self._proc
                 start_info.update({
                     'memory_start_mb': process.memory_info().rss / (1024 * 1024),
                     'cpu_count': psutil.cpu_count(),
                     'cpu_percent_start': process.cpu_percent()
                 })
+                start_info['sampler'] = _MemorySampler(process, self.SAMPLE_INTERVAL, self.SAMPLE_HISTORY)
             except Exception as e:
                 self.logger.warning(f"Could not start performance monitoring: {e}")
                 start_info['available'] = False
         
         return start_info
     
+    def stop_monitoring(self, start_info: Optional[Dict[str, Any]]):
+        """Stop the background sampler without computing stats; safe to call more than once."""
+        sampler = start_info.get('sampler') if start_info else None
+        if sampler is not None:
+            sampler.stop()
+    
     def end_monitoring(self, start_info: Dict[str, Any], audio_duration: float = 0) -> ProcessingStats:
         """End performance monitoring and calculate stats."""
         end_time = time.time()
@@ -450,12 +890,15 @@ class PerformanceMonitor:
         
         if start_info.get('available') and self.available:
             try:
-                process = psutil.Process()
+                process = self._proc
                 memory_end = process.memory_info().rss / (1024 * 1024)
                 cpu_percent = process.cpu_percent()
                 
                 stats.memory_end = memory_end
                 stats.memory_peak = max(stats.memory_start, memory_end)
+                sampler = start_info.get('sampler')
+                if sampler is not None:
+                    stats.memory_peak = max(stats.memory_peak, sampler.stop() / (1024 * 1024))
                 stats.cpu_usage = cpu_percent
                 
             except Exception as e:
@@ -3,13 +3,25 @@ Speaker Detection and Diarization module for Phase 3A enhancements.
 Provides speaker identification and separation using pyannote.audio.
 """
 
+import bisect
+import contextlib
+import hashlib
+import json
+import mmap
 import os
 import tempfile
+import threading
 import warnings
-from typing import Dict, List, Tuple, Optional, Any
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import metadata
+from typing import Dict, List, Tuple, Optional, Any, Union
 from pathlib import Path
 
+import numpy as np
+
 try:
+    import torch
     from pyannote.audio import Pipeline
     from pyannote.core import Annotation, Segment
     PYANNOTE_AVAILABLE = True
@@ -19,18 +31,255 @@ except ImportError:
     Annotation = None
     Segment = None
 
+try:
+    import torchaudio
+    TORCHAUDIO_AVAILABLE = True
+except ImportError:
+    TORCHAUDIO_AVAILABLE = False
+
+try:
+    from intervaltree import IntervalTree
+    INTERVALTREE_AVAILABLE = True
+except ImportError:
+    INTERVALTREE_AVAILABLE = False
+    IntervalTree = None
+
+try:
+    import onnxruntime
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+try:
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+# Serializes pipeline loads so concurrent callers don't each load the same model
+_PIPELINE_LOCK = threading.Lock()
+
+DEFAULT_DIARIZATION_CACHE_DIR = Path.home() / ".transcription" / "diarization_cache"
+ONNX_MODEL_DIR = Path.home() / ".transcription" / "onnx_models"
+
+
+class _SkipSilentEmbedding:
+    """
+    Wraps pyannote's speaker embedding model to skip batch items whose mask is all zero.
+    
+    Most (chunk, speaker) slots are inactive speakers with empty masks; pyannote
+    still runs them through the embedding network and then discards the result
+    as NaN. Only active items are embedded here; inactive rows are NaN as before.
+    """
+    
+    def __init__(self, embedding):
+        self._wrapped = embedding
+    
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+    
+    def __call__(self, waveforms, masks=None):
+        if masks is None:
+            return self._wrapped(waveforms)
+        active = masks.reshape(masks.shape[0], -1).sum(dim=1) > 0
+        if bool(active.all()):
+            return self._wrapped(waveforms, masks=masks)
+        
+        embeddings = np.full((masks.shape[0], self._wrapped.dimension), np.nan, dtype=np.float32)
+        if bool(active.any()):
+            index = active.cpu().numpy()
+            embeddings[index] = self._wrapped(waveforms[active], masks=masks[active])
+        return embeddings
+
+
+class _OnnxSegmentation:
+    """
+    Runs pyannote's segmentation model through an ONNX Runtime session.
+    
+    Everything except the forward pass (specifications, receptive field, .to())
+    is still answered by the wrapped PyTorch model.
+    """
+    
+    def __init__(self, model, session):
+        self._wrapped = model
+        self._session = session
+        self._input_name = session.get_inputs()[0].name
+    
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+    
+    def __call__(self, waveforms):
+        scores = self._session.run(None, {self._input_name: waveforms.detach().cpu().float().numpy()})[0]
+        return torch.from_numpy(scores).to(waveforms.device)
+
+
+def _onnx_segmentation(model, model_name: str, device: str):
+    """Export the segmentation model once to ONNX and wrap it in an inference session."""
+    version = metadata.version('pyannote.audio')
+    onnx_path = ONNX_MODEL_DIR / f"{model_name.replace('/', '_')}-segmentation-{version}.onnx"
+    if not onnx_path.exists():
+        onnx_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = onnx_path.with_suffix('.tmp')
+        model.eval()
+        dummy = model.example_input_array.to(next(model.parameters()).device)
+        torch.onnx.export(model, dummy, str(tmp_path), opset_version=17,
+                          input_names=['waveform'], output_names=['scores'],
+                          dynamic_axes={'waveform': {0: 'batch'}, 'scores': {0: 'batch'}})
+        os.replace(tmp_path, onnx_path)
+    
+    preferred = ['TensorrtExecutionProvider', 'CUDAExecutionProvider'] if device == 'cuda' else []
+    available = onnxruntime.get_available_providers()
+    providers = [p for p in preferred if p in available] + ['CPUExecutionProvider']
+    return _OnnxSegmentation(model, onnxruntime.InferenceSession(str(onnx_path), providers=providers))
+
+
+def _quantize_int8(model):
+    """Dynamically quantize a model's Linear/LSTM layers to int8 for CPU inference."""
+    model.eval()
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8)
+
+
+@lru_cache(maxsize=2)
+def _load_pipeline(model_name: str, hf_token: Optional[str], device: str, quantize: bool = False,
+                   onnx: bool = False):
+    """Load a diarization pipeline onto device; cached so every detector in the process shares it."""
+    print(f"Loading speaker diarization model: {model_name} on {device}")
+    pipeline = Pipeline.from_pretrained(model_name, use_auth_token=hf_token)
+    # The embedding model dominates diarization time and is far faster on a GPU
+    pipeline.to(torch.device(device))
+    segmentation = getattr(pipeline, '_segmentation', None)
+    if onnx and ONNXRUNTIME_AVAILABLE and isinstance(getattr(segmentation, 'model', None), torch.nn.Module):
+        try:
+            segmentation.model = _onnx_segmentation(segmentation.model, model_name, device)
+        except Exception as e:
+            warnings.warn(f"ONNX export of the segmentation model failed, using PyTorch: {e}")
+    # Dynamic quantization only has CPU kernels
+    if quantize and device == 'cpu':
+        embedding = getattr(pipeline, '_embedding', None)
+        if isinstance(getattr(embedding, 'model_', None), torch.nn.Module):
+            embedding.model_ = _quantize_int8(embedding.model_)
+        if isinstance(getattr(segmentation, 'model', None), torch.nn.Module):
+            segmentation.model = _quantize_int8(segmentation.model)
+    if hasattr(pipeline, '_embedding'):
+        pipeline._embedding = _SkipSilentEmbedding(pipeline._embedding)
+    return pipeline
+
+
+def _auto_batch_size(total_memory: int) -> int:
+    """Segmentation/embedding batch size for a GPU with total_memory bytes of VRAM."""
+    gib = total_memory / (1024 ** 3)
+    if gib >= 16:
+        return 128
+    if gib >= 6:
+        return 32  # pyannote 3.1 default
+    return 4
+
+
+@dataclass
+class _SpeakerArrays:
+    """Struct-of-arrays view over diarization turns."""
+    starts: Any
+    ends: Any
+    durations: Any
+    labels: Any  # object array of speaker labels
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+def _speaker_arrays(starts: List[float], ends: List[float], labels: List[str]) -> _SpeakerArrays:
+    """Pack parallel start/end/label columns into a _SpeakerArrays."""
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    return _SpeakerArrays(starts=starts, ends=ends, durations=ends - starts,
+                          labels=np.array(labels, dtype=object))
+
+
+def _best_overlaps(t_start, t_end, s_start, s_end, s_index, max_duration):
+    """
+    Best-overlapping speaker turn per transcription segment.
+    
+    s_start must be sorted ascending, with s_index holding each turn's original
+    position. Returns (original index or -1, overlap) arrays.
+    """
+    best = np.full(len(t_start), -1, dtype=np.int64)
+    best_overlap = np.zeros(len(t_start), dtype=np.float64)
+    for i in prange(len(t_start)):
+        # No turn starting before t_start - max_duration can still be open at t_start
+        j = np.searchsorted(s_start, t_start[i] - max_duration)
+        while j < len(s_start) and s_start[j] < t_end[i]:
+            overlap = min(t_end[i], s_end[j]) - max(t_start[i], s_start[j])
+            # Ties go to the earliest turn in the original order, as in the other strategies
+            if overlap > best_overlap[i] or (overlap > 0 and overlap == best_overlap[i] and s_index[j] < best[i]):
+                best_overlap[i] = overlap
+                best[i] = s_index[j]
+            j += 1
+    return best, best_overlap
+
+
+if NUMBA_AVAILABLE:
+    _best_overlaps = njit(parallel=True, cache=True)(_best_overlaps)
+
+
+def _get_pipeline(model_name: str, hf_token: Optional[str], device: str, quantize: bool = False,
+                  onnx: bool = False):
+    """Return the shared pipeline for this model/device/backend combination, loading it on first use."""
+    with _PIPELINE_LOCK:
+        return _load_pipeline(model_name, hf_token, device, quantize, onnx)
+
+
+def _audio_digest(audio_path: str) -> str:
+    """Content hash of an audio file, used to key cached diarization results."""
+    # Multi-GB recordings make this hash a real cost; BLAKE3 runs several times faster than SHA-256
+    with open(audio_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return (blake3() if BLAKE3_AVAILABLE else hashlib.sha256()).hexdigest()
+        # Hash the page-cache mapping in place; BLAKE3 can then split it across all cores
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if BLAKE3_AVAILABLE:
+                return blake3(mapped, max_threads=blake3.AUTO).hexdigest()
+            return hashlib.sha256(mapped).hexdigest()
+
 
 class SpeakerDetector:
     """Handles speaker detection and diarization using pyannote.audio."""
     
-    def __init__(self, enable_huggingface_token: bool = False):
+    MODEL_NAME = "pyannote/speaker-diarization-3.1"
+    BROADCAST_MAX_CELLS = 4_000_000  # Largest transcript x speaker overlap matrix built at once
+    MIN_SPEAKER_SEGMENT = 0.2  # Seconds; shorter diarization turns are dropped before merging
+    MAX_JOIN_GAP = 0.1  # Seconds; same-speaker turns closer than this are joined
+    
+    def __init__(self, enable_huggingface_token: bool = False,
+                 segmentation_batch_size: Optional[int] = None,
+                 embedding_batch_size: Optional[int] = None,
+                 quantize: bool = False,
+                 onnx: bool = False):
         """
         Initialize speaker detector.
         
         Args:
             enable_huggingface_token: Whether to use HuggingFace token for better models
+            segmentation_batch_size: Chunks per segmentation forward pass (default: sized from GPU memory)
+            embedding_batch_size: Chunks per embedding forward pass (default: sized from GPU memory)
+            quantize: Run the models with int8 dynamic quantization when diarizing on CPU
+            onnx: Run the segmentation model through ONNX Runtime when it is installed
         """
         self.pipeline = None
+        self.device = None
+        # SoA view of the last detection's turns, reused when its AoS list comes back for merging
+        self._speaker_segments = None
+        self._speaker_arrays = None
+        self.segmentation_batch_size = segmentation_batch_size
+        self.embedding_batch_size = embedding_batch_size
+        self.quantize = quantize
+        self.onnx = onnx
         self.enabled = PYANNOTE_AVAILABLE
         self.huggingface_token = enable_huggingface_token
         
@@ -52,7 +301,7 @@ class SpeakerDetector:
         
         try:
             # Use the latest speaker diarization pipeline
-            model_name = "pyannote/speaker-diarization-3.1"
+            model_name = self.MODEL_NAME
             
             # Check for HuggingFace token
             hf_token = None
@@ -61,11 +310,9 @@ class SpeakerDetector:
                 if not hf_token:
                     print("⚠️  No HUGGINGFACE_TOKEN found. Using public model (may have limitations)")
             
-            print(f"Loading speaker diarization model: {model_name}")
-            self.pipeline = Pipeline.from_pretrained(
-                model_name,
-                use_auth_token=hf_token
-            )
+            # Loading takes seconds and a full copy of the models; reuse across instances
+            self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+            self.pipeline = _get_pipeline(model_name, hf_token, self.device, self.quantize, self.onnx)
             
             return True, f"Speaker diarization pipeline loaded successfully"
             
@@ -75,13 +322,16 @@ class SpeakerDetector:
                 error_msg += "\n💡 Tip: Set HUGGINGFACE_TOKEN environment variable for better models"
             return False, error_msg
     
-    def detect_speakers(self, audio_path: str, num_speakers: Optional[int] = None) -> Dict[str, Any]:
+    def detect_speakers(self, audio_path: str, num_speakers: Optional[int] = None,
+                        cache: Union[str, Path, None] = None) -> Dict[str, Any]:
         """
         Perform speaker diarization on audio file.
         
         Args:
             audio_path: Path to audio file
             num_speakers: Optional hint for number of speakers
+            cache: Directory for cached results ("default" for ~/.transcription/diarization_cache,
+                None to always re-run the pipeline); entries are never pruned, so callers opt in
             
         Returns:
             Dictionary with speaker detection results
@@ -94,6 +344,13 @@ class SpeakerDetector:
                 'speaker_segments': []
             }
         
+        # Diarization is deterministic for the same audio, model and speaker hint
+        cache_path = self._diarization_cache_path(audio_path, num_speakers, cache)
+        cached = self._read_diarization_cache(cache_path)
+        if cached is not None:
+            print(f"🎭 Using cached speaker detection for: {Path(audio_path).name}")
+            return self._build_detection_result(*cached)
+        
         if self.pipeline is None:
             success, message = self.load_pipeline()
             if not success:
@@ -112,48 +369,18 @@ class SpeakerDetector:
             if num_speakers:
                 diarization_kwargs['num_speakers'] = num_speakers
             
-            diarization = self.pipeline(audio_path, **diarization_kwargs)
+            self._apply_batch_sizes()
+            audio = self._load_audio(audio_path)
+            # No autograd bookkeeping; on GPU the segmentation/embedding nets run in FP16
+            with torch.inference_mode(), self._autocast():
+                diarization = self.pipeline(audio, **diarization_kwargs)
             
             # Process results
             speakers = list(diarization.labels())
-            speaker_segments = []
-            
-            for segment, _, speaker in diarization.itertracks(yield_label=True):
-                speaker_segments.append({
-                    'start': float(segment.start),
-                    'end': float(segment.end),
-                    'speaker': speaker,
-                    'duration': float(segment.end - segment.start)
-                })
-            
-            # Calculate speaker statistics
-            speaker_stats = {}
-            for segment in speaker_segments:
-                speaker = segment['speaker']
-                if speaker not in speaker_stats:
-                    speaker_stats[speaker] = {
-                        'total_duration': 0.0,
-                        'segment_count': 0
-                    }
-                speaker_stats[speaker]['total_duration'] += segment['duration']
-                speaker_stats[speaker]['segment_count'] += 1
-            
-            # Sort speakers by total speaking time
-            sorted_speakers = sorted(
-                speaker_stats.items(),
-                key=lambda x: x[1]['total_duration'],
-                reverse=True
-            )
-            
-            return {
-                'success': True,
-                'speakers': speakers,
-                'speaker_count': len(speakers),
-                'speaker_segments': speaker_segments,
-                'speaker_stats': dict(speaker_stats),
-                'sorted_speakers': sorted_speakers,
-                'total_segments': len(speaker_segments)
-            }
+            tracks = [(float(segment.start), float(segment.end), speaker)
+                      for segment, _, speaker in diarization.itertracks(yield_label=True)]
+            self._write_diarization_cache(cache_path, speakers, tracks)
+            return self._build_detection_result(speakers, tracks)
             
         except Exception as e:
             return {
@@ -163,6 +390,125 @@ class SpeakerDetector:
                 'speaker_segments': []
             }
     
+    def _build_detection_result(self, speakers: List[str], tracks: List[Tuple[float, float, str]]) -> Dict[str, Any]:
+        """Assemble the detect_speakers result from (start, end, speaker) tracks."""
+        starts, ends, labels = (list(column) for column in zip(*tracks)) if tracks else ([], [], [])
+        arrays = _speaker_arrays(starts, ends, labels)
+        
+        speaker_segments = [
+            {'start': start, 'end': end, 'speaker': speaker, 'duration': duration}
+            for start, end, speaker, duration in zip(starts, ends, labels, arrays.durations.tolist())
+        ]
+        self._speaker_segments = speaker_segments
+        self._speaker_arrays = arrays
+        
+        # Calculate speaker statistics in one grouped reduction over the label column
+        uniq, first, inverse = np.unique(arrays.labels, return_index=True, return_inverse=True)
+        totals = np.bincount(inverse, weights=arrays.durations, minlength=len(uniq))
+        counts = np.bincount(inverse, minlength=len(uniq))
+        # np.unique sorts labels; keep the first-appearance order callers have always seen
+        appearance = np.argsort(first, kind='stable')
+        speaker_stats = {
+            uniq[i]: {'total_duration': float(totals[i]), 'segment_count': int(counts[i])}
+            for i in appearance
+        }
+        
+        # Sort speakers by total speaking time; stable, so ties keep first-appearance order
+        by_duration = appearance[np.argsort(-totals[appearance], kind='stable')]
+        sorted_speakers = [(uniq[i], speaker_stats[uniq[i]]) for i in by_duration]
+        
+        return {
+            'success': True,
+            'speakers': speakers,
+            'speaker_count': len(speakers),
+            'speaker_segments': speaker_segments,
+            'speaker_stats': dict(speaker_stats),
+            'sorted_speakers': sorted_speakers,
+            'total_segments': len(speaker_segments)
+        }
+    
+    def _diarization_cache_path(self, audio_path: str, num_speakers: Optional[int],
+                                cache: Union[str, Path, None]) -> Optional[Path]:
+        """Cache file for this audio/model/speaker-hint combination, or None when caching is off."""
+        if cache is None:
+            return None
+        cache_dir = DEFAULT_DIARIZATION_CACHE_DIR if cache == "default" else Path(cache)
+        try:
+            digest = _audio_digest(audio_path)
+            pipeline_version = metadata.version('pyannote.audio')
+        except (OSError, metadata.PackageNotFoundError):
+            return None
+        # Results differ slightly between devices (FP16 autocast on CUDA) and inference runtimes
+        device = self.device or ('cuda' if torch.cuda.is_available() else 'cpu')
+        model = self.MODEL_NAME.replace('/', '_') + f"-{device}"
+        if self.quantize and device == 'cpu':
+            model += '-int8'
+        if self.onnx and ONNXRUNTIME_AVAILABLE:
+            model += '-onnx'
+        return cache_dir / f"{digest}-{model}-{pipeline_version}-{num_speakers or 'auto'}.json"
+    
+    @staticmethod
+    def _read_diarization_cache(cache_path: Optional[Path]) -> Optional[Tuple[List[str], List[Tuple[float, float, str]]]]:
+        """(speakers, tracks) from a cache file, or None on a miss or unreadable entry."""
+        if cache_path is None:
+            return None
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data['speakers'], [tuple(track) for track in data['tracks']]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    @staticmethod
+    def _write_diarization_cache(cache_path: Optional[Path], speakers: List[str],
+                                 tracks: List[Tuple[float, float, str]]):
+        """Write a cache entry atomically so concurrent readers never see a partial file."""
+        if cache_path is None:
+            return
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=cache_path.parent,
+                                             suffix='.tmp', delete=False) as f:
+                json.dump({'speakers': speakers, 'tracks': tracks}, f)
+            os.replace(f.name, cache_path)
+        except OSError:
+            pass
+    
+    def _apply_batch_sizes(self):
+        """Set this detector's batch sizes on the (shared) pipeline before a run."""
+        auto = None
+        if self.device == 'cuda' and (self.segmentation_batch_size is None or self.embedding_batch_size is None):
+            # Larger batches amortize kernel launches across more chunks when VRAM allows
+            auto = _auto_batch_size(torch.cuda.get_device_properties(0).total_memory)
+        
+        segmentation = self.segmentation_batch_size or auto
+        embedding = self.embedding_batch_size or auto
+        if segmentation and hasattr(self.pipeline, 'segmentation_batch_size'):
+            self.pipeline.segmentation_batch_size = segmentation
+        if embedding and hasattr(self.pipeline, 'embedding_batch_size'):
+            self.pipeline.embedding_batch_size = embedding
+    
+    def _autocast(self):
+        """FP16 autocast context on CUDA; CPU inference stays in FP32."""
+        if self.device == 'cuda':
+            return torch.autocast(device_type='cuda', dtype=torch.float16)
+        return contextlib.nullcontext()
+    
+    def _load_audio(self, audio_path: str):
+        """
+        Decode audio once into an in-memory waveform for the pipeline.
+        
+        Falls back to the path (pyannote decodes it itself) when torchaudio is
+        unavailable or cannot read the file.
+        """
+        if not TORCHAUDIO_AVAILABLE:
+            return audio_path
+        try:
+            waveform, sample_rate = torchaudio.load(audio_path)
+        except Exception:
+            return audio_path
+        return {'waveform': waveform, 'sample_rate': sample_rate}
+    
     def merge_with_transcription(self, transcription_segments: List[Dict], 
                                speaker_segments: List[Dict]) -> List[Dict]:
         """
@@ -178,38 +524,156 @@ class SpeakerDetector:
         if not speaker_segments:
             return transcription_segments
         
+        if speaker_segments is self._speaker_segments:
+            arrays = self._speaker_arrays
+        else:
+            arrays = _speaker_arrays([seg['start'] for seg in speaker_segments],
+                                     [seg['end'] for seg in speaker_segments],
+                                     [seg['speaker'] for seg in speaker_segments])
+        arrays = self._compact_speaker_segments(arrays)
+        
+        # Small inputs take one broadcast over the full overlap matrix; large ones use the
+        # compiled kernel or the interval tree so cost grows with actual overlaps instead of N*M
+        cells = len(transcription_segments) * len(arrays)
+        if cells <= self.BROADCAST_MAX_CELLS:
+            best_matches = self._best_speakers_broadcast(transcription_segments, arrays)
+        elif NUMBA_AVAILABLE:
+            best_matches = self._best_speakers_compiled(transcription_segments, arrays)
+        elif INTERVALTREE_AVAILABLE:
+            best_matches = self._best_speakers_tree(transcription_segments, arrays)
+        else:
+            best_matches = self._best_speakers_bisect(transcription_segments, arrays)
+        
+        labels = arrays.labels
         merged_segments = []
         
-        for trans_seg in transcription_segments:
+        for trans_seg, (best_index, best_overlap) in zip(transcription_segments, best_matches):
             trans_start = trans_seg.get('start', 0)
             trans_end = trans_seg.get('end', trans_start)
-            trans_mid = (trans_start + trans_end) / 2
-            
-            # Find the speaker segment that overlaps most with this transcription segment
-            best_speaker = "UNKNOWN"
-            best_overlap = 0
-            
-            for speaker_seg in speaker_segments:
-                spk_start = speaker_seg['start']
-                spk_end = speaker_seg['end']
-                
-                # Calculate overlap
-                overlap_start = max(trans_start, spk_start)
-                overlap_end = min(trans_end, spk_end)
-                overlap = max(0, overlap_end - overlap_start)
-                
-                if overlap > best_overlap:
-                    best_overlap = overlap
-                    best_speaker = speaker_seg['speaker']
             
             # Add speaker information to transcription segment
             merged_segment = trans_seg.copy()
-            merged_segment['speaker'] = best_speaker
+            merged_segment['speaker'] = labels[best_index] if best_index >= 0 else "UNKNOWN"
             merged_segment['speaker_confidence'] = best_overlap / (trans_end - trans_start) if trans_end > trans_start else 0
             merged_segments.append(merged_segment)
         
         return merged_segments
     
+    def _compact_speaker_segments(self, arrays: _SpeakerArrays) -> _SpeakerArrays:
+        """Join near-adjacent turns of the same speaker, then drop sub-200ms blips."""
+        starts, ends, labels = [], [], []
+        for start, end, speaker in zip(arrays.starts.tolist(), arrays.ends.tolist(), arrays.labels.tolist()):
+            if labels and labels[-1] == speaker and 0 <= start - ends[-1] < self.MAX_JOIN_GAP:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+                labels.append(speaker)
+        
+        joined = _speaker_arrays(starts, ends, labels)
+        keep = joined.durations >= self.MIN_SPEAKER_SEGMENT
+        # If everything is a blip, fall back rather than lose all speaker labels
+        if not keep.any() or keep.all():
+            return joined
+        return _SpeakerArrays(starts=joined.starts[keep], ends=joined.ends[keep],
+                              durations=joined.durations[keep], labels=joined.labels[keep])
+    
+    def _best_speakers_broadcast(self, transcription_segments: List[Dict],
+                                 arrays: _SpeakerArrays) -> List[Tuple[int, float]]:
+        """(speaker index or -1, overlap) per transcription segment via numpy broadcasting."""
+        spk_start = arrays.starts
+        spk_end = arrays.ends
+        
+        matches = []
+        # Rows per batch keep each overlap matrix within BROADCAST_MAX_CELLS
+        batch = max(1, self.BROADCAST_MAX_CELLS // len(arrays))
+        for offset in range(0, len(transcription_segments), batch):
+            rows = transcription_segments[offset:offset + batch]
+            t_start = np.fromiter((seg.get('start', 0) for seg in rows), dtype=np.float64, count=len(rows))
+            t_end = np.fromiter((seg.get('end', seg.get('start', 0)) for seg in rows), dtype=np.float64,
+                                count=len(rows))
+            
+            overlap = np.minimum(t_end[:, None], spk_end[None, :])
+            overlap -= np.maximum(t_start[:, None], spk_start[None, :])
+            # argmax returns the first maximum, so ties go to the earliest speaker segment
+            best = overlap.argmax(axis=1)
+            best_overlap = overlap[np.arange(len(rows)), best]
+            found = best_overlap > 0
+            matches.extend(zip(np.where(found, best, -1).tolist(),
+                               np.where(found, best_overlap, 0).tolist()))
+        return matches
+    
+    def _best_speakers_compiled(self, transcription_segments: List[Dict],
+                                arrays: _SpeakerArrays) -> List[Tuple[int, float]]:
+        """(speaker index or -1, overlap) per transcription segment via the numba kernel."""
+        count = len(transcription_segments)
+        t_start = np.fromiter((seg.get('start', 0) for seg in transcription_segments), dtype=np.float64, count=count)
+        t_end = np.fromiter((seg.get('end', seg.get('start', 0)) for seg in transcription_segments),
+                            dtype=np.float64, count=count)
+        
+        order = np.argsort(arrays.starts, kind='stable')
+        # A little slack so rounding in t_start - max_duration can't skip a candidate turn
+        max_duration = max(float(arrays.durations.max()), 0.0) + 1e-6
+        best, best_overlap = _best_overlaps(t_start, t_end, arrays.starts[order], arrays.ends[order],
+                                            order.astype(np.int64), max_duration)
+        return list(zip(best.tolist(), best_overlap.tolist()))
+    
+    def _best_speakers_bisect(self, transcription_segments: List[Dict],
+                              arrays: _SpeakerArrays) -> List[Tuple[int, float]]:
+        """(speaker index or -1, overlap) per transcription segment via binary search over sorted starts."""
+        order = np.argsort(arrays.starts, kind='stable')
+        starts = arrays.starts[order].tolist()
+        ends = arrays.ends[order].tolist()
+        indices = order.tolist()
+        # No turn starting more than the longest turn before a segment can still be open at its start
+        max_duration = max(float(arrays.durations.max()), 0.0) + 1e-6
+        
+        matches = []
+        for trans_seg in transcription_segments:
+            trans_start = trans_seg.get('start', 0)
+            trans_end = trans_seg.get('end', trans_start)
+            
+            best_index = -1
+            best_overlap = 0
+            j = bisect.bisect_left(starts, trans_start - max_duration)
+            while j < len(starts) and starts[j] < trans_end:
+                overlap = min(trans_end, ends[j]) - max(trans_start, starts[j])
+                # Ties go to the earliest speaker segment in the original order
+                if overlap > best_overlap or (overlap > 0 and overlap == best_overlap and indices[j] < best_index):
+                    best_overlap = overlap
+                    best_index = indices[j]
+                j += 1
+            matches.append((best_index, best_overlap))
+        return matches
+    
+    def _best_speakers_tree(self, transcription_segments: List[Dict],
+                            arrays: _SpeakerArrays) -> List[Tuple[int, float]]:
+        """(speaker index or -1, overlap) per transcription segment via an interval tree."""
+        # Zero-length segments can never win an overlap and the tree rejects them
+        speaker_tree = IntervalTree.from_tuples(
+            (start, end, i)
+            for i, (start, end) in enumerate(zip(arrays.starts.tolist(), arrays.ends.tolist())) if end > start
+        )
+        
+        matches = []
+        for trans_seg in transcription_segments:
+            trans_start = trans_seg.get('start', 0)
+            trans_end = trans_seg.get('end', trans_start)
+            
+            # Find the speaker segment that overlaps most with this transcription segment
+            best_index = -1
+            best_overlap = 0
+            
+            # Candidates are visited in list order, so ties go to the earliest speaker segment
+            for index, spk_start, spk_end in sorted((iv.data, iv.begin, iv.end)
+                                                    for iv in speaker_tree.overlap(trans_start, trans_end)):
+                overlap = min(trans_end, spk_end) - max(trans_start, spk_start)
+                if overlap > best_overlap:
+                    best_overlap = overlap
+                    best_index = index
+            matches.append((best_index, best_overlap))
+        return matches
+    
     def format_speaker_output(self, segments: List[Dict], include_confidence: bool = False) -> str:
         """
         Format speaker-aware transcription for display.
@@ -224,32 +688,22 @@ class SpeakerDetector:
         if not segments:
             return "No segments available for speaker formatting."
         
-        formatted_lines = []
-        current_speaker = None
+        # Read each field once up front; segments without text are skipped entirely
+        kept = [(segment, text) for segment in segments if (text := segment.get('text', '').strip())]
+        speakers = [segment.get('speaker', 'UNKNOWN') for segment, _ in kept]
+        previous = [None, *speakers[:-1]]
         
-        for segment in segments:
-            speaker = segment.get('speaker', 'UNKNOWN')
-            text = segment.get('text', '').strip()
-            start_time = segment.get('start', 0)
-            
-            if not text:
-                continue
-            
+        formatted_lines = []
+        for (segment, text), speaker, previous_speaker in zip(kept, speakers, previous):
             # Add speaker label if changed
-            if speaker != current_speaker:
-                current_speaker = speaker
+            if speaker != previous_speaker:
                 speaker_label = f"\n[{speaker}]"
                 if include_confidence:
-                    confidence = segment.get('speaker_confidence', 0)
-                    speaker_label += f" (confidence: {confidence:.1%})"
+                    speaker_label += f" (confidence: {segment.get('speaker_confidence', 0):.1%})"
                 formatted_lines.append(speaker_label)
             
-            # Format timestamp
-            minutes = int(start_time // 60)
-            seconds = int(start_time % 60)
-            timestamp = f"[{minutes:02d}:{seconds:02d}]"
-            
-            formatted_lines.append(f"{timestamp} {text}")
+            minutes, seconds = divmod(segment.get('start', 0), 60)
+            formatted_lines.append(f"[{int(minutes):02d}:{int(seconds):02d}] {text}")
         
         return '\n'.join(formatted_lines)
     
@@ -268,19 +722,17 @@ class SpeakerDetector:
         
         lines = ["Speaker Summary:", "=" * 50]
         
-        # Sort by speaking time
-        sorted_speakers = sorted(
-            speaker_stats.items(),
-            key=lambda x: x[1]['total_duration'],
-            reverse=True
-        )
+        # Sort by speaking time; stable, so ties keep the stats' own order
+        speakers = list(speaker_stats)
+        durations = np.fromiter((stats['total_duration'] for stats in speaker_stats.values()),
+                                dtype=np.float64, count=len(speakers))
         
-        for i, (speaker, stats) in enumerate(sorted_speakers, 1):
-            duration = stats['total_duration']
-            segments = stats['segment_count']
+        for i, index in enumerate(np.argsort(-durations, kind='stable'), 1):
+            speaker = speakers[index]
+            stats = speaker_stats[speaker]
             
             lines.append(
-                f"{i}. {speaker}: {duration:.1f}s ({segments} segments)"
+                f"{i}. {speaker}: {stats['total_duration']:.1f}s ({stats['segment_count']} segments)"
             )
         
         return '\n'.join(lines)
@@ -5,9 +5,13 @@ Provides tools for transcribing audio/video files, searching history,
 and analyzing transcripts using AI.
 """
 
+import io
 import os
 import sys
+import asyncio
 import logging
+import tempfile
+from contextlib import redirect_stdout
 from typing import Optional
 from pathlib import Path
 
@@ -17,6 +21,10 @@ sys.path.insert(0, str(project_root))
 
 from mcp.server.fastmcp import FastMCP
 
+# The core service imports its siblings (config, poc, ...) as top-level packages.
+# Appended, and only after the SDK import, so src/mcp never shadows the `mcp` package
+sys.path.append(str(project_root / "src"))
+
 # Initialize the MCP server
 mcp = FastMCP(
     name="transcription-service",
@@ -28,6 +36,192 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# Shared transcription worker
+# ============================================================================
+
+# One TranscriptionService (and the models it loads) serves every tool call. Requests are
+# queued and drained in small batches, grouped so runs with the same model and
+# language follow each other, and executed off the event loop.
+_TRANSCRIBE_BATCH_WINDOW = 0.1  # Seconds to wait for more requests to join a batch
+_TRANSCRIBE_BATCH_MAX = 8
+
+_transcription_service = None
+_transcribe_queue: Optional[asyncio.Queue] = None
+_transcribe_worker: Optional[asyncio.Task] = None
+
+
+def _get_transcription_service():
+    """Create the shared TranscriptionService on first use."""
+    global _transcription_service
+    if _transcription_service is None:
+        from core.transcription_service import TranscriptionService
+        from config.settings import Settings
+        settings = Settings()
+        settings.set('processing', 'quiet_mode', True)
+        _transcription_service = TranscriptionService(settings, logger)
+    return _transcription_service
+
+
+def _run_transcription(file_path: str, options: dict) -> dict:
+    """Blocking transcription call; runs in a worker thread."""
+    service = _get_transcription_service()
+    settings = service.settings
+    model = options.get('model_name', 'base')
+    if settings.get('transcription', 'default_model') != model:
+        # The service keeps the engine it loaded first; engines are shared
+        # process-wide, so switching back to an earlier model does not reload it
+        service.transcription_engine = None
+    # Requests run one at a time, so the shared settings can carry each one's options
+    settings.set('transcription', 'default_model', model)
+    settings.set('transcription', 'default_language', options.get('language'))
+    settings.set('enhancement', 'enable_speaker_detection', options.get('enable_diarization', False))
+
+    # The service always writes an output file and prints chunk progress; keep the
+    # file out of the caller's directories and the prints off the STDIO transport
+    with tempfile.TemporaryDirectory() as output_dir, redirect_stdout(sys.stderr):
+        return service.transcribe_file(file_path, os.path.join(output_dir, "transcript.txt"), 'txt')
+
+
+async def _transcription_worker():
+    """Drain the queue in batches, one transcription at a time."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _transcribe_queue.get()]
+        deadline = loop.time() + _TRANSCRIBE_BATCH_WINDOW
+        while len(batch) < _TRANSCRIBE_BATCH_MAX:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_transcribe_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        # Same model/language back to back, so the loaded model is reused across files
+        batch.sort(key=lambda request: (request[1].get('model_name', ''),
+                                        request[1].get('language') or '',
+                                        request[1].get('enable_diarization', False)))
+        for file_path, options, future in batch:
+            if future.done():
+                continue  # Caller went away
+            try:
+                result = await asyncio.to_thread(_run_transcription, file_path, options)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+
+async def _submit_transcription(file_path: str, **options) -> dict:
+    """Queue a transcription for the shared worker and wait for its result."""
+    global _transcribe_queue, _transcribe_worker
+    if _transcribe_worker is None or _transcribe_worker.done():
+        _transcribe_queue = asyncio.Queue()
+        _transcribe_worker = asyncio.create_task(_transcription_worker())
+
+    future = asyncio.get_running_loop().create_future()
+    await _transcribe_queue.put((file_path, options, future))
+    return await future
+
+
+_VALID_EXTENSIONS = {'.mp3', '.wav', '.m4a', '.flac', '.mp4', '.mov', '.avi', '.webm'}
+
+
+def _validate_media_file(file_path: str) -> Optional[str]:
+    """Return an error message if file_path can't be transcribed, else None."""
+    if not os.path.exists(file_path):
+        return f"Error: File not found: {file_path}"
+
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in _VALID_EXTENSIONS:
+        return f"Error: Unsupported file format: {ext}. Supported: {', '.join(_VALID_EXTENSIONS)}"
+    return None
+
+
+def _format_transcription(result: dict, enable_speakers: bool) -> str:
+    """Tool output for a transcription result, with speaker labels when requested."""
+    if result.get("error"):
+        return f"Error: {result['error']}"
+
+    text = result.get("text", "")
+
+    # Add speaker labels if available; long transcripts stream into one buffer
+    if enable_speakers and result.get("segments"):
+        buf = io.StringIO()
+        current_speaker = None
+        separator = ""
+        for seg in result["segments"]:
+            speaker = seg.get("speaker", "")
+            if speaker and speaker != current_speaker:
+                buf.write(f"{separator}\n[{speaker}]")
+                current_speaker = speaker
+                separator = " "
+            buf.write(separator)
+            buf.write(seg.get("text", "").strip())
+            separator = " "
+        text = buf.getvalue()
+
+    return text or "No transcription produced."
+
+
+# ============================================================================
+# Shared services
+# ============================================================================
+
+# Providers hold API clients with their own connection pools; build each once
+# per process instead of per tool call. Construction never awaits, so these
+# lazy getters can't interleave on the event loop.
+_history_manager = None
+_ai_providers: dict = {}
+_cleanup_services: dict = {}
+_extraction_services: dict = {}
+
+
+def _get_history_manager():
+    """Shared HistoryManager."""
+    global _history_manager
+    if _history_manager is None:
+        from src.web.services.history_manager import HistoryManager
+        _history_manager = HistoryManager()
+    return _history_manager
+
+
+def _get_ai_provider(provider: Optional[str]):
+    """Shared AI provider for the given name (None for the default), or None if unavailable."""
+    if provider not in _ai_providers:
+        from src.web.services.ai_provider import AIProviderFactory
+        ai_provider = AIProviderFactory.create_default(provider)
+        if not ai_provider:
+            return None  # Not cached, so configuring a key later takes effect
+        _ai_providers[provider] = ai_provider
+    return _ai_providers[provider]
+
+
+def _get_cleanup_service(provider: Optional[str]):
+    """Shared CleanupService bound to the given provider, or None if unavailable."""
+    if provider not in _cleanup_services:
+        ai_provider = _get_ai_provider(provider)
+        if not ai_provider:
+            return None
+        from src.web.services.cleanup_service import CleanupService
+        _cleanup_services[provider] = CleanupService(ai_provider)
+    return _cleanup_services[provider]
+
+
+def _get_extraction_service(provider: Optional[str]):
+    """Shared ExtractionService bound to the given provider, or None if unavailable."""
+    if provider not in _extraction_services:
+        ai_provider = _get_ai_provider(provider)
+        if not ai_provider:
+            return None
+        from src.web.services.extraction_service import ExtractionService
+        _extraction_services[provider] = ExtractionService(ai_provider)
+    return _extraction_services[provider]
+
+
 # ============================================================================
 # Transcription Tools
 # ============================================================================
@@ -51,52 +245,67 @@ async def transcribe_file(
     Returns:
         The transcribed text
     """
-    from src.core.transcriber import Transcriber
-    from src.config.settings import Config
-
-    # Validate file exists
-    if not os.path.exists(file_path):
-        return f"Error: File not found: {file_path}"
-
-    # Validate file extension
-    valid_extensions = {'.mp3', '.wav', '.m4a', '.flac', '.mp4', '.mov', '.avi', '.webm'}
-    ext = os.path.splitext(file_path)[1].lower()
-    if ext not in valid_extensions:
-        return f"Error: Unsupported file format: {ext}. Supported: {', '.join(valid_extensions)}"
+    error = _validate_media_file(file_path)
+    if error:
+        return error
 
     try:
-        config = Config()
-        transcriber = Transcriber(config)
-
-        result = transcriber.transcribe(
+        result = await _submit_transcription(
             file_path,
             model_name=model,
             language=language,
             enable_diarization=enable_speakers,
         )
+        return _format_transcription(result, enable_speakers)
 
-        if result.get("error"):
-            return f"Error: {result['error']}"
+    except Exception as e:
+        logger.error(f"Transcription error: {e}")
+        return f"Error during transcription: {str(e)}"
 
-        text = result.get("text", "")
 
-        # Add speaker labels if available
-        if enable_speakers and result.get("segments"):
-            lines = []
-            current_speaker = None
-            for seg in result["segments"]:
-                speaker = seg.get("speaker", "")
-                if speaker and speaker != current_speaker:
-                    lines.append(f"\n[{speaker}]")
-                    current_speaker = speaker
-                lines.append(seg.get("text", "").strip())
-            text = " ".join(lines)
+@mcp.tool()
+async def transcribe_files(
+    file_paths: list[str],
+    model: str = "base",
+    language: Optional[str] = None,
+    enable_speakers: bool = False,
+) -> str:
+    """
+    Transcribe several local audio or video files in one call.
 
-        return text or "No transcription produced."
+    Prefer this over calling transcribe_file in a loop: all files are queued
+    at once, so they run back to back on the same loaded model.
 
-    except Exception as e:
-        logger.error(f"Transcription error: {e}")
-        return f"Error during transcription: {str(e)}"
+    Args:
+        file_paths: Absolute paths to the audio/video files
+        model: Whisper model size (tiny, base, small, medium, large)
+        language: Language code (e.g., 'en', 'es') or None for auto-detect
+        enable_speakers: Enable speaker diarization
+
+    Returns:
+        The transcribed text of each file, headed by its path
+    """
+    async def transcribe_one(file_path: str) -> str:
+        error = _validate_media_file(file_path)
+        if error:
+            return error
+        try:
+            result = await _submit_transcription(
+                file_path,
+                model_name=model,
+                language=language,
+                enable_diarization=enable_speakers,
+            )
+            return _format_transcription(result, enable_speakers)
+        except Exception as e:
+            logger.error(f"Transcription error for {file_path}: {e}")
+            return f"Error during transcription: {str(e)}"
+
+    if not file_paths:
+        return "Error: No files given."
+
+    texts = await asyncio.gather(*(transcribe_one(path) for path in file_paths))
+    return "\n\n".join(f"=== {path} ===\n{text}" for path, text in zip(file_paths, texts))
 
 
 @mcp.tool()
@@ -116,10 +325,7 @@ async def transcribe_url(
     Returns:
         The transcribed text
     """
-    import tempfile
     import yt_dlp
-    from src.core.transcriber import Transcriber
-    from src.config.settings import Config
 
     # Validate URL
     valid_domains = ['youtube.com', 'youtu.be', 'vimeo.com']
@@ -152,10 +358,7 @@ async def transcribe_url(
                 return "Error: Failed to download audio from URL."
 
             # Transcribe
-            config = Config()
-            transcriber = Transcriber(config)
-
-            result = transcriber.transcribe(
+            result = await _submit_transcription(
                 audio_file,
                 model_name=model,
                 language=language,
@@ -190,11 +393,9 @@ async def search_transcripts(
     Returns:
         Search results with transcript IDs and snippets
     """
-    from src.web.services.history_manager import HistoryManager
-
     try:
-        manager = HistoryManager()
-        results = manager.search_history(query, limit=limit)
+        manager = _get_history_manager()
+        results = manager.search_history_preview(query, limit=limit, preview_len=200)
 
         if not results:
             return f"No transcripts found matching '{query}'."
@@ -203,14 +404,11 @@ async def search_transcripts(
 
         for entry in results:
             output_lines.append(f"ID: {entry['id']}")
-            output_lines.append(f"File: {entry.get('filename', 'Unknown')}")
+            output_lines.append(f"File: {entry.get('audio_filename') or 'Unknown'}")
             output_lines.append(f"Date: {entry.get('created_at', 'Unknown')}")
 
-            # Show snippet of text
-            text = entry.get('transcript_text', '')[:200]
-            if len(entry.get('transcript_text', '')) > 200:
-                text += "..."
-            output_lines.append(f"Preview: {text}")
+            # Snippet is truncated in SQL, so long transcripts are never fetched in full
+            output_lines.append(f"Preview: {entry['preview']}")
             output_lines.append("-" * 40)
 
         return "\n".join(output_lines)
@@ -231,10 +429,8 @@ async def get_transcript(transcript_id: int) -> str:
     Returns:
         The full transcript text and metadata
     """
-    from src.web.services.history_manager import HistoryManager
-
     try:
-        manager = HistoryManager()
+        manager = _get_history_manager()
         entry = manager.get_entry(transcript_id)
 
         if not entry:
@@ -270,11 +466,9 @@ async def list_recent_transcripts(limit: int = 10) -> str:
     Returns:
         List of recent transcripts with IDs and summaries
     """
-    from src.web.services.history_manager import HistoryManager
-
     try:
-        manager = HistoryManager()
-        entries = manager.get_recent_entries(limit=limit)
+        manager = _get_history_manager()
+        entries = manager.get_history_preview(limit=limit, preview_len=100)
 
         if not entries:
             return "No transcriptions in history."
@@ -283,15 +477,12 @@ async def list_recent_transcripts(limit: int = 10) -> str:
 
         for entry in entries:
             output_lines.append(f"ID: {entry['id']}")
-            output_lines.append(f"File: {entry.get('filename', 'Unknown')}")
+            output_lines.append(f"File: {entry.get('audio_filename') or 'Unknown'}")
             output_lines.append(f"Date: {entry.get('created_at', 'Unknown')}")
-            output_lines.append(f"Duration: {entry.get('duration', 0):.1f}s")
+            output_lines.append(f"Duration: {entry.get('duration_seconds') or 0:.1f}s")
 
             # Show preview
-            text = entry.get('transcript_text', '')[:100]
-            if len(entry.get('transcript_text', '')) > 100:
-                text += "..."
-            output_lines.append(f"Preview: {text}")
+            output_lines.append(f"Preview: {entry['preview']}")
             output_lines.append("-" * 40)
 
         return "\n".join(output_lines)
@@ -321,15 +512,11 @@ async def cleanup_transcript(
     Returns:
         The cleaned transcript text
     """
-    from src.web.services.ai_provider import AIProviderFactory
-    from src.web.services.cleanup_service import CleanupService
-
     try:
-        ai_provider = AIProviderFactory.create_default(provider)
-        if not ai_provider:
+        cleanup_service = _get_cleanup_service(provider)
+        if not cleanup_service:
             return "Error: No AI providers available. Configure API keys in settings."
 
-        cleanup_service = CleanupService(ai_provider)
         result = await cleanup_service.cleanup(text)
 
         return result.get("cleaned", text)
@@ -356,15 +543,11 @@ async def summarize_transcript(
     Returns:
         The summary text
     """
-    from src.web.services.ai_provider import AIProviderFactory
-    from src.web.services.extraction_service import ExtractionService
-
     try:
-        ai_provider = AIProviderFactory.create_default(provider)
-        if not ai_provider:
+        extraction_service = _get_extraction_service(provider)
+        if not extraction_service:
             return "Error: No AI providers available. Configure API keys in settings."
 
-        extraction_service = ExtractionService(ai_provider)
         summary = await extraction_service.summarize(text, length)
 
         return summary
@@ -391,15 +574,11 @@ async def extract_key_points(
     Returns:
         List of key points
     """
-    from src.web.services.ai_provider import AIProviderFactory
-    from src.web.services.extraction_service import ExtractionService
-
     try:
-        ai_provider = AIProviderFactory.create_default(provider)
-        if not ai_provider:
+        extraction_service = _get_extraction_service(provider)
+        if not extraction_service:
             return "Error: No AI providers available. Configure API keys in settings."
 
-        extraction_service = ExtractionService(ai_provider)
         points = await extraction_service.extract_key_points(text, max_points)
 
         if not points:
@@ -427,15 +606,11 @@ async def extract_action_items(
     Returns:
         List of action items with assignees (if mentioned)
     """
-    from src.web.services.ai_provider import AIProviderFactory
-    from src.web.services.extraction_service import ExtractionService
-
     try:
-        ai_provider = AIProviderFactory.create_default(provider)
-        if not ai_provider:
+        extraction_service = _get_extraction_service(provider)
+        if not extraction_service:
             return "Error: No AI providers available. Configure API keys in settings."
 
-        extraction_service = ExtractionService(ai_provider)
         items = await extraction_service.extract_action_items(text)
 
         if not items:
@@ -472,15 +647,11 @@ async def generate_meeting_notes(
     Returns:
         Formatted meeting notes in Markdown
     """
-    from src.web.services.ai_provider import AIProviderFactory
-    from src.web.services.extraction_service import ExtractionService
-
     try:
-        ai_provider = AIProviderFactory.create_default(provider)
-        if not ai_provider:
+        extraction_service = _get_extraction_service(provider)
+        if not extraction_service:
             return "Error: No AI providers available. Configure API keys in settings."
 
-        extraction_service = ExtractionService(ai_provider)
         notes = await extraction_service.generate_meeting_notes(text)
 
         return notes
@@ -506,15 +677,11 @@ async def full_analysis(
     Returns:
         Complete analysis results
     """
-    from src.web.services.ai_provider import AIProviderFactory
-    from src.web.services.extraction_service import ExtractionService
-
     try:
-        ai_provider = AIProviderFactory.create_default(provider)
-        if not ai_provider:
+        extraction_service = _get_extraction_service(provider)
+        if not extraction_service:
             return "Error: No AI providers available. Configure API keys in settings."
 
-        extraction_service = ExtractionService(ai_provider)
         results = await extraction_service.full_analysis(text)
 
         output_lines = ["# Transcript Analysis\n"]
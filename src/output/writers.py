@@ -11,7 +11,73 @@ from typing import Dict, Any
 from datetime import datetime
 
 from config.settings import Settings
-from enhancement.enhanced_metadata import MetadataEnhancer
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+# Text outputs issue many small writes per segment; a large buffer turns them into a few syscalls
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Bound once: %-formatting of a numeric tuple is cheaper than an f-string with four format specs
+_CLOCK_FORMAT = "%02d:%02d".__mod__
+_SRT_FORMAT = "%02d:%02d:%02d,%03d".__mod__
+_VTT_FORMAT = "%02d:%02d:%02d.%03d".__mod__
+
+
+def _split_time(seconds: float) -> tuple:
+    """(hours, minutes, seconds, milliseconds) for a timestamp in seconds."""
+    # Rounded to the millisecond, so 2.3 prints as ,300 rather than truncating to ,299
+    hours, rem = divmod(round(seconds * 1000), 3_600_000)
+    minutes, rem = divmod(rem, 60_000)
+    return (hours, minutes) + divmod(rem, 1000)
+
+
+def _format_clock_time(seconds: float) -> str:
+    """Format time in MM:SS format."""
+    return _CLOCK_FORMAT(divmod(int(seconds), 60))
+
+
+def _format_srt_time(seconds: float) -> str:
+    """Format time in SRT format (HH:MM:SS,mmm)."""
+    return _SRT_FORMAT(_split_time(seconds))
+
+
+def _format_vtt_time(seconds: float) -> str:
+    """Format time in WebVTT format (HH:MM:SS.mmm)."""
+    return _VTT_FORMAT(_split_time(seconds))
+
+
+class _SegmentView:
+    """Raw segment whose JSON form is built only when the encoder reaches it."""
+    __slots__ = ('segment',)
+    
+    def __init__(self, segment: Dict[str, Any]):
+        self.segment = segment
+
+
+def _encode_default(obj: Any) -> Any:
+    """JSON fallback for the lazy segment views and stats objects in transcript output."""
+    if isinstance(obj, _SegmentView):
+        return JSONWriter._format_segment(obj.segment)
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class TranscriptEncoder(json.JSONEncoder):
+    """Encoder that formats segments as it walks the document instead of up front."""
+    
+    def default(self, obj):
+        return _encode_default(obj)
 
 
 class BaseWriter(ABC):
@@ -20,6 +86,19 @@ class BaseWriter(ABC):
     def __init__(self, settings: Settings):
         self.settings = settings
         self.metadata_enhancer = None  # Lazy initialization
+        
+        # Resolved once per writer instead of on every write
+        self._include_metadata = settings.get('output', 'include_metadata', True)
+        self._include_timestamps = settings.get('output', 'include_timestamps', False)
+        self._enhanced_metadata = settings.get('enhancement', 'enhanced_metadata', False)
+        self._default_model = settings.get('transcription', 'default_model', 'base')
+        self._enhanced_settings = {
+            'transcription': settings.config.get('transcription', {}),
+            'output': settings.config.get('output', {}),
+            'enhancement': settings.config.get('enhancement', {}),
+            'enhanced_metadata_audio_analysis': settings.get('enhancement', 'enhanced_metadata_audio_analysis', True),
+            'enhanced_metadata_content_analysis': settings.get('enhancement', 'enhanced_metadata_content_analysis', True)
+        }
     
     @abstractmethod
     def write(self, transcription_result: Dict[str, Any], output_path: str, 
@@ -31,7 +110,7 @@ class BaseWriter(ABC):
                           file_info: Dict[str, Any]) -> Dict[str, Any]:
         """Generate metadata for the transcription."""
         # Check if enhanced metadata is enabled
-        if self.settings.get('enhancement', 'enhanced_metadata', False):
+        if self._enhanced_metadata:
             return self._generate_enhanced_metadata(transcription_result, file_info)
         
         # Standard metadata
@@ -44,7 +123,7 @@ class BaseWriter(ABC):
                 'format_type': file_info['format_type']
             },
             'transcription': {
-                'model': self.settings.get('transcription', 'default_model', 'base'),
+                'model': self._default_model,
                 'language': transcription_result.get('language', 'unknown'),
                 'processing_time': transcription_result.get('processing_time', 0),
                 'confidence': transcription_result.get('confidence', 0),
@@ -63,17 +142,10 @@ class BaseWriter(ABC):
                                    file_info: Dict[str, Any]) -> Dict[str, Any]:
         """Generate enhanced metadata with detailed analysis."""
         if self.metadata_enhancer is None:
+            # Imported on first use: enhanced metadata is off by default and pulls in audio analysis
+            from enhancement.enhanced_metadata import MetadataEnhancer
             self.metadata_enhancer = MetadataEnhancer()
         
-        # Get enhanced metadata settings
-        settings_dict = {
-            'transcription': self.settings.config.get('transcription', {}),
-            'output': self.settings.config.get('output', {}),
-            'enhancement': self.settings.config.get('enhancement', {}),
-            'enhanced_metadata_audio_analysis': self.settings.get('enhancement', 'enhanced_metadata_audio_analysis', True),
-            'enhanced_metadata_content_analysis': self.settings.get('enhancement', 'enhanced_metadata_content_analysis', True)
-        }
-        
         # Get performance stats if available
         performance_stats = transcription_result.get('performance_stats')
         if hasattr(performance_stats, '__dict__'):
@@ -84,7 +156,7 @@ class BaseWriter(ABC):
             input_file=file_info['path'],
             file_info=file_info,
             transcription_result=transcription_result,
-            settings=settings_dict,
+            settings=self._enhanced_settings,
             processing_stats=performance_stats
         )
 
@@ -96,24 +168,27 @@ class TextWriter(BaseWriter):
               file_info: Dict[str, Any]):
         """Write transcription as plain text."""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
+            with open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
                 # Write header if metadata is enabled
-                if self.settings.get('output', 'include_metadata', True):
+                if self._include_metadata:
                     metadata = self._generate_metadata(transcription_result, file_info)
+                    transcription = metadata['transcription']
                     
-                    f.write("# Transcription\n")
-                    f.write(f"# File: {metadata['input_file']['name']}\n")
-                    f.write(f"# Generated: {metadata['timestamp']}\n")
-                    f.write(f"# Model: {metadata['transcription']['model']}\n")
-                    f.write(f"# Language: {metadata['transcription']['language']}\n")
-                    f.write(f"# Processing time: {metadata['transcription']['processing_time']:.2f}s\n")
-                    f.write(f"# Confidence: {metadata['transcription']['confidence']:.1%}\n")
-                    
+                    header = [
+                        "# Transcription",
+                        f"# File: {metadata['input_file']['name']}",
+                        f"# Generated: {metadata['timestamp']}",
+                        f"# Model: {transcription['model']}",
+                        f"# Language: {transcription['language']}",
+                        f"# Processing time: {transcription['processing_time']:.2f}s",
+                        f"# Confidence: {transcription['confidence']:.1%}",
+                    ]
                     if metadata['chunks']:
-                        f.write(f"# Chunks: {metadata['chunks']['chunk_count']} total, "
-                               f"{metadata['chunks']['successful_chunks']} successful\n")
+                        header.append(f"# Chunks: {metadata['chunks']['chunk_count']} total, "
+                                      f"{metadata['chunks']['successful_chunks']} successful")
+                    header.append("\n" + "="*50 + "\n\n")
                     
-                    f.write("\n" + "="*50 + "\n\n")
+                    f.write("\n".join(header))
                 
                 # Write transcript text
                 # Check if speaker-formatted text is available
@@ -124,7 +199,7 @@ class TextWriter(BaseWriter):
                     text = transcription_result.get('text', '').strip()
                     if text:
                         # Format with timestamps if requested
-                        if self.settings.get('output', 'include_timestamps', False):
+                        if self._include_timestamps:
                             text = self._format_text_with_timestamps(transcription_result)
                         
                         f.write(text)
@@ -135,18 +210,18 @@ class TextWriter(BaseWriter):
                 if transcription_result.get('speaker_detection', {}).get('enabled'):
                     speaker_stats = transcription_result['speaker_detection'].get('speaker_stats', {})
                     if speaker_stats:
-                        f.write("\n\n" + "="*50 + "\n")
-                        f.write("SPEAKER SUMMARY\n")
-                        f.write("="*50 + "\n")
+                        summary = ["\n\n" + "="*50 + "\n", "SPEAKER SUMMARY\n", "="*50 + "\n"]
+                        # Plain tuples sort with C comparisons, no key function per element;
+                        # the insertion index keeps ties in their original order
                         sorted_speakers = sorted(
-                            speaker_stats.items(),
-                            key=lambda x: x[1]['total_duration'],
-                            reverse=True
+                            (-stats['total_duration'], order, speaker, stats['segment_count'])
+                            for order, (speaker, stats) in enumerate(speaker_stats.items())
                         )
-                        for i, (speaker, stats) in enumerate(sorted_speakers, 1):
-                            duration = stats['total_duration']
-                            segments = stats['segment_count']
-                            f.write(f"{i}. {speaker}: {duration:.1f}s ({segments} segments)\n")
+                        summary.extend(
+                            f"{i}. {speaker}: {-negative_duration:.1f}s ({segments} segments)\n"
+                            for i, (negative_duration, _, speaker, segments) in enumerate(sorted_speakers, 1)
+                        )
+                        f.write("".join(summary))
                 
                 f.write("\n")
                 
@@ -166,16 +241,10 @@ class TextWriter(BaseWriter):
             text = segment.get('text', '').strip()
             
             if text:
-                timestamp = f"[{self._format_time(start_time)} -> {self._format_time(end_time)}]"
+                timestamp = f"[{_format_clock_time(start_time)} -> {_format_clock_time(end_time)}]"
                 formatted_lines.append(f"{timestamp} {text}")
         
         return '\n'.join(formatted_lines)
-    
-    def _format_time(self, seconds: float) -> str:
-        """Format time in MM:SS format."""
-        minutes = int(seconds // 60)
-        seconds = int(seconds % 60)
-        return f"{minutes:02d}:{seconds:02d}"
 
 
 class JSONWriter(BaseWriter):
@@ -185,75 +254,122 @@ class JSONWriter(BaseWriter):
               file_info: Dict[str, Any]):
         """Write transcription as structured JSON."""
         try:
-            # Prepare JSON structure
-            output_data = {
-                'metadata': self._generate_metadata(transcription_result, file_info),
-                'transcription': {
-                    'text': transcription_result.get('text', ''),
-                    'language': transcription_result.get('language', 'unknown'),
-                    'confidence': transcription_result.get('confidence', 0),
-                    'processing_time': transcription_result.get('processing_time', 0),
-                    'word_count': transcription_result.get('word_count', 0),
-                    'segment_count': transcription_result.get('segment_count', 0)
-                },
-                'segments': self._format_segments(transcription_result.get('segments', [])),
-                'statistics': {
-                    'total_duration': self._calculate_total_duration(transcription_result.get('segments', [])),
-                    'average_confidence': transcription_result.get('confidence', 0),
-                    'processing_speed': self._calculate_processing_speed(transcription_result)
-                }
-            }
+            output_data = self._build_output_data(transcription_result, file_info)
             
-            # Add chunk information if available
-            if 'chunk_count' in transcription_result:
-                output_data['chunks'] = {
-                    'total': transcription_result.get('chunk_count', 0),
-                    'successful': transcription_result.get('successful_chunks', 0),
-                    'failed': transcription_result.get('failed_chunks', 0)
-                }
-            
-            # Add speaker detection information if available
-            if 'speaker_detection' in transcription_result:
-                speaker_data = transcription_result['speaker_detection']
-                output_data['speaker_detection'] = {
-                    'enabled': speaker_data.get('enabled', False),
-                    'speaker_count': speaker_data.get('speaker_count', 0),
-                    'speakers': speaker_data.get('speakers', []),
-                    'speaker_stats': speaker_data.get('speaker_stats', {}),
-                    'speaker_segments': speaker_data.get('speaker_segments', [])
-                }
-                
-                # Add speaker-formatted text if available
-                if 'speaker_formatted_text' in transcription_result:
-                    output_data['speaker_formatted_text'] = transcription_result['speaker_formatted_text']
-            
-            # Write JSON file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+            # Write JSON file; orjson encodes in C and emits UTF-8 bytes directly
+            if ORJSON_AVAILABLE:
+                data = orjson.dumps(output_data, default=_encode_default,
+                                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+                with open(output_path, 'wb') as f:
+                    f.write(data)
+            else:
+                # Stream encoder chunks into the buffered file; writelines consumes them in C
+                # rather than through one Python-level write() call per token
+                encoder = TranscriptEncoder(indent=2, ensure_ascii=False)
+                with open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                    f.writelines(encoder.iterencode(output_data))
                 
         except Exception as e:
             raise RuntimeError(f"Failed to write JSON file {output_path}: {str(e)}")
     
+    def _build_output_data(self, transcription_result: Dict[str, Any],
+                           file_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Structured document shared by the JSON and MessagePack writers."""
+        # With metadata disabled only the timestamp is kept, skipping the (possibly enhanced) analysis
+        if self._include_metadata:
+            metadata = self._generate_metadata(transcription_result, file_info)
+        else:
+            metadata = {'timestamp': datetime.now().isoformat()}
+        
+        # Prepare JSON structure
+        output_data = {
+            'metadata': metadata,
+            'transcription': {
+                'text': transcription_result.get('text', ''),
+                'language': transcription_result.get('language', 'unknown'),
+                'confidence': transcription_result.get('confidence', 0),
+                'processing_time': transcription_result.get('processing_time', 0),
+                'word_count': transcription_result.get('word_count', 0),
+                'segment_count': transcription_result.get('segment_count', 0)
+            },
+            # Each segment is formatted as it is encoded, so the whole formatted list never exists at once
+            'segments': [_SegmentView(segment) for segment in transcription_result.get('segments', [])],
+            'statistics': {
+                'total_duration': self._calculate_total_duration(transcription_result.get('segments', [])),
+                'average_confidence': transcription_result.get('confidence', 0),
+                'processing_speed': self._calculate_processing_speed(transcription_result)
+            }
+        }
+        
+        # Add chunk information if available
+        if 'chunk_count' in transcription_result:
+            output_data['chunks'] = {
+                'total': transcription_result.get('chunk_count', 0),
+                'successful': transcription_result.get('successful_chunks', 0),
+                'failed': transcription_result.get('failed_chunks', 0)
+            }
+        
+        # Add speaker detection information if available
+        if 'speaker_detection' in transcription_result:
+            speaker_data = transcription_result['speaker_detection']
+            output_data['speaker_detection'] = {
+                'enabled': speaker_data.get('enabled', False),
+                'speaker_count': speaker_data.get('speaker_count', 0),
+                'speakers': speaker_data.get('speakers', []),
+                'speaker_stats': speaker_data.get('speaker_stats', {}),
+                'speaker_segments': speaker_data.get('speaker_segments', [])
+            }
+            
+            # Add speaker-formatted text if available
+            if 'speaker_formatted_text' in transcription_result:
+                output_data['speaker_formatted_text'] = transcription_result['speaker_formatted_text']
+        
+        return output_data
+    
     def _format_segments(self, segments: list) -> list:
         """Format segments for JSON output."""
-        formatted_segments = []
-        
-        for segment in segments:
+        return [self._format_segment(segment) for segment in segments]
+    
+    @staticmethod
+    def _format_segment(segment: Dict[str, Any]) -> Dict[str, Any]:
+        """Format one segment for JSON output."""
+        # Whisper always fills start/end/text, so index them directly and only fall back
+        # to defaults for segments from other sources
+        try:
+            formatted_segment = {
+                'start': segment['start'],
+                'end': segment['end'],
+                'text': segment['text'].strip(),
+                'confidence': segment.get('avg_logprob', 0)
+            }
+        except KeyError:
             formatted_segment = {
                 'start': segment.get('start', 0),
                 'end': segment.get('end', 0),
                 'text': segment.get('text', '').strip(),
                 'confidence': segment.get('avg_logprob', 0)
             }
-            
-            # Add speaker information if available
-            if 'speaker' in segment:
-                formatted_segment['speaker'] = segment['speaker']
-                if 'speaker_confidence' in segment:
-                    formatted_segment['speaker_confidence'] = segment['speaker_confidence']
-            
-            # Add word-level information if available
-            if 'words' in segment:
+        
+        # Add speaker information if available
+        if 'speaker' in segment:
+            formatted_segment['speaker'] = segment['speaker']
+            if 'speaker_confidence' in segment:
+                formatted_segment['speaker_confidence'] = segment['speaker_confidence']
+        
+        # Add word-level information if available
+        words = segment.get('words')
+        if words is not None:
+            try:
+                formatted_segment['words'] = [
+                    {
+                        'word': word['word'],
+                        'start': word['start'],
+                        'end': word['end'],
+                        'confidence': word['probability']
+                    }
+                    for word in words
+                ]
+            except KeyError:
                 formatted_segment['words'] = [
                     {
                         'word': word.get('word', ''),
@@ -261,19 +377,18 @@ class JSONWriter(BaseWriter):
                         'end': word.get('end', 0),
                         'confidence': word.get('probability', 0)
                     }
-                    for word in segment['words']
+                    for word in words
                 ]
-            
-            formatted_segments.append(formatted_segment)
         
-        return formatted_segments
+        return formatted_segment
     
     def _calculate_total_duration(self, segments: list) -> float:
         """Calculate total duration from segments."""
         if not segments:
             return 0.0
         
-        return max(segment.get('end', 0) for segment in segments)
+        # Whisper emits segments in chronological order, so the last one ends the audio
+        return segments[-1].get('end', 0)
     
     def _calculate_processing_speed(self, transcription_result: Dict[str, Any]) -> float:
         """Calculate processing speed (realtime factor)."""
@@ -303,32 +418,27 @@ class SRTWriter(BaseWriter):
                 else:
                     segments = [{'start': 0, 'end': 1, 'text': 'No speech detected in audio.'}]
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                for i, segment in enumerate(segments, 1):
-                    start_time = segment.get('start', 0)
-                    end_time = segment.get('end', start_time + 1)
-                    text = segment.get('text', '').strip()
-                    
-                    if text:
-                        # SRT format:
-                        # 1
-                        # 00:00:00,000 --> 00:00:04,000
-                        # Subtitle text
-                        # (blank line)
-                        f.write(f"{i}\n")
-                        f.write(f"{self._format_srt_time(start_time)} --> {self._format_srt_time(end_time)}\n")
-                        f.write(f"{text}\n\n")
+            # Build the whole body, then hand it to the file in one write
+            parts = []
+            for i, segment in enumerate(segments, 1):
+                start_time = segment.get('start', 0)
+                end_time = segment.get('end', start_time + 1)
+                text = segment.get('text', '').strip()
+                
+                if text:
+                    # SRT format:
+                    # 1
+                    # 00:00:00,000 --> 00:00:04,000
+                    # Subtitle text
+                    # (blank line)
+                    parts.append(f"{i}\n{_format_srt_time(start_time)} --> {_format_srt_time(end_time)}\n"
+                                 f"{text}\n\n")
+            
+            with open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                f.write("".join(parts))
                         
         except Exception as e:
             raise RuntimeError(f"Failed to write SRT file {output_path}: {str(e)}")
-    
-    def _format_srt_time(self, seconds: float) -> str:
-        """Format time in SRT format (HH:MM:SS,mmm)."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        milliseconds = int((seconds % 1) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
 
 
 class VTTWriter(BaseWriter):
@@ -347,43 +457,59 @@ class VTTWriter(BaseWriter):
                 else:
                     segments = [{'start': 0, 'end': 1, 'text': 'No speech detected in audio.'}]
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                # WebVTT header
-                f.write("WEBVTT\n\n")
-                
-                # Add metadata as note if enabled
-                if self.settings.get('output', 'include_metadata', True):
-                    metadata = self._generate_metadata(transcription_result, file_info)
-                    f.write("NOTE\n")
-                    f.write(f"Generated by Professional Transcription Service\n")
-                    f.write(f"File: {metadata['input_file']['name']}\n")
-                    f.write(f"Model: {metadata['transcription']['model']}\n")
-                    f.write(f"Language: {metadata['transcription']['language']}\n")
-                    f.write(f"Confidence: {metadata['transcription']['confidence']:.1%}\n\n")
+            # WebVTT header
+            parts = ["WEBVTT\n\n"]
+            
+            # Add metadata as note if enabled
+            if self._include_metadata:
+                metadata = self._generate_metadata(transcription_result, file_info)
+                parts.append(
+                    "NOTE\n"
+                    "Generated by Professional Transcription Service\n"
+                    f"File: {metadata['input_file']['name']}\n"
+                    f"Model: {metadata['transcription']['model']}\n"
+                    f"Language: {metadata['transcription']['language']}\n"
+                    f"Confidence: {metadata['transcription']['confidence']:.1%}\n\n"
+                )
+            
+            for segment in segments:
+                start_time = segment.get('start', 0)
+                end_time = segment.get('end', start_time + 1)
+                text = segment.get('text', '').strip()
                 
-                for segment in segments:
-                    start_time = segment.get('start', 0)
-                    end_time = segment.get('end', start_time + 1)
-                    text = segment.get('text', '').strip()
-                    
-                    if text:
-                        # WebVTT format:
-                        # 00:00:00.000 --> 00:00:04.000
-                        # Subtitle text
-                        # (blank line)
-                        f.write(f"{self._format_vtt_time(start_time)} --> {self._format_vtt_time(end_time)}\n")
-                        f.write(f"{text}\n\n")
+                if text:
+                    # WebVTT format:
+                    # 00:00:00.000 --> 00:00:04.000
+                    # Subtitle text
+                    # (blank line)
+                    parts.append(f"{_format_vtt_time(start_time)} --> {_format_vtt_time(end_time)}\n"
+                                 f"{text}\n\n")
+            
+            # Build the whole body, then hand it to the file in one write
+            with open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                f.write("".join(parts))
                         
         except Exception as e:
             raise RuntimeError(f"Failed to write VTT file {output_path}: {str(e)}")
+
+
+class MsgPackWriter(JSONWriter):
+    """Writer for MessagePack format: the JSON document in a compact binary encoding."""
     
-    def _format_vtt_time(self, seconds: float) -> str:
-        """Format time in WebVTT format (HH:MM:SS.mmm)."""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        milliseconds = int((seconds % 1) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}.{milliseconds:03d}"
+    def write(self, transcription_result: Dict[str, Any], output_path: str, 
+              file_info: Dict[str, Any]):
+        """Write transcription as MessagePack for machine consumers."""
+        try:
+            if not MSGSPEC_AVAILABLE:
+                raise ImportError("msgspec not available. Install with: pip install msgspec")
+            
+            output_data = self._build_output_data(transcription_result, file_info)
+            data = msgspec.msgpack.Encoder(enc_hook=_encode_default).encode(output_data)
+            with open(output_path, 'wb') as f:
+                f.write(data)
+                
+        except Exception as e:
+            raise RuntimeError(f"Failed to write MessagePack file {output_path}: {str(e)}")
 
 
 class OutputWriterFactory:
@@ -395,8 +521,11 @@ class OutputWriterFactory:
             'txt': TextWriter,
             'json': JSONWriter,
             'srt': SRTWriter,
-            'vtt': VTTWriter
+            'vtt': VTTWriter,
+            'msgpack': MsgPackWriter
         }
+        # Writers hold no per-file state, so one instance per format serves every write
+        self._instances: Dict[str, BaseWriter] = {}
     
     def create_writer(self, format_type: str) -> BaseWriter:
         """Create writer for specified format."""
@@ -406,8 +535,10 @@ class OutputWriterFactory:
             raise ValueError(f"Unsupported output format: {format_type}. "
                            f"Supported formats: {list(self._writers.keys())}")
         
-        writer_class = self._writers[format_type]
-        return writer_class(self.settings)
+        writer = self._instances.get(format_type)
+        if writer is None:
+            writer = self._instances[format_type] = self._writers[format_type](self.settings)
+        return writer
     
     def get_supported_formats(self) -> list:
         """Get list of supported output formats."""
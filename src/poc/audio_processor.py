@@ -6,9 +6,11 @@ Handles audio extraction from video files and audio preprocessing.
 import os
 import tempfile
 from pathlib import Path
-from typing import Optional, Tuple
-import ffmpeg
-from pydub import AudioSegment
+from typing import Optional, Tuple, TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    from pydub import AudioSegment
 
 
 class AudioProcessor:
@@ -17,6 +19,10 @@ class AudioProcessor:
     TEMP_AUDIO_FORMAT = 'wav'
     SAMPLE_RATE = 16000  # Standard for speech recognition
     CHANNELS = 1  # Mono for better transcription
+    LOUDNORM_FILTER = 'loudnorm=I=-16:TP=-1.5:LRA=11'  # EBU R128 loudness normalization
+    NORMALIZE_HEADROOM_DB = 0.1  # Same headroom as pydub's AudioSegment.normalize()
+    # Decoded sample size for formats whose header carries no bits_per_sample (compressed codecs)
+    SAMPLE_FORMAT_BITS = {'u8': 8, 'u8p': 8, 's16': 16, 's16p': 16, 's32': 32, 's32p': 32}
     
     def __init__(self):
         self.temp_files = []
@@ -28,9 +34,11 @@ class AudioProcessor:
     def cleanup_temp_files(self):
         """Remove all temporary files created during processing."""
         for temp_file in self.temp_files:
+            # Unlink directly instead of checking existence first: one syscall per file
             try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
+                os.unlink(temp_file)
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 print(f"Warning: Could not remove temp file {temp_file}: {e}")
         self.temp_files.clear()
@@ -45,24 +53,51 @@ class AudioProcessor:
         Returns:
             Tuple of (success, message, temp_audio_path)
         """
+        return self._extract_with_ffmpeg(video_path)
+    
+    def process_file_fused(self, file_path: str) -> Tuple[bool, str, Optional[str]]:
+        """
+        Extract, downmix, resample and normalize audio in a single ffmpeg pass.
+        
+        Normalization runs inside libavfilter, so no intermediate WAV is
+        decoded and re-encoded through pydub.
+        
+        Args:
+            file_path: Path to the video (or audio) file
+            
+        Returns:
+            Tuple of (success, message, processed_audio_path)
+        """
+        return self._extract_with_ffmpeg(file_path, audio_filter=self.LOUDNORM_FILTER)
+    
+    def _extract_with_ffmpeg(self, input_path: str,
+                             audio_filter: Optional[str] = None) -> Tuple[bool, str, Optional[str]]:
+        """Run ffmpeg once to write a 16kHz mono WAV temp file, optionally through an audio filter."""
+        import ffmpeg
+        
         try:
             # Create temporary file for extracted audio
             temp_fd, temp_audio_path = tempfile.mkstemp(suffix=f'.{self.TEMP_AUDIO_FORMAT}')
             os.close(temp_fd)  # Close file descriptor, keep the path
             self.temp_files.append(temp_audio_path)
             
-            # Extract audio using ffmpeg
+            output_options = {
+                'acodec': 'pcm_s16le',  # Uncompressed WAV
+                'ac': self.CHANNELS,    # Mono
+                'ar': self.SAMPLE_RATE  # 16kHz sample rate
+            }
+            if audio_filter:
+                output_options['af'] = audio_filter
+            
+            # Extract audio using ffmpeg. Output goes to a file, so stdout stays empty and is not
+            # piped; stderr is limited to errors so only failure messages are buffered.
             (
                 ffmpeg
-                .input(video_path)
-                .output(
-                    temp_audio_path,
-                    acodec='pcm_s16le',  # Uncompressed WAV
-                    ac=self.CHANNELS,    # Mono
-                    ar=self.SAMPLE_RATE  # 16kHz sample rate
-                )
+                .input(input_path)
+                .output(temp_audio_path, **output_options)
+                .global_args('-hide_banner', '-nostats', '-loglevel', 'error')
                 .overwrite_output()
-                .run(capture_stdout=True, capture_stderr=True)
+                .run(capture_stdout=False, capture_stderr=True)
             )
             
             # Verify the extracted file exists and has content
@@ -89,9 +124,19 @@ class AudioProcessor:
             Tuple of (success, message, processed_audio_path)
         """
         try:
+            from pydub import AudioSegment
+            
             # Load audio file
             audio = AudioSegment.from_file(audio_path)
             
+            # A WAV that is already mono, at the target rate and near full scale is what the
+            # export would produce, so skip it; compressed inputs are always transcoded.
+            # The original path is returned and is not a temp file, so cleanup leaves it alone.
+            if (Path(audio_path).suffix.lower() == f'.{self.TEMP_AUDIO_FORMAT}'
+                    and audio.channels == self.CHANNELS and audio.frame_rate == self.SAMPLE_RATE
+                    and audio.max > 0.9 * audio.max_possible_amplitude):
+                return True, "Audio already in target format", audio_path
+            
             # Convert to mono
             if audio.channels > 1:
                 audio = audio.set_channels(1)
@@ -101,7 +146,7 @@ class AudioProcessor:
                 audio = audio.set_frame_rate(self.SAMPLE_RATE)
             
             # Normalize volume (basic preprocessing)
-            audio = audio.normalize()
+            audio = self._peak_normalize(audio)
             
             # Create temporary file for processed audio
             temp_fd, temp_processed_path = tempfile.mkstemp(suffix=f'.{self.TEMP_AUDIO_FORMAT}')
@@ -116,6 +161,23 @@ class AudioProcessor:
         except Exception as e:
             return False, f"Audio preprocessing failed: {str(e)}", None
     
+    def _peak_normalize(self, audio: "AudioSegment") -> "AudioSegment":
+        """Scale samples so the peak sits NORMALIZE_HEADROOM_DB below full scale, in one numpy pass."""
+        dtype = {1: np.int8, 2: '<i2', 4: '<i4'}.get(audio.sample_width)
+        if dtype is None:
+            return audio.normalize()
+        
+        samples = np.frombuffer(audio.raw_data, dtype=dtype)
+        # abs() would overflow on the most negative sample, so take the extremes separately
+        peak = max(int(samples.max()), -int(samples.min())) if samples.size else 0
+        if peak == 0:
+            return audio
+        
+        max_possible = 2 ** (8 * audio.sample_width - 1)
+        gain = max_possible * 10 ** (-self.NORMALIZE_HEADROOM_DB / 20) / peak
+        scaled = np.clip(samples * gain, -max_possible, max_possible - 1)
+        return audio._spawn(scaled.astype(samples.dtype).tobytes())
+    
     def process_file(self, file_path: str, file_type: str) -> Tuple[bool, str, Optional[str]]:
         """
         Process file based on its type (audio or video).
@@ -128,13 +190,8 @@ class AudioProcessor:
             Tuple of (success, message, processed_audio_path)
         """
         if file_type == 'video':
-            # Extract audio from video
-            success, message, audio_path = self.extract_audio_from_video(file_path)
-            if not success:
-                return success, message, audio_path
-            
-            # Preprocess the extracted audio
-            return self.preprocess_audio(audio_path)
+            # Extract and preprocess in one ffmpeg pass instead of extract-then-reencode
+            return self.process_file_fused(file_path)
             
         elif file_type == 'audio':
             # Direct audio preprocessing
@@ -154,16 +211,52 @@ class AudioProcessor:
             Dictionary with audio information
         """
         try:
-            audio = AudioSegment.from_file(audio_path)
-            duration_seconds = len(audio) / 1000.0
+            info = self._probe_audio_info(audio_path)
+            if info is None:
+                # ffprobe unavailable or no usable header: decode with pydub instead
+                from pydub import AudioSegment
+                
+                audio = AudioSegment.from_file(audio_path)
+                info = {
+                    'duration_seconds': len(audio) / 1000.0,
+                    'channels': audio.channels,
+                    'frame_rate': audio.frame_rate,
+                    'sample_width': audio.sample_width
+                }
             
+            duration_seconds = info['duration_seconds']
             return {
                 'duration_seconds': duration_seconds,
                 'duration_formatted': f"{int(duration_seconds // 60):02d}:{int(duration_seconds % 60):02d}",
-                'channels': audio.channels,
-                'frame_rate': audio.frame_rate,
-                'sample_width': audio.sample_width,
+                'channels': info['channels'],
+                'frame_rate': info['frame_rate'],
+                'sample_width': info['sample_width'],
                 'file_size_mb': round(os.path.getsize(audio_path) / (1024 * 1024), 2)
             }
         except Exception as e:
-            return {'error': f"Could not analyze audio: {str(e)}"}
\ No newline at end of file
+            return {'error': f"Could not analyze audio: {str(e)}"}
+    
+    def _probe_audio_info(self, audio_path: str) -> Optional[dict]:
+        """Read duration and format from the container header with ffprobe, without decoding."""
+        try:
+            import ffmpeg
+            probe = ffmpeg.probe(audio_path, select_streams='a:0')
+            stream = probe['streams'][0]
+            duration = stream.get('duration') or probe['format']['duration']
+            
+            # Source bit depth: PCM reports it directly, lossless codecs as the raw sample depth
+            bits = next((int(value) for value in (stream.get('bits_per_sample'), stream.get('bits_per_raw_sample'))
+                         if str(value).isdigit() and int(value)), 0)
+            if not bits:
+                # Lossy codecs decode to float and have no source depth; like pydub, report
+                # them as the 16-bit PCM they are converted to
+                bits = self.SAMPLE_FORMAT_BITS.get(stream.get('sample_fmt'), 16)
+            
+            return {
+                'duration_seconds': float(duration),
+                'channels': int(stream['channels']),
+                'frame_rate': int(stream['sample_rate']),
+                'sample_width': bits // 8
+            }
+        except Exception:
+            return None
@@ -6,13 +6,27 @@ Implements memory-efficient processing for files of any size.
 import os
 import tempfile
 import math
+from collections import Counter
+import queue
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import List, Dict, Iterator, Tuple, Optional
+from typing import IO, List, Dict, Iterable, Iterator, Tuple, Optional
 from dataclasses import dataclass
+from functools import lru_cache
+import numpy as np
 import ffmpeg
 from tqdm import tqdm
 
-from .transcription_engine import TranscriptionEngine
+from .transcription_engine import TranscriptionEngine, available_devices, get_engine
+
+
+@lru_cache(maxsize=32)
+def _probe_duration(file_path: str, mtime_ns: int, size: int) -> float:
+    """Duration from ffprobe, cached per file version so repeated lookups skip the subprocess."""
+    probe = ffmpeg.probe(file_path)
+    return float(probe['format']['duration'])
 
 
 @dataclass
@@ -22,8 +36,8 @@ class ChunkInfo:
     start_time: float
     end_time: float
     duration: float
-    file_path: str
     size_bytes: int = 0
+    audio: Optional[np.ndarray] = None  # 16kHz mono float32 samples, released once transcribed
 
 
 @dataclass 
@@ -40,32 +54,51 @@ class ProcessingProgress:
 class ChunkedProcessor:
     """Handles large file processing through chunking strategy."""
     
-    def __init__(self, chunk_duration: int = 30, max_memory_mb: int = 500):
+    SAMPLE_RATE = 16000  # Whisper's input rate
+    WHISPER_WINDOW = 30  # Seconds of audio Whisper decodes in one pass
+    # Smaller files are under 5 minutes even at 8 kbps (the lowest common speech bitrate)
+    NO_CHUNKING_MAX_BYTES = 256 * 1024
+    CONTEXT_OVERLAP = 2.0  # Seconds of the previous chunk replayed at the start of the next
+    CONTEXT_PROMPT_WORDS = 50  # Words of the previous chunk's text used as the next chunk's prompt
+    
+    def __init__(self, chunk_duration: int = 30, max_memory_mb: int = 500,
+                 max_workers: Optional[int] = None, batch_size: int = 1,
+                 with_context: bool = False, whisper_config: Optional[Dict] = None):
         """
         Initialize chunked processor.
         
         Args:
             chunk_duration: Duration of each chunk in seconds
             max_memory_mb: Maximum memory usage target in MB
+            max_workers: Chunks transcribed concurrently (default: one per device, since each
+                device holds a single model copy)
+            batch_size: Chunks decoded together in one batched forward pass (1 disables batching)
+            with_context: Overlap in-memory chunks and prompt each chunk with the previous
+                chunk's text; chunks are then transcribed one after another
+            whisper_config: Whisper-specific configuration for the engines, including the backend
         """
         self.chunk_duration = chunk_duration
         self.max_memory_mb = max_memory_mb
-        self.temp_files: List[str] = []
+        # One engine per device, so several GPUs decode chunks side by side
+        self.devices = available_devices()
+        self.max_workers = max_workers or len(self.devices)
+        self.batch_size = max(1, batch_size)
+        self.with_context = with_context
+        self.whisper_config = whisper_config
         self.transcription_engine = None
         
-    def __del__(self):
-        """Cleanup temporary files."""
-        self.cleanup()
+        # Whisper decoding installs kv-cache hooks on the model, so one model cannot serve
+        # two chunks at once; workers check engines out of this pool and return them.
+        # The pool holds at most one engine per device, so a model is never loaded twice on one;
+        # engines are shared with other processors, which each engine's own lock serializes.
+        self._idle_engines: List[TranscriptionEngine] = []
+        self._engine_count = 0
+        self._engine_lock = threading.Lock()
+        self._engine_released = threading.Condition(self._engine_lock)
         
-    def cleanup(self):
-        """Remove all temporary chunk files."""
-        for temp_file in self.temp_files:
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            except Exception as e:
-                print(f"Warning: Could not remove temp file {temp_file}: {e}")
-        self.temp_files.clear()
+        # Float32 sample buffers of finished in-memory chunks, reused for the next chunks
+        self._buffer_pool: List[np.ndarray] = []
+        self._buffer_lock = threading.Lock()
     
     def should_use_chunking(self, file_path: str, file_type: str) -> bool:
         """
@@ -78,10 +111,16 @@ class ChunkedProcessor:
         Returns:
             True if chunking should be used
         """
+        # Files this small cannot be long enough to chunk; skip the ffprobe subprocess
+        try:
+            if os.path.getsize(file_path) < self.NO_CHUNKING_MAX_BYTES:
+                return False
+        except OSError:
+            return False
+        
         # Get file duration using ffmpeg
         try:
-            probe = ffmpeg.probe(file_path)
-            duration = float(probe['format']['duration'])
+            duration = self.get_file_duration(file_path)
             
             # Use chunking for files longer than 5 minutes
             return duration > 300  # 5 minutes
@@ -101,148 +140,366 @@ class ChunkedProcessor:
             Duration in seconds
         """
         try:
-            probe = ffmpeg.probe(file_path)
-            return float(probe['format']['duration'])
+            stat = os.stat(file_path)
+            return _probe_duration(file_path, stat.st_mtime_ns, stat.st_size)
         except Exception as e:
             raise RuntimeError(f"Could not determine file duration: {str(e)}")
     
-    def create_audio_chunks(self, file_path: str, file_type: str) -> List[ChunkInfo]:
+    def iter_audio_chunks(self, file_path: str, file_type: str,
+                          spans: Optional[List[Tuple[int, float, float]]] = None) -> Iterator[ChunkInfo]:
         """
-        Create audio chunks from source file.
+        Extract chunks one at a time, yielding each as soon as it is available.
         
         Args:
             file_path: Path to the source file
             file_type: Type of file ('audio' or 'video')
+            spans: Precomputed (index, start, end) spans; planned from the file if omitted.
+                Audio ffmpeg emits past the last span is yielded as further chunks
+            
+        Yields:
+            Chunk information
+        """
+        if spans is None:
+            spans = self.plan_chunks(file_path)
+        if not spans:
+            return
+        
+        overlap = self.CONTEXT_OVERLAP if self.with_context else 0.0
+        yield from self._iter_piped_chunks(file_path, spans, overlap)
+    
+    def _extend_spans(self, spans: List[Tuple[int, float, float]]) -> Iterator[Tuple[int, float, float]]:
+        """The planned spans, then further chunk-sized spans for audio the probed duration missed."""
+        yield from spans
+        index, _, end_time = spans[-1]
+        while True:
+            index += 1
+            yield index, end_time, end_time + self.chunk_duration
+            end_time += self.chunk_duration
+    
+    def _iter_piped_chunks(self, file_path: str, spans: List[Tuple[int, float, float]],
+                           overlap: float = 0.0) -> Iterator[ChunkInfo]:
+        """
+        Decode once to raw float32 PCM on stdout and slice it into chunk arrays; nothing touches disk.
+        
+        With `overlap`, each chunk after the first starts with the last `overlap` seconds of
+        the previous one, so words cut at a boundary are heard whole by one of the two chunks.
+        """
+        process, log = self._start_ffmpeg(
+            ffmpeg
+            .input(file_path)
+            .output('pipe:', format='f32le', acodec='pcm_f32le', ac=1, ar=self.SAMPLE_RATE, vn=None)
+        )
+        
+        # ffmpeg already emits float32 in [-1, 1], the format Whisper consumes, so samples
+        # are read straight into the chunk's buffer with no conversion pass
+        chunk_samples = int(round(self.chunk_duration * self.SAMPLE_RATE))
+        overlap_samples = int(round(overlap * self.SAMPLE_RATE))
+        tail = np.empty(0, np.float32)  # End of the previous chunk, replayed when overlapping
+        
+        try:
+            # Runs until ffmpeg's output ends, so a short probed duration loses no audio
+            for index, start_time, end_time in self._extend_spans(spans):
+                buffer = self._acquire_buffer(chunk_samples + overlap_samples)
+                carried = len(tail)
+                buffer[:carried] = tail
+                buffer_bytes = memoryview(buffer).cast('B')
+                wanted = (carried + min(chunk_samples, int(round((end_time - start_time) * self.SAMPLE_RATE)))) * 4
+                filled = carried * 4
+                while filled < wanted:
+                    count = process.stdout.readinto(buffer_bytes[filled:wanted])
+                    if not count:
+                        break
+                    filled += count
+                
+                samples = filled // 4
+                if samples == carried:
+                    # Output ended at the previous chunk (possibly one planned span early)
+                    self._release_buffer(buffer)
+                    break
+                
+                audio = buffer[:samples]
+                if overlap_samples:
+                    # Copied out: the chunk's buffer is recycled once it has been transcribed
+                    tail = audio[-overlap_samples:].copy()
+                chunk_start = start_time - carried / self.SAMPLE_RATE
+                if filled < wanted:
+                    # Output ended inside this span; it only covers the samples received
+                    end_time = chunk_start + samples / self.SAMPLE_RATE
+                yield ChunkInfo(
+                    index=index,
+                    start_time=chunk_start,
+                    end_time=end_time,
+                    duration=end_time - chunk_start,
+                    size_bytes=samples * 2,  # As 16-bit PCM, the size the chunk's WAV file would have
+                    audio=audio
+                )
+            
+            if process.wait():
+                raise RuntimeError(f"FFmpeg error creating chunks: {self._read_log(log)}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            log.close()
+    
+    def _start_ffmpeg(self, stream) -> Tuple[subprocess.Popen, IO[bytes]]:
+        """
+        Start an ffmpeg command in the background with its log written to an anonymous temp file.
+        
+        An stderr pipe is only read once ffmpeg exits, so a flood of decode errors could fill
+        it and stall ffmpeg; the file never blocks and keeps the log off the heap until needed.
+        """
+        log = tempfile.TemporaryFile()
+        try:
+            process = subprocess.Popen(
+                stream.global_args('-hide_banner', '-nostats', '-loglevel', 'error').compile(),
+                stdout=subprocess.PIPE,
+                stderr=log
+            )
+        except Exception:
+            log.close()
+            raise
+        return process, log
+    
+    def _read_log(self, log: IO[bytes]) -> str:
+        """Text of an ffmpeg log written by _start_ffmpeg, read only once the command has failed."""
+        log.seek(0)
+        return log.read().decode(errors='replace')
+    
+    def _acquire_buffer(self, size: int) -> np.ndarray:
+        """Take a free float32 buffer of `size` samples from the pool, allocating one if none is free."""
+        with self._buffer_lock:
+            while self._buffer_pool:
+                buffer = self._buffer_pool.pop()
+                if len(buffer) == size:
+                    return buffer
+        return np.empty(size, np.float32)
+    
+    def _release_buffer(self, audio: np.ndarray):
+        """Return a finished chunk's sample buffer to the pool."""
+        buffer = audio if audio.base is None else audio.base
+        with self._buffer_lock:
+            # Keep enough for the chunks in flight; anything beyond that is left to the GC
+            if isinstance(buffer, np.ndarray) and len(self._buffer_pool) < 2 * self.max_workers * self.batch_size:
+                self._buffer_pool.append(buffer)
+    
+    def plan_chunks(self, file_path: str) -> List[Tuple[int, float, float]]:
+        """
+        Split the file's duration into (index, start, end) chunk spans without extracting.
+        
+        Args:
+            file_path: Path to the source file
             
         Returns:
-            List of chunk information
+            List of chunk spans in seconds
         """
         duration = self.get_file_duration(file_path)
         chunk_count = math.ceil(duration / self.chunk_duration)
-        chunks = []
         
         print(f"📦 Creating {chunk_count} chunks ({self.chunk_duration}s each) from {duration:.1f}s file")
         
-        for i in range(chunk_count):
-            start_time = i * self.chunk_duration
-            end_time = min((i + 1) * self.chunk_duration, duration)
-            chunk_duration = end_time - start_time
-            
-            # Create temporary file for chunk
-            temp_fd, temp_path = tempfile.mkstemp(suffix='.wav')
-            os.close(temp_fd)
-            self.temp_files.append(temp_path)
-            
+        return [
+            (i, i * self.chunk_duration, min((i + 1) * self.chunk_duration, duration))
+            for i in range(chunk_count)
+        ]
+    
+    def _prefetch_chunks(self, chunks: Iterator[ChunkInfo], depth: int = 2) -> Iterator[ChunkInfo]:
+        """
+        Run chunk extraction on a producer thread, at most `depth` chunks ahead of the consumer.
+        
+        ffmpeg extracts the next chunks while earlier ones are being transcribed, and the
+        bounded queue keeps only a few extracted chunks in memory at any time.
+        """
+        chunk_queue: queue.Queue = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+        done = object()
+        
+        def put(item) -> bool:
+            # Poll so an abandoned consumer does not leave the producer blocked forever
+            while not stop.is_set():
+                try:
+                    chunk_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
             try:
-                # Extract chunk using ffmpeg
-                if file_type == 'video':
-                    # Extract audio from video with time range
-                    (
-                        ffmpeg
-                        .input(file_path, ss=start_time, t=chunk_duration)
-                        .output(
-                            temp_path,
-                            acodec='pcm_s16le',
-                            ac=1,  # Mono
-                            ar=16000  # 16kHz
-                        )
-                        .overwrite_output()
-                        .run(capture_stdout=True, capture_stderr=True)
-                    )
-                else:
-                    # Extract chunk from audio file
-                    (
-                        ffmpeg
-                        .input(file_path, ss=start_time, t=chunk_duration)
-                        .output(
-                            temp_path,
-                            acodec='pcm_s16le',
-                            ac=1,  # Mono
-                            ar=16000  # 16kHz
-                        )
-                        .overwrite_output()
-                        .run(capture_stdout=True, capture_stderr=True)
-                    )
-                
-                # Get chunk file size
-                size_bytes = os.path.getsize(temp_path) if os.path.exists(temp_path) else 0
-                
-                chunk_info = ChunkInfo(
-                    index=i,
-                    start_time=start_time,
-                    end_time=end_time,
-                    duration=chunk_duration,
-                    file_path=temp_path,
-                    size_bytes=size_bytes
-                )
-                chunks.append(chunk_info)
-                
-            except ffmpeg.Error as e:
-                error_msg = f"FFmpeg error creating chunk {i}: {e.stderr.decode() if e.stderr else str(e)}"
-                raise RuntimeError(error_msg)
+                for chunk in chunks:
+                    if not put(chunk):
+                        return
+                put(done)
+            except Exception as e:
+                put(e)
         
-        return chunks
+        producer = threading.Thread(target=produce, name="chunk-extractor", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = chunk_queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            producer.join()
     
-    def transcribe_chunks(self, chunks: List[ChunkInfo], model_size: str = "base", 
-                         language: Optional[str] = None) -> List[Dict]:
+    def transcribe_chunks(self, chunks: Iterable[ChunkInfo], model_size: str = "base", 
+                         language: Optional[str] = None, total: Optional[int] = None) -> List[Dict]:
         """
         Transcribe all chunks with progress tracking.
         
         Args:
-            chunks: List of chunk information
+            chunks: Chunk information, as a list or a stream of chunks still being extracted
             model_size: Whisper model size
             language: Language code or None for auto-detection
+            total: Number of chunks, when `chunks` is a stream without a length
             
         Returns:
             List of transcription results with timing information
         """
-        if not self.transcription_engine:
-            self.transcription_engine = TranscriptionEngine(model_size)
+        if total is None:
+            total = len(chunks)
+        if self.with_context:
+            return self._transcribe_in_context(chunks, model_size, language, total)
         
-        results = []
+        results: Dict[int, Dict] = {}
+        order: List[int] = []
         
-        # Use tqdm for progress bar
-        with tqdm(total=len(chunks), desc="🎙️ Transcribing chunks", unit="chunk") as pbar:
+        # Torch releases the GIL during inference, so worker threads run batches in parallel
+        workers = max(1, min(self.max_workers, math.ceil(total / self.batch_size)))
+        with tqdm(total=total, desc="🎙️ Transcribing chunks", unit="chunk") as pbar, \
+                ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: Dict = {}
+            
+            def collect(finished):
+                for future in finished:
+                    batch = pending.pop(future)
+                    for chunk, result in zip(batch, future.result()):
+                        results[chunk.index] = result
+                        self._update_progress(pbar, chunk, total)
+            
+            def submit(batch):
+                # Submit only when a worker is free, so a streaming source stays just
+                # ahead of transcription instead of being drained up front
+                if len(pending) >= workers:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                pending[executor.submit(self._transcribe_batch, batch, model_size, language)] = batch
+            
+            batch: List[ChunkInfo] = []
             for chunk in chunks:
-                # Update progress bar description
-                start_min = int(chunk.start_time // 60)
-                start_sec = int(chunk.start_time % 60)
-                end_min = int(chunk.end_time // 60)
-                end_sec = int(chunk.end_time % 60)
-                
-                pbar.set_description(f"🎙️ Chunk {chunk.index+1}/{len(chunks)} ({start_min:02d}:{start_sec:02d}-{end_min:02d}:{end_sec:02d})")
-                
-                # Transcribe chunk
-                result = self.transcription_engine.transcribe_audio(chunk.file_path, language)
-                
-                if result['success']:
-                    # Adjust timestamps to global time
-                    if result['segments']:
-                        for segment in result['segments']:
-                            segment['start'] += chunk.start_time
-                            segment['end'] += chunk.start_time
-                    
-                    # Add chunk metadata
-                    result['chunk_info'] = {
-                        'index': chunk.index,
-                        'start_time': chunk.start_time,
-                        'end_time': chunk.end_time,
-                        'file_size_mb': chunk.size_bytes / (1024 * 1024)
-                    }
-                
-                results.append(result)
-                pbar.update(1)
-                
-                # Clean up chunk file immediately to save space
-                try:
-                    if os.path.exists(chunk.file_path):
-                        os.remove(chunk.file_path)
-                        self.temp_files.remove(chunk.file_path)
-                except Exception as e:
-                    print(f"Warning: Could not remove chunk file: {e}")
+                order.append(chunk.index)
+                batch.append(chunk)
+                if len(batch) >= self.batch_size:
+                    submit(batch)
+                    batch = []
+            if batch:
+                submit(batch)
+            collect(as_completed(list(pending)))
         
+        # Reassemble in input order regardless of completion order
+        return [results[index] for index in order]
+    
+    def _transcribe_in_context(self, chunks: Iterable[ChunkInfo], model_size: str,
+                               language: Optional[str], total: int) -> List[Dict]:
+        """Transcribe chunks in order, prompting each with the tail of the previous chunk's text."""
+        # Each prompt depends on the previous result, so chunks cannot run concurrently
+        results = []
+        prompt = None
+        with tqdm(total=total, desc="🎙️ Transcribing chunks", unit="chunk") as pbar:
+            for chunk in chunks:
+                result = self._transcribe_batch([chunk], model_size, language, prompt)[0]
+                results.append(result)
+                if result['success'] and result['text']:
+                    prompt = ' '.join(result['text'].split()[-self.CONTEXT_PROMPT_WORDS:])
+                self._update_progress(pbar, chunk, total)
         return results
     
+    def _update_progress(self, pbar: tqdm, chunk: ChunkInfo, total: int):
+        """Advance the progress bar past a finished chunk."""
+        start_min = int(chunk.start_time // 60)
+        start_sec = int(chunk.start_time % 60)
+        end_min = int(chunk.end_time // 60)
+        end_sec = int(chunk.end_time % 60)
+        
+        pbar.set_description(f"🎙️ Chunk {chunk.index+1}/{total} ({start_min:02d}:{start_sec:02d}-{end_min:02d}:{end_sec:02d})")
+        pbar.update(1)
+    
+    def _acquire_engine(self, model_size: str) -> TranscriptionEngine:
+        """Take an idle engine, creating one on the next unused device or waiting for a release."""
+        with self._engine_released:
+            if self.transcription_engine is not None and self.transcription_engine.model_size != model_size:
+                # A different model was requested: drop the pooled engines of the old one
+                self.transcription_engine = None
+                self._idle_engines.clear()
+                self._engine_count = 0
+            while not self._idle_engines and self._engine_count >= len(self.devices):
+                self._engine_released.wait()
+            if self._idle_engines:
+                return self._idle_engines.pop()
+            count = self._engine_count
+            self._engine_count += 1
+        
+        # Process-wide engines, so the loaded models survive this processor
+        engine = get_engine(model_size, device=self.devices[count], whisper_config=self.whisper_config)
+        if count == 0:
+            self.transcription_engine = engine
+        return engine
+    
+    def _release_engine(self, engine: TranscriptionEngine):
+        """Return an engine to the pool so later chunks reuse its loaded model."""
+        with self._engine_released:
+            # Engines of a model the pool has since switched away from are dropped
+            if self.transcription_engine is None or engine.model_size == self.transcription_engine.model_size:
+                self._idle_engines.append(engine)
+            self._engine_released.notify()
+    
+    def _transcribe_batch(self, batch: List[ChunkInfo], model_size: str,
+                          language: Optional[str], initial_prompt: Optional[str] = None) -> List[Dict]:
+        """Transcribe a group of chunks on one engine, in a single batched pass when possible."""
+        engine = self._acquire_engine(model_size)
+        try:
+            # Batched decoding covers one 30 second window per chunk and needs samples in memory
+            if len(batch) > 1 and initial_prompt is None and all(chunk.duration <= self.WHISPER_WINDOW
+                                                                 for chunk in batch):
+                results = engine.transcribe_batch([chunk.audio for chunk in batch], language)
+            else:
+                results = [engine.transcribe_audio(chunk.audio, language, initial_prompt) for chunk in batch]
+        finally:
+            self._release_engine(engine)
+        
+        return [self._finish_chunk(chunk, result) for chunk, result in zip(batch, results)]
+    
+    def _finish_chunk(self, chunk: ChunkInfo, result: Dict) -> Dict:
+        """Shift a chunk's result to global time and release the chunk's audio."""
+        # Recycle the samples as soon as the chunk is done
+        if chunk.audio is not None:
+            self._release_buffer(chunk.audio)
+            chunk.audio = None
+        
+        if result['success']:
+            # Adjust timestamps to global time; a chunk starting at zero is already there
+            offset = chunk.start_time
+            if offset and result['segments']:
+                for segment in result['segments']:
+                    segment['start'] += offset
+                    segment['end'] += offset
+            
+            # Add chunk metadata
+            result['chunk_info'] = {
+                'index': chunk.index,
+                'start_time': chunk.start_time,
+                'end_time': chunk.end_time,
+                'file_size_mb': chunk.size_bytes / (1024 * 1024)
+            }
+        
+        return result
+    
     def merge_results(self, chunk_results: List[Dict]) -> Dict:
         """
         Merge chunk transcription results into a single result.
@@ -256,29 +513,41 @@ class ChunkedProcessor:
         if not chunk_results:
             return {'success': False, 'error': 'No chunks to merge', 'text': ''}
         
-        # Filter successful results
-        successful_results = [r for r in chunk_results if r['success']]
-        
-        if not successful_results:
-            return {'success': False, 'error': 'No successful chunk transcriptions', 'text': ''}
-        
-        # Merge text
-        merged_text = ' '.join(r['text'].strip() for r in successful_results if r['text'])
+        self._trim_overlaps(chunk_results)
         
-        # Merge segments
+        # Merge text, segments and statistics of successful chunks in a single pass
+        text_parts = []
         all_segments = []
-        for result in successful_results:
+        languages = []
+        total_processing_time = 0
+        confidence_sum = 0
+        total_words = 0
+        successful_chunks = 0
+        for result in chunk_results:
+            if not result['success']:
+                continue
+            successful_chunks += 1
+            
+            if result['text']:
+                text_parts.append(result['text'].strip())
             if result.get('segments'):
                 all_segments.extend(result['segments'])
+            
+            total_processing_time += result.get('processing_time', 0)
+            confidence_sum += result.get('confidence', 0)
+            total_words += result.get('word_count', 0)
+            languages.append(result.get('language', 'unknown'))
+        
+        if not successful_chunks:
+            return {'success': False, 'error': 'No successful chunk transcriptions', 'text': ''}
         
-        # Calculate overall statistics
-        total_processing_time = sum(r.get('processing_time', 0) for r in successful_results)
-        avg_confidence = sum(r.get('confidence', 0) for r in successful_results) / len(successful_results)
-        total_words = sum(r.get('word_count', 0) for r in successful_results)
+        # text_parts only references the chunk texts (strip() returns them unchanged), and
+        # join sizes the merged string once; a StringIO buffer would grow and copy again
+        merged_text = ' '.join(text_parts)
+        avg_confidence = confidence_sum / successful_chunks
         
         # Detect most common language
-        languages = [r.get('language', 'unknown') for r in successful_results]
-        most_common_language = max(set(languages), key=languages.count) if languages else 'unknown'
+        most_common_language = Counter(languages).most_common(1)[0][0] if languages else 'unknown'
         
         return {
             'success': True,
@@ -290,10 +559,44 @@ class ChunkedProcessor:
             'word_count': total_words,
             'segment_count': len(all_segments),
             'chunk_count': len(chunk_results),
-            'successful_chunks': len(successful_results),
-            'failed_chunks': len(chunk_results) - len(successful_results)
+            'successful_chunks': successful_chunks,
+            'failed_chunks': len(chunk_results) - successful_chunks
         }
     
+    def _trim_overlaps(self, chunk_results: List[Dict]):
+        """Split audio shared by consecutive chunks at its midpoint so no segment is kept twice."""
+        previous = None
+        for result in chunk_results:
+            if not result['success'] or 'chunk_info' not in result:
+                continue
+            if previous is not None and result['chunk_info']['start_time'] < previous['chunk_info']['end_time']:
+                # Each segment goes to the side of the cut holding its midpoint, so a segment
+                # that starts in the overlap but runs past the boundary is kept whole
+                cut = (result['chunk_info']['start_time'] + previous['chunk_info']['end_time']) / 2
+                self._keep_segments(previous, lambda segment: segment['start'] + segment['end'] < 2 * cut)
+                # The next chunk clips speech already under way at its start, which can move the
+                # clipped copy's midpoint past the cut; drop it when it mostly repeats a kept segment
+                kept = [segment for segment in previous['segments']
+                        if segment['end'] > result['chunk_info']['start_time']]
+                self._keep_segments(result, lambda segment: (
+                    segment['start'] + segment['end'] >= 2 * cut
+                    and not any(self._overlap(segment, other) > (segment['end'] - segment['start']) / 2
+                                for other in kept)
+                ))
+            previous = result
+    
+    def _overlap(self, segment: Dict, other: Dict) -> float:
+        """Seconds two segments have in common."""
+        return min(segment['end'], other['end']) - max(segment['start'], other['start'])
+    
+    def _keep_segments(self, result: Dict, keep):
+        """Drop a chunk result's segments that fail `keep`, rebuilding its text from the rest."""
+        segments = [segment for segment in result.get('segments') or [] if keep(segment)]
+        result['segments'] = segments
+        result['text'] = ''.join(segment['text'] for segment in segments).strip()
+        result['word_count'] = len(result['text'].split())
+        result['segment_count'] = len(segments)
+    
     def process_large_file(self, file_path: str, file_type: str, model_size: str = "base",
                           language: Optional[str] = None) -> Dict:
         """
@@ -311,17 +614,22 @@ class ChunkedProcessor:
         try:
             print(f"🔄 Processing large file with chunking strategy")
             
-            # Create chunks
-            chunks = self.create_audio_chunks(file_path, file_type)
-            print(f"✅ Created {len(chunks)} chunks")
+            # Extract chunks on a producer thread while earlier chunks are transcribed
+            spans = self.plan_chunks(file_path)
+            chunks = self._prefetch_chunks(
+                self.iter_audio_chunks(file_path, file_type, spans)
+            )
+            
+            # Transcribe chunks
+            chunk_results = self.transcribe_chunks(chunks, model_size, language, total=len(spans))
+            print(f"✅ Created {len(chunk_results)} chunks")
             
             # Calculate total audio size
-            total_size_mb = sum(chunk.size_bytes for chunk in chunks) / (1024 * 1024)
+            total_size_mb = sum(
+                r['chunk_info']['file_size_mb'] for r in chunk_results if 'chunk_info' in r
+            )
             print(f"📊 Total audio size: {total_size_mb:.1f} MB")
             
-            # Transcribe chunks
-            chunk_results = self.transcribe_chunks(chunks, model_size, language)
-            
             # Merge results
             final_result = self.merge_results(chunk_results)
             
@@ -340,7 +648,4 @@ class ChunkedProcessor:
                 'text': '',
                 'segments': [],
                 'chunk_count': 0
-            }
-        finally:
-            # Cleanup any remaining temp files
-            self.cleanup()
\ No newline at end of file
+            }
\ No newline at end of file
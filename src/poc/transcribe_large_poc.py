@@ -16,7 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from poc.file_handler import FileHandler
 from poc.audio_processor import AudioProcessor
-from poc.transcription_engine import TranscriptionEngine
+from poc.transcription_engine import TranscriptionEngine, get_engine
 from poc.chunked_processor import ChunkedProcessor
 
 
@@ -112,6 +112,12 @@ Examples:
         help='Chunk duration in seconds for large files (default: 30)'
     )
     
+    parser.add_argument(
+        '--with-context',
+        action='store_true',
+        help='Overlap chunks and prompt each chunk with the previous chunk\'s text'
+    )
+    
     args = parser.parse_args()
     
     print_separator()
@@ -134,7 +140,8 @@ Examples:
     print()
     
     # Step 2: Determine processing strategy
-    chunked_processor = ChunkedProcessor(chunk_duration=args.chunk_duration)
+    chunked_processor = ChunkedProcessor(chunk_duration=args.chunk_duration,
+                                         with_context=args.with_context)
     use_chunking = args.force_chunking or chunked_processor.should_use_chunking(
         args.file_path, file_info['format_type']
     )
@@ -164,8 +171,6 @@ Examples:
         except Exception as e:
             print(f"❌ Chunked processing failed: {str(e)}")
             return 1
-        finally:
-            chunked_processor.cleanup()
     
     else:
         print("2️⃣  Standard processing (small file)...")
@@ -195,7 +200,7 @@ Examples:
             
             # Step 3: Transcribe
             print("3️⃣  Transcribing audio...")
-            engine = TranscriptionEngine(model_size=args.model)
+            engine = get_engine(args.model)
             
             # Show model info
             model_info = engine.get_model_info()
@@ -6,9 +6,17 @@ Handles speech-to-text conversion with basic confidence tracking.
 import whisper
 import time
 import os
-from typing import Dict, Optional, Tuple
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
 import torch
 
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
 
 class TranscriptionEngine:
     """Handles speech-to-text transcription using Whisper."""
@@ -34,18 +42,29 @@ class TranscriptionEngine:
         cls._model_error = None
         cls._current_model_size = None
 
-    def __init__(self, model_size: str = "base", whisper_config: Optional[Dict] = None):
+    def __init__(self, model_size: str = "base", whisper_config: Optional[Dict] = None,
+                 device: Optional[str] = None):
         """
         Initialize transcription engine.
         
         Args:
             model_size: Whisper model size ('tiny', 'base', 'small', 'medium', 'large')
             whisper_config: Optional Whisper-specific configuration
+            device: Torch device to run on (default: CUDA when available, else CPU)
         """
         self.model_size = model_size
         self.model = None
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.device = device or _default_device()
         self.whisper_config = whisper_config or {}
+        # Engines are shared through get_engine, and a model decodes one input at a time
+        self._lock = threading.RLock()
+        
+        # 'openai' runs the reference PyTorch model, 'faster_whisper' the CTranslate2 port with INT8 weights
+        self.backend = self.whisper_config.get('backend') or 'openai'
+        if self.backend == 'faster_whisper' and not FASTER_WHISPER_AVAILABLE:
+            print("Warning: faster-whisper not available, using openai-whisper. "
+                  "Install with: pip install faster-whisper")
+            self.backend = 'openai'
         
         # Set Whisper environment variables if configured
         self._configure_whisper_environment()
@@ -76,106 +95,280 @@ class TranscriptionEngine:
         Returns:
             Tuple of (success, message)
         """
-        TranscriptionEngine._model_status = 'loading'
-        TranscriptionEngine._current_model_size = self.model_size
-        TranscriptionEngine._model_error = None
+        with self._lock:
+            if self.model is not None:
+                return True, "Model already loaded"
 
-        try:
-            print(f"Loading Whisper model '{self.model_size}' on {self.device}...")
-            start_time = time.time()
+            TranscriptionEngine._model_status = 'loading'
+            TranscriptionEngine._current_model_size = self.model_size
+            TranscriptionEngine._model_error = None
 
-            self.model = whisper.load_model(self.model_size, device=self.device)
+            try:
+                start_time = time.time()
 
-            load_time = time.time() - start_time
-            TranscriptionEngine._model_status = 'ready'
-            return True, f"Model loaded successfully in {load_time:.2f} seconds"
+                if self.backend == 'faster_whisper':
+                    compute_type = _auto_compute_type(self.device)
+                    print(f"Loading faster-whisper model '{self.model_size}' on {self.device} ({compute_type})...")
+                    device_type, _, index = self.device.partition(':')
+                    self.model = WhisperModel(
+                        self.model_size,
+                        device=device_type,
+                        device_index=int(index or 0),
+                        compute_type=compute_type,
+                        download_root=self.whisper_config.get('download_root')
+                    )
+                else:
+                    print(f"Loading Whisper model '{self.model_size}' on {self.device}...")
+                    self.model = whisper.load_model(self.model_size, device=self.device)
 
-        except Exception as e:
-            TranscriptionEngine._model_status = 'error'
-            TranscriptionEngine._model_error = str(e)
-            return False, f"Failed to load model: {str(e)}"
+                load_time = time.time() - start_time
+                TranscriptionEngine._model_status = 'ready'
+                return True, f"Model loaded successfully in {load_time:.2f} seconds"
+
+            except Exception as e:
+                TranscriptionEngine._model_status = 'error'
+                TranscriptionEngine._model_error = str(e)
+                return False, f"Failed to load model: {str(e)}"
     
-    def transcribe_audio(self, audio_path: str, language: Optional[str] = None,
+    def transcribe_audio(self, audio_path: Union[str, np.ndarray], language: Optional[str] = None,
                          initial_prompt: Optional[str] = None) -> Dict:
         """
         Transcribe audio file to text.
 
         Args:
-            audio_path: Path to the audio file
+            audio_path: Path to the audio file, or 16kHz mono float32 samples already in memory
             language: Language code (e.g., 'en', 'es') or None for auto-detection
             initial_prompt: Optional prompt to condition the model with custom vocabulary
 
         Returns:
             Dictionary with transcription results
         """
-        if self.model is None:
-            success, message = self.load_model()
-            if not success:
+        with self._lock:
+            if self.model is None:
+                success, message = self.load_model()
+                if not success:
+                    return {
+                        'success': False,
+                        'error': message,
+                        'text': None,
+                        'segments': None,
+                        'language': None,
+                        'processing_time': 0
+                    }
+
+            try:
+                if isinstance(audio_path, np.ndarray):
+                    print(f"Transcribing audio: {len(audio_path) / whisper.audio.SAMPLE_RATE:.1f}s in memory")
+                else:
+                    print(f"Transcribing audio: {audio_path}")
+                if initial_prompt:
+                    print(f"Using custom vocabulary prompt")
+                start_time = time.time()
+
+                if self.backend == 'faster_whisper':
+                    return self._transcribe_faster(audio_path, language, initial_prompt, start_time)
+
+                # Build transcribe options
+                transcribe_options = {
+                    'language': language,
+                    'verbose': False,  # Reduce console output
+                    'word_timestamps': True,  # Enable word-level timestamps
+                }
+
+                # Add initial prompt if provided (for custom vocabulary)
+                if initial_prompt:
+                    transcribe_options['initial_prompt'] = initial_prompt
+
+                # Transcribe with Whisper
+                result = self.model.transcribe(audio_path, **transcribe_options)
+                
+                processing_time = time.time() - start_time
+                
+                # Extract text and segments
+                text = result.get('text', '').strip()
+                segments = result.get('segments', [])
+                detected_language = result.get('language', 'unknown')
+                
+                return self._build_result(text, segments, detected_language, processing_time)
+                
+            except Exception as e:
                 return {
                     'success': False,
-                    'error': message,
+                    'error': f"Transcription failed: {str(e)}",
                     'text': None,
                     'segments': None,
                     'language': None,
                     'processing_time': 0
                 }
-
-        try:
-            print(f"Transcribing audio: {audio_path}")
-            if initial_prompt:
-                print(f"Using custom vocabulary prompt")
-            start_time = time.time()
-
-            # Build transcribe options
-            transcribe_options = {
-                'language': language,
-                'verbose': False,  # Reduce console output
-                'word_timestamps': True,  # Enable word-level timestamps
+    
+    def _transcribe_faster(self, audio: Union[str, np.ndarray], language: Optional[str],
+                           initial_prompt: Optional[str], start_time: float) -> Dict:
+        """Transcribe with faster-whisper, returning segments in openai-whisper's dictionary shape."""
+        segment_iter, info = self.model.transcribe(
+            audio,
+            language=language,
+            initial_prompt=initial_prompt,
+            word_timestamps=True,
+            vad_filter=True  # Skip silence instead of decoding it
+        )
+        
+        # Segments are decoded lazily as the generator is consumed
+        segments = [
+            {
+                'id': segment.id,
+                'seek': segment.seek,
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'tokens': segment.tokens,
+                'temperature': segment.temperature,
+                'avg_logprob': segment.avg_logprob,
+                'compression_ratio': segment.compression_ratio,
+                'no_speech_prob': segment.no_speech_prob,
+                'words': [
+                    {'word': word.word, 'start': word.start, 'end': word.end,
+                     'probability': word.probability}
+                    for word in segment.words or []
+                ]
             }
-
-            # Add initial prompt if provided (for custom vocabulary)
-            if initial_prompt:
-                transcribe_options['initial_prompt'] = initial_prompt
-
-            # Transcribe with Whisper
-            result = self.model.transcribe(audio_path, **transcribe_options)
-            
-            processing_time = time.time() - start_time
-            
-            # Extract text and segments
-            text = result.get('text', '').strip()
-            segments = result.get('segments', [])
-            detected_language = result.get('language', 'unknown')
+            for segment in segment_iter
+        ]
+        text = ''.join(segment['text'] for segment in segments).strip()
+        
+        return self._build_result(text, segments, info.language, time.time() - start_time)
+    
+    def transcribe_batch(self, audios: List[np.ndarray], language: Optional[str] = None) -> List[Dict]:
+        """
+        Transcribe several clips of up to 30 seconds in one batched forward pass.
+        
+        The encoder and decoder run once for the whole batch instead of once per clip.
+        Each clip is decoded as a single window, without temperature fallback or
+        word-level timestamps. The faster-whisper backend transcribes the clips in turn.
+        
+        Args:
+            audios: 16kHz mono float32 clips, each at most 30 seconds long
+            language: Language code (e.g., 'en', 'es') or None for auto-detection
             
-            # Calculate basic confidence score (average of segment probabilities)
-            avg_confidence = 0.0
-            if segments:
-                confidences = [seg.get('avg_logprob', 0) for seg in segments]
-                # Convert log probabilities to more readable confidence scores
-                avg_confidence = sum(confidences) / len(confidences)
-                # Normalize to 0-1 range (rough approximation)
-                avg_confidence = max(0, min(1, (avg_confidence + 1) / 1))
+        Returns:
+            One transcription result dictionary per clip
+        """
+        with self._lock:
+            if self.model is None:
+                success, message = self.load_model()
+                if not success:
+                    return [{
+                        'success': False,
+                        'error': message,
+                        'text': None,
+                        'segments': None,
+                        'language': None,
+                        'processing_time': 0
+                    } for _ in audios]
             
-            return {
-                'success': True,
-                'text': text,
-                'segments': segments,
-                'language': detected_language,
-                'confidence': round(avg_confidence, 3),
-                'processing_time': round(processing_time, 2),
-                'word_count': len(text.split()) if text else 0,
-                'segment_count': len(segments)
-            }
+            if self.backend == 'faster_whisper':
+                return [self.transcribe_audio(audio, language) for audio in audios]
             
-        except Exception as e:
-            return {
-                'success': False,
-                'error': f"Transcription failed: {str(e)}",
-                'text': None,
-                'segments': None,
-                'language': None,
-                'processing_time': 0
-            }
+            try:
+                print(f"Transcribing batch of {len(audios)} clips")
+                start_time = time.time()
+                
+                # One (batch, n_mels, 3000) tensor: every clip padded to the 30 second window
+                mels = torch.stack([
+                    whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), self.model.dims.n_mels,
+                                                device=self.model.device)
+                    for audio in audios
+                ])
+                options = whisper.DecodingOptions(language=language, fp16=self.device.startswith('cuda'))
+                decoded = self.model.decode(mels, options)
+                
+                # Batch time is shared evenly between its clips
+                processing_time = (time.time() - start_time) / len(audios)
+                tokenizer = whisper.tokenizer.get_tokenizer(
+                    self.model.is_multilingual, num_languages=self.model.num_languages
+                )
+                
+                results = []
+                for audio, decoding in zip(audios, decoded):
+                    duration = len(audio) / whisper.audio.SAMPLE_RATE
+                    # Same silence test as whisper.transcribe: likely no speech and low confidence
+                    if decoding.no_speech_prob > 0.6 and decoding.avg_logprob < -1.0:
+                        segments = []
+                    else:
+                        segments = self._split_segments(decoding, tokenizer, duration)
+                    text = ''.join(segment['text'] for segment in segments).strip()
+                    results.append(self._build_result(text, segments, decoding.language, processing_time))
+                return results
+                
+            except Exception as e:
+                return [{
+                    'success': False,
+                    'error': f"Transcription failed: {str(e)}",
+                    'text': None,
+                    'segments': None,
+                    'language': None,
+                    'processing_time': 0
+                } for _ in audios]
+    
+    def _split_segments(self, decoding, tokenizer, duration: float) -> List[Dict]:
+        """Split one decoded window into segments at its timestamp tokens."""
+        timestamp_begin = tokenizer.timestamp_begin
+        time_precision = whisper.audio.HOP_LENGTH * 2 / whisper.audio.SAMPLE_RATE
+        segments = []
+        start, text_tokens = 0.0, []
+        
+        def close(end: float):
+            segments.append({
+                'id': len(segments),
+                'seek': 0,
+                'start': start,
+                'end': end,
+                'text': tokenizer.decode(text_tokens),
+                'tokens': text_tokens,
+                'temperature': decoding.temperature,
+                'avg_logprob': decoding.avg_logprob,
+                'compression_ratio': decoding.compression_ratio,
+                'no_speech_prob': decoding.no_speech_prob
+            })
+        
+        # Timestamp tokens bracket each segment's text: <|start|> text <|end|><|start|> ...
+        for token in decoding.tokens:
+            if token >= timestamp_begin:
+                position = (token - timestamp_begin) * time_precision
+                if text_tokens:
+                    close(position)
+                    text_tokens = []
+                start = position
+            elif token < tokenizer.eot:
+                text_tokens.append(token)
+        
+        # Text after the last timestamp runs to the end of the clip
+        if text_tokens:
+            close(max(start, duration))
+        
+        return segments
+    
+    def _build_result(self, text: str, segments: List[Dict], language: str,
+                      processing_time: float) -> Dict:
+        """Assemble the transcription result dictionary shared by single and batched runs."""
+        # Calculate basic confidence score (average of segment probabilities)
+        avg_confidence = 0.0
+        if segments:
+            confidences = [seg.get('avg_logprob', 0) for seg in segments]
+            # Convert log probabilities to more readable confidence scores
+            avg_confidence = sum(confidences) / len(confidences)
+            # Normalize to 0-1 range (rough approximation)
+            avg_confidence = max(0, min(1, (avg_confidence + 1) / 1))
+        
+        return {
+            'success': True,
+            'text': text,
+            'segments': segments,
+            'language': language,
+            'confidence': round(avg_confidence, 3),
+            'processing_time': round(processing_time, 2),
+            'word_count': len(text.split()) if text else 0,
+            'segment_count': len(segments)
+        }
     
     def format_transcript(self, result: Dict, include_timestamps: bool = False) -> str:
         """
@@ -228,8 +421,60 @@ class TranscriptionEngine:
         """
         return {
             'model_size': self.model_size,
+            'backend': self.backend,
             'device': self.device,
             'loaded': self.model is not None,
             'gpu_available': torch.cuda.is_available(),
             'gpu_device': torch.cuda.get_device_name(0) if torch.cuda.is_available() else None
-        }
\ No newline at end of file
+        }
+
+
+def _default_device() -> str:
+    """CUDA when available, else CPU."""
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def _auto_compute_type(device: str) -> str:
+    """INT8 weights with FP16 activations on GPUs with INT8 tensor cores (compute 7.5+), else INT8."""
+    if device.startswith('cuda') and torch.cuda.get_device_capability(device) >= (7, 5):
+        return "int8_float16"
+    return "int8"
+
+
+def available_devices() -> List[str]:
+    """One device per visible GPU when there are several, else just the default device."""
+    if torch.cuda.is_available() and torch.cuda.device_count() > 1:
+        return [f"cuda:{i}" for i in range(torch.cuda.device_count())]
+    return [_default_device()]
+
+
+# Engines shared across callers in this process, keyed by (model_size, device, whisper_config items)
+_ENGINE_CACHE: Dict[Tuple[str, str, Tuple[Tuple[str, Any], ...]], TranscriptionEngine] = {}
+_ENGINE_CACHE_LOCK = threading.Lock()
+
+
+def get_engine(model_size: str = "base", device: Optional[str] = None,
+               whisper_config: Optional[Dict] = None) -> TranscriptionEngine:
+    """
+    Get the process-wide engine for a model size, device and configuration, creating it on first use.
+    
+    The model stays loaded between calls, so processing several files in one process
+    loads its weights once. Calls on one engine are serialized, since a Whisper model
+    decodes one input at a time; use engines on other devices to transcribe in parallel.
+    
+    Args:
+        model_size: Whisper model size ('tiny', 'base', 'small', 'medium', 'large')
+        device: Torch device to run on (default: CUDA when available, else CPU)
+        whisper_config: Whisper-specific configuration, including the backend
+        
+    Returns:
+        Shared transcription engine
+    """
+    device = device or _default_device()
+    # Configuration is applied when an engine is created, so a different one needs its own engine
+    key = (model_size, device, tuple(sorted((whisper_config or {}).items())))
+    with _ENGINE_CACHE_LOCK:
+        engine = _ENGINE_CACHE.get(key)
+        if engine is None:
+            engine = _ENGINE_CACHE[key] = TranscriptionEngine(model_size, whisper_config, device=device)
+        return engine
@@ -34,6 +34,12 @@ class HistoryManager:
     _instance = None
     _lock = threading.Lock()
 
+    # Summary columns plus a truncated transcript; the preview length is the first parameter
+    _PREVIEW_COLUMNS = """h.id, h.created_at, h.audio_filename, h.duration_seconds,
+                       h.language, h.model, h.word_count, h.confidence, h.speaker_count,
+                       SUBSTR(h.transcript_text, 1, ?) AS preview_text,
+                       LENGTH(h.transcript_text) AS text_length"""
+
     def __new__(cls):
         if cls._instance is None:
             with cls._lock:
@@ -279,6 +285,44 @@ class HistoryManager:
         finally:
             conn.close()
 
+    def get_history_preview(self, limit: int = 50, offset: int = 0,
+                            preview_len: int = 200) -> List[Dict[str, Any]]:
+        """Get recent entries with only a text preview; the full transcript never leaves SQLite."""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {self._PREVIEW_COLUMNS}
+                FROM transcription_history h
+                ORDER BY h.created_at DESC
+                LIMIT ? OFFSET ?
+            """, (preview_len, limit, offset))
+
+            rows = cursor.fetchall()
+            return [self._row_to_preview_dict(row, preview_len) for row in rows]
+        finally:
+            conn.close()
+
+    def search_history_preview(self, query: str, limit: int = 50,
+                               preview_len: int = 200) -> List[Dict[str, Any]]:
+        """Full-text search returning only a text preview per match."""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {self._PREVIEW_COLUMNS}
+                FROM transcription_history h
+                JOIN transcription_fts fts ON h.id = fts.rowid
+                WHERE transcription_fts MATCH ?
+                ORDER BY h.created_at DESC
+                LIMIT ?
+            """, (preview_len, query, limit))
+
+            rows = cursor.fetchall()
+            return [self._row_to_preview_dict(row, preview_len) for row in rows]
+        finally:
+            conn.close()
+
     def get_entry(self, entry_id: int) -> Optional[Dict[str, Any]]:
         """Get a single history entry by ID."""
         conn = self._get_connection()
@@ -366,3 +410,18 @@ class HistoryManager:
             # Add preview (first 200 chars)
             "preview": (row["transcript_text"] or "")[:200] + ("..." if len(row["transcript_text"] or "") > 200 else ""),
         }
+
+    def _row_to_preview_dict(self, row: sqlite3.Row, preview_len: int) -> Dict[str, Any]:
+        """Convert a preview row to a dictionary (no transcript_text)."""
+        return {
+            "id": row["id"],
+            "created_at": row["created_at"],
+            "audio_filename": row["audio_filename"],
+            "duration_seconds": row["duration_seconds"],
+            "language": row["language"],
+            "model": row["model"],
+            "word_count": row["word_count"],
+            "confidence": row["confidence"],
+            "speaker_count": row["speaker_count"],
+            "preview": (row["preview_text"] or "") + ("..." if (row["text_length"] or 0) > preview_len else ""),
+        }
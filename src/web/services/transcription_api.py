@@ -261,4 +261,4 @@ class TranscriptionAPI:
 
     def get_output_formats(self) -> list:
         """Get supported output formats."""
-        return ["txt", "json", "srt", "vtt"]
+        return ["txt", "json", "srt", "vtt", "msgpack"]
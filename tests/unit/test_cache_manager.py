@@ -0,0 +1,130 @@
+"""
+Unit tests for the SQLite-backed cache manager.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from enhancement.performance_optimizations import CacheManager, FileSignature
+
+
+def _audio_file(tmp_path, name, size=1024):
+    path = tmp_path / name
+    path.write_bytes(os.urandom(size))
+    return FileSignature.from_path(str(path))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    manager = CacheManager(cache_dir=str(tmp_path / "cache"))
+    # Store payloads as-is so entry sizes are predictable
+    manager._compressor = None
+    yield manager
+    manager._db.close()
+
+
+def test_eviction_removes_oldest_entries_first(tmp_path, cache):
+    """Once the size limit is exceeded, the least recently written entries go first."""
+    files = [_audio_file(tmp_path, f"audio_{i}.wav") for i in range(4)]
+    cache.max_cache_size = 25_000  # Room for two of the ~10 KB results below
+    
+    for sig in files:
+        cache.set_transcription_cache(sig, "base", result={'blob': os.urandom(10_000)})
+        time.sleep(0.001)
+    
+    cached = [cache.get_transcription_cache(sig, "base") is not None for sig in files]
+    assert cached == [False, False, True, True]
+    assert cache.get_cache_stats()['total_files'] == 2
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_numpy_payload_round_trip(tmp_path, cache, compressed):
+    """Arrays stored out-of-band come back equal, writable and readable by a new manager."""
+    if compressed:
+        zstandard = pytest.importorskip("zstandard")
+        cache._compressor = zstandard.ZstdCompressor(level=3)
+    sig = _audio_file(tmp_path, "audio.wav")
+    samples = np.linspace(-1, 1, 16000, dtype=np.float32)
+    
+    cache.set_transcription_cache(sig, "base", "en", "settings", {'text': 'hello', 'samples': samples})
+    
+    reopened = CacheManager(cache_dir=str(cache.cache_dir))
+    result = reopened.get_transcription_cache(sig, "base", "en", "settings")
+    reopened._db.close()
+    assert result['text'] == 'hello'
+    assert result['samples'].dtype == np.float32
+    np.testing.assert_array_equal(result['samples'], samples)
+    assert result['samples'].flags.writeable
+
+
+def test_legacy_pickle_files_are_purged(tmp_path):
+    """Per-file entries from the old layout are removed; unrelated files are left alone."""
+    cache_dir = tmp_path / "cache"
+    legacy = cache_dir / "transcriptions"
+    legacy.mkdir(parents=True)
+    (legacy / "transcription_0123.pkl").write_bytes(b"old")
+    kept = cache_dir / "audio_processing"
+    kept.mkdir()
+    (kept / "notes.txt").write_text("keep me")
+    
+    CacheManager(cache_dir=str(cache_dir))._db.close()
+    
+    assert not legacy.exists()
+    assert (kept / "notes.txt").exists()
+
+
+def test_stale_claim_is_taken_over(tmp_path, cache):
+    """A claim left behind by a dead worker is taken over once it is older than the stale limit."""
+    sig = _audio_file(tmp_path, "audio.wav")
+    
+    claim = cache.claim_transcription(sig, "base")
+    assert claim
+    assert cache.claim_transcription(sig, "base") is None
+    
+    stale = time.time() - cache.CLAIM_STALE_SECONDS - 1
+    os.utime(claim, (stale, stale))
+    takeover = cache.claim_transcription(sig, "base")
+    assert takeover == claim
+    
+    cache.release_claim(takeover)
+    assert not os.path.exists(claim)
+
+
+@pytest.mark.parametrize("content_keying", [False, True])
+def test_retouched_file_hits_only_with_content_keying(tmp_path, content_keying):
+    """Files are hashed only when content keying is enabled; only then does a re-touch still hit."""
+    manager = CacheManager(cache_dir=str(tmp_path / "cache"), content_keying=content_keying)
+    sig = _audio_file(tmp_path, "audio.wav")
+    manager.set_transcription_cache(sig, "base", result={'text': 'hello'})
+    
+    os.utime(sig.path, (sig.mtime + 10, sig.mtime + 10))
+    retouched = FileSignature.from_path(sig.path)
+    hit = manager.get_transcription_cache(retouched, "base")
+    manifest_rows = manager._db.execute("SELECT COUNT(*) FROM manifest").fetchone()[0]
+    manager._db.close()
+    
+    assert (hit is not None) == content_keying
+    assert (manifest_rows > 0) == content_keying
+
+
+def test_claim_of_dead_worker_is_taken_over(tmp_path, cache):
+    """A claim whose recorded process has exited neither blocks waiters nor new claims."""
+    sig = _audio_file(tmp_path, "audio.wav")
+    claim = cache.claim_transcription(sig, "base")
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    Path(claim).write_text(str(dead.pid))
+    
+    started = time.monotonic()
+    assert cache.wait_for_transcription(sig, "base") is None
+    assert time.monotonic() - started < cache.CLAIM_POLL_INTERVAL
+    assert cache.claim_transcription(sig, "base") == claim
+    cache.release_claim(claim)
@@ -0,0 +1,93 @@
+"""
+Unit tests for merging overlapping chunk results.
+"""
+
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+# The processor module imports these at load time, but merging never touches them
+_STUB_ATTRS = {
+    'ffmpeg': {},
+    'whisper': {},
+    'torch': {'cuda': types.SimpleNamespace(is_available=lambda: False)},
+    'tqdm': {'tqdm': None},
+}
+for name, attrs in _STUB_ATTRS.items():
+    if importlib.util.find_spec(name) is None:
+        stub = types.ModuleType(name)
+        stub.__dict__.update(attrs)
+        sys.modules.setdefault(name, stub)
+
+from poc.chunked_processor import ChunkedProcessor
+
+
+def _result(index, start_time, end_time, segments):
+    text = ''.join(segment['text'] for segment in segments)
+    return {
+        'success': True,
+        'text': text,
+        'segments': segments,
+        'language': 'en',
+        'confidence': 0.9,
+        'processing_time': 1.0,
+        'word_count': len(text.split()),
+        'segment_count': len(segments),
+        'chunk_info': {'index': index, 'start_time': start_time, 'end_time': end_time, 'file_size_mb': 0},
+    }
+
+
+def test_merge_keeps_segment_straddling_overlap_cut():
+    """A segment starting inside the overlap but ending past the boundary survives the merge."""
+    # Chunks of 10s with a 2s overlap: the second chunk covers 8-20s, the cut is at 9s
+    first = _result(0, 0.0, 10.0, [
+        {'start': 0.0, 'end': 6.0, 'text': ' one'},
+        {'start': 6.0, 'end': 10.0, 'text': ' two'},
+    ])
+    second = _result(1, 8.0, 20.0, [
+        {'start': 8.0, 'end': 13.0, 'text': ' three'},
+        {'start': 13.0, 'end': 20.0, 'text': ' four'},
+    ])
+    
+    merged = ChunkedProcessor(max_workers=1).merge_results([first, second])
+    
+    assert [segment['text'] for segment in merged['segments']] == [' one', ' two', ' three', ' four']
+    assert merged['text'] == 'one two three four'
+
+
+def test_merge_drops_duplicate_segment_in_overlap():
+    """A segment transcribed by both chunks inside the overlap is kept only once."""
+    first = _result(0, 0.0, 10.0, [
+        {'start': 0.0, 'end': 8.0, 'text': ' one'},
+        {'start': 8.0, 'end': 9.5, 'text': ' two'},
+    ])
+    second = _result(1, 8.0, 20.0, [
+        {'start': 8.0, 'end': 9.5, 'text': ' two'},
+        {'start': 9.5, 'end': 20.0, 'text': ' three'},
+    ])
+    
+    merged = ChunkedProcessor(max_workers=1).merge_results([first, second])
+    
+    assert merged['text'] == 'one two three'
+    assert merged['segment_count'] == 3
+
+
+def test_merge_drops_segment_clipped_at_next_chunk_start():
+    """Speech under way when the next chunk starts is clipped there, but still kept only once."""
+    # The second chunk starts at 28s, so it hears the 27-30s segment as 28-30s; the cut is at 29s
+    first = _result(0, 0.0, 30.0, [
+        {'start': 20.0, 'end': 27.0, 'text': ' a'},
+        {'start': 27.0, 'end': 30.0, 'text': ' b'},
+    ])
+    second = _result(1, 28.0, 40.0, [
+        {'start': 28.0, 'end': 30.0, 'text': ' b'},
+        {'start': 30.0, 'end': 40.0, 'text': ' c'},
+    ])
+    
+    merged = ChunkedProcessor(max_workers=1).merge_results([first, second])
+    
+    assert merged['text'] == 'a b c'
+    assert [segment['start'] for segment in merged['segments']] == [20.0, 27.0, 30.0]
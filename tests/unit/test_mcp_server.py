@@ -0,0 +1,50 @@
+"""
+Unit tests for the MCP server's transcription output.
+"""
+
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+# Other test modules put src/ on sys.path, where src/mcp would shadow the SDK's `mcp`
+_saved_path = sys.path[:]
+sys.path[:] = [entry for entry in sys.path if entry and Path(entry).resolve() != ROOT / "src"]
+try:
+    # Formatting never touches the SDK; stand in for it when it is not installed
+    if importlib.util.find_spec('mcp') is None:
+        class _FastMCP:
+            def __init__(self, **kwargs):
+                pass
+
+            def tool(self):
+                return lambda func: func
+
+        for name in ('mcp', 'mcp.server', 'mcp.server.fastmcp'):
+            sys.modules.setdefault(name, types.ModuleType(name))
+        sys.modules['mcp.server.fastmcp'].FastMCP = _FastMCP
+
+    from src.mcp.server import _format_transcription
+finally:
+    sys.path[:] = _saved_path
+
+
+def test_diarized_result_is_grouped_under_speaker_headers():
+    """Consecutive segments of one speaker share a single [SPEAKER_xx] header."""
+    result = {
+        'success': True,
+        'text': 'Hi there. How are you? Fine, thanks.',
+        'segments': [
+            {'start': 0.0, 'end': 1.0, 'text': ' Hi there.', 'speaker': 'SPEAKER_00'},
+            {'start': 1.0, 'end': 2.0, 'text': ' How are you?', 'speaker': 'SPEAKER_00'},
+            {'start': 2.0, 'end': 3.0, 'text': ' Fine, thanks.', 'speaker': 'SPEAKER_01'},
+        ],
+    }
+
+    text = _format_transcription(result, enable_speakers=True)
+
+    assert text == "\n[SPEAKER_00] Hi there. How are you? \n[SPEAKER_01] Fine, thanks."
+    assert _format_transcription(result, enable_speakers=False) == result['text']
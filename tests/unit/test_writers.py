@@ -0,0 +1,49 @@
+"""
+Unit tests for the structured output writers.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+msgspec = pytest.importorskip("msgspec")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from config.settings import Settings
+from output.writers import JSONWriter, MsgPackWriter
+
+
+def test_msgpack_output_decodes_to_json_document(tmp_path):
+    """The MessagePack file holds the same document as the JSON file."""
+    result = {
+        'text': 'Hello there. General Kenobi.',
+        'language': 'en',
+        'confidence': 0.91,
+        'processing_time': 1.5,
+        'word_count': 4,
+        'segment_count': 2,
+        'segments': [
+            {'start': 0.0, 'end': 1.2, 'text': ' Hello there.', 'avg_logprob': -0.2},
+            {'start': 1.2, 'end': 2.8, 'text': ' General Kenobi.', 'avg_logprob': -0.4},
+        ],
+        'chunk_count': 1,
+        'successful_chunks': 1,
+        'failed_chunks': 0,
+    }
+    file_info = {'name': 'clip.wav', 'path': '/tmp/clip.wav', 'size_mb': 0.5, 'format_type': 'audio'}
+    settings = Settings()
+    json_path = tmp_path / "clip.json"
+    msgpack_path = tmp_path / "clip.msgpack"
+    
+    JSONWriter(settings).write(result, str(json_path), file_info)
+    MsgPackWriter(settings).write(result, str(msgpack_path), file_info)
+    
+    expected = json.loads(json_path.read_text(encoding='utf-8'))
+    decoded = msgspec.msgpack.decode(msgpack_path.read_bytes())
+    # Each writer stamps its own generation time
+    expected['metadata'].pop('timestamp')
+    decoded['metadata'].pop('timestamp')
+    assert decoded == expected